@@ -0,0 +1,29 @@
+#!/bin/sh -e
+# check if debmake --serve and --connect work as expected
+LC_ALL=C.UTF-8
+export LC_ALL
+
+PROJECT=foo-10.0
+SOCKET="$(pwd)/debmake.sock"
+rm -rf ${PROJECT} ${SOCKET}
+mkdir ${PROJECT}
+echo "DUMMY ${PROJECT}" > ${PROJECT}/dummy-${PROJECT}
+debmake --serve ${SOCKET} > server.log 2>&1 &
+SERVER=$!
+trap 'kill ${SERVER} 2>/dev/null || true' EXIT
+for i in 1 2 3 4 5 6 7 8 9 10; do
+  test -S ${SOCKET} && break
+  sleep 1
+done
+cd ${PROJECT}
+debmake --connect ${SOCKET} -y -x0 > ../client.log 2>&1
+cd ..
+test -x ${PROJECT}/debian/rules
+grep -q "I: creating debian/rules" client.log
+# the exit status of the request is returned to the client
+if DEBMAKE_SOCKET=${SOCKET} debmake -y missing-10.1.tar.xz ; then
+  exit 1
+fi
+kill ${SERVER}
+wait ${SERVER} || true
+test ! -e ${SOCKET}
@@ -0,0 +1,64 @@
+#!/bin/sh -e
+# check if "debmake --version" and "debmake --help" start fast
+LC_ALL=C.UTF-8
+export LC_ALL
+
+# the import time is only reported (too noisy on loaded test hosts)
+# unless a budget in ms (best of 5 runs) is set, e.g.,
+# DEBMAKE_STARTUP_BUDGET_MS=20
+python3 - <<'EOM'
+import os
+import subprocess
+import sys
+
+# stage modules and slow stdlib modules must be imported only when used
+for option in ("--version", "--help"):
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, debmake.__main__\n"
+            "sys.argv[0] = 'debmake'\n"
+            "try:\n"
+            "    debmake.__main__.main()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(' '.join(sorted(sys.modules)), file=sys.stderr)\n",
+            option,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    modules = set(result.stderr.split())
+    for module in (
+        "debmake.analyze",
+        "debmake.batch",
+        "debmake.debian",
+        "debmake.serve",
+        "debmake.tar_expand",
+        "importlib.resources",
+        "subprocess",
+    ):
+        assert module not in modules, "{} imported by {}".format(module, option)
+
+# python3 -X importtime reports the cumulative import time in us
+best = None
+for i in range(5):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import debmake.__main__"],
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if fields[-1].strip() == "debmake.__main__":
+            us = int(fields[1])
+            best = us if best is None else min(best, us)
+print("I: import time of debmake.__main__: {:.1f} ms".format(best / 1000))
+budget = os.environ.get("DEBMAKE_STARTUP_BUDGET_MS")
+if budget:
+    assert best / 1000 < float(budget), "over the budget of {} ms".format(budget)
+EOM
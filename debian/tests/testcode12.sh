@@ -0,0 +1,30 @@
+#!/bin/sh -e
+# check if debmake resumes from the stage checkpoint
+LC_ALL=C.UTF-8
+export LC_ALL
+
+PROJECT=foo-12.0
+rm -rf ${PROJECT} ${PROJECT}.tar.xz ${PROJECT}.debmake-checkpoint
+mkdir ${PROJECT}
+echo "DUMMY ${PROJECT}" > ${PROJECT}/dummy-${PROJECT}
+tar --xz -cf ${PROJECT}.tar.xz ${PROJECT}
+rm -rf ${PROJECT}
+# fail late after the upstream tarball is expanded
+if debmake -y -x0 -i false ${PROJECT}.tar.xz ; then
+  exit 1
+fi
+test -f ${PROJECT}.debmake-checkpoint
+debmake -y -x0 ${PROJECT}.tar.xz > resume.log
+grep -q "I: skip tar_expand" resume.log
+test -x ${PROJECT}/debian/rules
+# a changed tarball is expanded again
+touch ${PROJECT}.tar.xz
+debmake -y -x0 ${PROJECT}.tar.xz > changed.log
+if grep -q "I: skip tar_expand" changed.log ; then
+  exit 1
+fi
+# --restart ignores the checkpoint
+debmake -y -x0 --restart ${PROJECT}.tar.xz > restart.log
+if grep -q "I: skip" restart.log ; then
+  exit 1
+fi
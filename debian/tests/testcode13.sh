@@ -0,0 +1,8 @@
+#!/bin/sh -e
+# check if the peak RSS of the extension scan stays flat for many files
+LC_ALL=C.UTF-8
+export LC_ALL
+
+# 20000 files vs 200000 files (use 2000000 for the full benchmark)
+python3 -m debmake.scanext --benchmark 200000 > benchmark.log
+grep -v "^I: ext_type" benchmark.log
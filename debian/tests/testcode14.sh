@@ -0,0 +1,18 @@
+#!/bin/sh -e
+# check if files without extension are classified by their first block
+LC_ALL=C.UTF-8
+export LC_ALL
+
+mkdir -p sniff/bin
+cd sniff
+printf '#!/usr/bin/env python3\nprint("foo")\n' > bin/foo
+printf '#!/usr/bin/perl -w\nprint "bar\\n";\n' > bin/bar
+printf '#!/usr/bin/env python3\nprint("baz")\n' > bin/baz
+cp /bin/true bin/prebuilt
+python3 -m debmake.scanext > ../scanext.log
+python3 -m debmake.scanext --sniff > ../sniff.log
+cat ../sniff.log
+grep -q "ext_type = python3                 2 files" ../sniff.log
+grep -q "ext_type = perl                    1 files" ../sniff.log
+grep -q "^W: 1 binary files" ../sniff.log
+! grep -q "python3" ../scanext.log
@@ -0,0 +1,53 @@
+#!/bin/sh -e
+# check if the cached analysis is used only for the unchanged source tree
+LC_ALL=C.UTF-8
+export LC_ALL
+XDG_CACHE_HOME="$(pwd)/cache"
+export XDG_CACHE_HOME
+
+mkdir -p foo-1.0/src
+cd foo-1.0
+echo 'int main(){}' > src/foo.c
+printf 'all:\n\ttrue\n' > Makefile
+touch -d '2020-01-01' src src/foo.c
+debmake -y > ../debmake-1.log
+! grep "cached analysis" ../debmake-1.log
+debmake -y -b":python3" > ../debmake-2.log
+grep "cached analysis" ../debmake-2.log
+grep "ext_type = c" ../debmake-2.log
+# new files in a subdirectory
+echo 'print(1)' > src/foo.py
+echo 'print(2)' > src/bar.py
+touch -d '2021-01-01' src
+debmake -y > ../debmake-3.log
+! grep "cached analysis" ../debmake-3.log
+grep "ext_type = python3                 2 files" ../debmake-3.log
+debmake -y > ../debmake-4.log
+grep "cached analysis" ../debmake-4.log
+grep "ext_type = python3                 2 files" ../debmake-4.log
+# new file in the top directory
+printf 'cmake_minimum_required(VERSION 3.0)\n' > CMakeLists.txt
+debmake -y > ../debmake-5.log
+! grep "cached analysis" ../debmake-5.log
+grep "build_type = Cmake" ../debmake-5.log
+debmake -y --no-cache > ../debmake-6.log
+! grep "cached analysis" ../debmake-6.log
+# a tree just made is cached and checked by its content
+cd ..
+rm -rf bar-1.0
+mkdir -p bar-1.0/src
+cd bar-1.0
+echo 'int main(){}' > src/bar.c
+printf 'all:\n\ttrue\n' > Makefile
+debmake -y > ../debmake-7.log
+! grep "cached analysis" ../debmake-7.log
+debmake -y > ../debmake-8.log
+grep "cached analysis" ../debmake-8.log
+# a new file within the same mtime tick of its directory
+touch -r src ../src.stamp
+echo 'print(1)' > src/bar.py
+touch -r ../src.stamp src
+debmake -y > ../debmake-9.log
+test -z "$(grep "cached analysis" ../debmake-9.log)"
+grep "ext_type = c                       1 files" ../debmake-9.log
+grep "ext_type = python3                 1 files" ../debmake-9.log
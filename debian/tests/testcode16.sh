@@ -0,0 +1,41 @@
+#!/bin/sh -e
+# check if the source tree of a git work tree is indexed by git ls-files
+LC_ALL=C.UTF-8
+export LC_ALL
+
+if ! command -v git > /dev/null; then
+	echo "skip: missing git"
+	exit 0
+fi
+mkdir foo-1.0
+cd foo-1.0
+git init -q
+echo 'int main(){}' > foo.c
+printf 'all:\n\ttrue\n' > Makefile
+printf 'build/\n' > .gitignore
+git add foo.c Makefile .gitignore
+# ignored build outputs are not counted
+mkdir build
+for i in 1 2 3 4 5; do echo "print($i)" > build/gen$i.py; done
+debmake -y --no-cache > ../debmake.log
+cat ../debmake.log
+grep "I: list 3 files tracked by git" ../debmake.log
+grep "ext_type = c " ../debmake.log
+test -z "$(grep "ext_type = python3" ../debmake.log)"
+# the tarball holds the same files: no ignored, untracked or deleted ones
+echo 'x' > untracked.txt
+echo 'int bar;' > bar.c
+git add bar.c
+rm bar.c
+cd ..
+rm -rf foo-1.0/debian foo-1.0.tar.xz
+cd foo-1.0
+debmake -y -t --no-cache > ../debmake.log
+cat ../debmake.log
+grep "I: list 3 files tracked by git" ../debmake.log
+tar -tf ../foo-1.0.tar.xz | sort > ../tar.list
+cat ../tar.list
+grep -x "foo-1.0/foo.c" ../tar.list
+grep -x "foo-1.0/.gitignore" ../tar.list
+grep -x "foo-1.0/" ../tar.list
+test -z "$(grep -e build/ -e untracked -e bar.c -e debian/ ../tar.list)"
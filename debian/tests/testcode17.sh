@@ -0,0 +1,29 @@
+#!/bin/sh -e
+# check if the upstream metadata is parsed from pyproject.toml
+LC_ALL=C.UTF-8
+export LC_ALL
+
+mkdir foo-1.0
+cd foo-1.0
+cat > pyproject.toml << END
+# not built with hatchling
+[build-system]
+requires = ["setuptools >= 61.0"]
+build-backend = "setuptools.build_meta"
+
+[project]
+name = "foo"
+version = "1.0"
+description = "Foo utility"
+
+[project.urls]
+Homepage = "https://example.org/foo"
+END
+echo 'print("foo")' > foo.py
+debmake -y -b":python3" --no-cache > ../debmake.log
+cat ../debmake.log
+grep "W: setuptools build system." ../debmake.log
+! grep "Hatchling" ../debmake.log
+grep "python3-setuptools" debian/control
+grep "^Description: Foo utility" debian/control
+grep "^Homepage: https://example.org/foo" debian/control
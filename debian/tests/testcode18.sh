@@ -0,0 +1,13 @@
+#!/bin/sh -e
+# check if non-UTF-8 marker files are grepped without an error
+LC_ALL=C.UTF-8
+export LC_ALL
+
+mkdir foo-1.0
+cd foo-1.0
+printf '#!/usr/bin/python3\n# \251 Latin-1 author\nfrom setuptools import setup\nsetup()\n' > setup.py
+echo 'print("foo")' > foo.py
+debmake -y -b":python3" --no-cache > ../debmake.log
+cat ../debmake.log
+grep "build_type = Python setuptools (setup.py)" ../debmake.log
+grep "python3-setuptools" debian/control
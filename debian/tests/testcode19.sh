@@ -0,0 +1,34 @@
+#!/bin/sh -e
+# check if the packed templates are the same as the template files
+LC_ALL=C.UTF-8
+export LC_ALL
+
+DATA="$(python3 -c 'import debmake.api; print(debmake.api.data_path())')"
+cp -r "$DATA" data
+python3 -m debmake.pack data data.pack
+python3 - << END
+import os
+import debmake.read
+
+names = debmake.read.load_pack(os.path.abspath("data") + "/")
+assert names, "data.pack not loaded"
+for name in names:
+    with open(os.path.join("data", name), encoding="utf-8") as f:
+        assert debmake.read.read(os.path.abspath("data") + "/" + name) == f.read(), name
+print("I: {} packed templates OK".format(len(names)))
+END
+# a truncated data.pack falls back to the template files
+mkdir broken
+cp -r data broken/data
+head -c 4000 data.pack > broken/data.pack
+python3 - << END
+import os
+import debmake.read
+
+data_path = os.path.abspath("broken/data") + "/"
+assert debmake.read.load_pack(data_path) is None, "broken data.pack loaded"
+debmake.read.preload(data_path)
+with open(data_path + "extra0_rules", encoding="utf-8") as f:
+    assert debmake.read.read(data_path + "extra0_rules") == f.read()
+print("I: broken data.pack ignored")
+END
@@ -0,0 +1,21 @@
+#!/bin/sh -e
+# check if unchanged debian/* files are not written again
+LC_ALL=C.UTF-8
+export LC_ALL
+
+mkdir foo-1.0
+cd foo-1.0
+echo 'int main(){}' > foo.c
+printf 'all:\n\ttrue\n' > Makefile
+debmake -y > ../debmake-1.log
+grep "I: debian/\* files: .* written, 0 unchanged, 0 skipped" ../debmake-1.log
+debmake -y > ../debmake-2.log
+# debian/copyright.ex is written without lrc
+grep "I: debian/\* files: [01] written, 0 unchanged, 4 skipped" ../debmake-2.log
+# -B writes *.ex templates next to the existing files
+debmake -y -B > ../debmake-3.log
+touch -d '2020-01-01' debian/rules.ex
+debmake -y -B > ../debmake-4.log
+cat ../debmake-4.log
+grep "I: debian/\* files: .* unchanged" ../debmake-4.log
+test "$(stat -c %Y debian/rules.ex)" = "$(date -d '2020-01-01' +%s)"
@@ -0,0 +1,20 @@
+#!/bin/sh -e
+# check if a failed run leaves no partial debian/ directory
+LC_ALL=C.UTF-8
+export LC_ALL
+
+mkdir foo-1.0 fail
+cd foo-1.0
+echo 'int main(){}' > foo.c
+printf 'all:\n\ttrue\n' > Makefile
+printf '#!/bin/sh\nexit 1\n' > ../fail/licensecheck
+chmod 755 ../fail/licensecheck
+if PATH="$(pwd)/../fail:$PATH" debmake -y --licensecheck > ../debmake-1.log 2>&1 ; then
+	echo "unexpected success"
+	exit 1
+fi
+test ! -e debian
+debmake -y > ../debmake-2.log
+grep 'I: creating debian/\* files with "-x 2" option' ../debmake-2.log
+test -x debian/rules
+test -s debian/copyright
@@ -0,0 +1,46 @@
+#!/bin/sh -e
+# check if the builtin license scanner makes debian/copyright
+LC_ALL=C.UTF-8
+export LC_ALL
+
+mkdir foo-1.0
+cd foo-1.0
+mkdir src
+cat > src/foo.c << END
+/*
+ * Copyright (C) 2020-2022 Foo Author <foo@example.org>
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation; either version 2 of the License, or
+ * (at your option) any later version.
+ */
+int main(){}
+END
+cat > src/bar.c << END
+// SPDX-License-Identifier: MIT
+// Copyright 2021 Bar Author
+int bar(){}
+END
+cat > src/baz.c << END
+// SPDX-License-Identifier: GPL-2.0-or-later OR MIT
+// Copyright 2023 Baz Author
+int baz(){}
+END
+printf '\211PNG\r\n\032\n\0\0' > src/logo.png
+printf 'all:\n\ttrue\n' > Makefile
+debmake -y --no-cache > ../debmake.log
+cat ../debmake.log
+grep "I: creating debian/copyright by the builtin license scanner." ../debmake.log
+cat debian/copyright
+grep "^Upstream-Name: foo" debian/copyright
+grep -A2 "^Files: src/foo.c" debian/copyright | grep "^License: GPL-2+"
+grep -A1 "^Files: src/foo.c" debian/copyright | grep "^Copyright: 2020-2022 Foo Author <foo@example.org>"
+grep -A2 "^Files: src/bar.c" debian/copyright | grep "^License: Expat"
+! grep "logo.png" debian/copyright
+grep -A1 "^License: Expat" debian/copyright | grep "^ FIXME"
+# one standalone License: paragraph per short name of an expression
+grep -A2 "^Files: src/baz.c" debian/copyright | grep "^License: GPL-2+ or Expat"
+test -z "$(grep -A1 "^License: GPL-2+ or Expat\$" debian/copyright | grep "^ FIXME")"
+test "$(grep -c "^License: Expat\$" debian/copyright)" = 2
+test "$(grep -c "^License: GPL-2+\$" debian/copyright)" = 2
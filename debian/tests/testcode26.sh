@@ -0,0 +1,53 @@
+#!/bin/sh -e
+# check if the license findings are shared between source trees
+LC_ALL=C.UTF-8
+export LC_ALL
+XDG_CACHE_HOME="$(pwd)/cache"
+export XDG_CACHE_HOME
+
+for p in foo bar; do
+	mkdir $p-1.0
+	cat > $p-1.0/zlib.h << END
+/* zlib.h -- interface of the 'zlib' general purpose compression library
+  Copyright (C) 1995-2024 Jean-loup Gailly and Mark Adler
+
+  This software is provided 'as-is', without any express or implied
+  warranty.  In no event will the authors be held liable for any damages
+  arising from the use of this software.
+
+  3. This notice may not be removed or altered from any source distribution.
+  2. Altered source versions must be plainly marked as such, and must not be
+     misrepresented as being the original software.
+*/
+END
+	echo "int $p(){}" > $p-1.0/$p.c
+	printf 'all:\n\ttrue\n' > $p-1.0/Makefile
+done
+cd foo-1.0
+debmake -y > ../debmake-foo.log
+grep "I: 0 of 3 files found in the license cache" ../debmake-foo.log
+test -s ../cache/debmake/license.sqlite3
+cd ../bar-1.0
+debmake -y > ../debmake-bar.log
+grep "I: 2 of 3 files found in the license cache" ../debmake-bar.log
+grep -A2 "^Files: zlib.h" debian/copyright | grep "^License: Zlib"
+# the cache is used by debmake.run() from many threads at once
+cd ..
+for i in 1 2 3 4 5 6; do
+	cp -r foo-1.0 baz$i-1.0
+	rm -rf baz$i-1.0/debian
+done
+python3 - > debmake-threads.log << END
+import concurrent.futures
+import debmake
+
+with concurrent.futures.ThreadPoolExecutor(max_workers=6) as executor:
+    futures = [
+        executor.submit(debmake.run, ["-y"], "baz{}-1.0".format(i))
+        for i in range(1, 7)
+    ]
+    for future in futures:
+        future.result()
+END
+test "$(grep -c "I: 3 of 3 files found in the license cache" debmake-threads.log)" = 6
+! grep "W: license cache" debmake-threads.log
@@ -0,0 +1,36 @@
+#!/bin/sh -e
+# check if licensecheck and lrc run in the background are waited for
+LC_ALL=C.UTF-8
+export LC_ALL
+
+mkdir foo-1.0 bin
+cd foo-1.0
+echo 'int main(){}' > foo.c
+printf 'all:\n\ttrue\n' > Makefile
+cat > ../bin/licensecheck << END
+#!/bin/sh
+sleep 1
+echo "Format: https://www.debian.org/doc/packaging-manuals/copyright-format/1.0/"
+echo ""
+echo "Files: *"
+echo "Copyright: 2026 Slow Scanner"
+echo "License: UNKNOWN"
+END
+printf '#!/bin/sh\necho "lrc: no difference"\nexit ${LRC_EXIT:-0}\n' > ../bin/lrc
+chmod 755 ../bin/licensecheck ../bin/lrc
+PATH="$(pwd)/../bin:$PATH"
+debmake -y --licensecheck > ../debmake-1.log
+grep "I: \[foo-1.0\] \$ licensecheck .* &" ../debmake-1.log
+grep "I: creating debian/copyright by licensecheck." ../debmake-1.log
+grep "^Copyright: 2026 Slow Scanner" debian/copyright
+debmake -y > ../debmake-2.log
+grep "^lrc: no difference" ../debmake-2.log
+grep "I: verifying debian/copyright by lrc" ../debmake-2.log
+# a failed lrc fails debmake before debian/* are written
+rm debian/rules
+if LRC_EXIT=1 debmake -y > ../debmake-3.log 2>&1 ; then
+	echo "unexpected success"
+	exit 1
+fi
+grep "^lrc: no difference" ../debmake-3.log
+test ! -e debian/rules
@@ -0,0 +1,22 @@
+#!/bin/sh -e
+# check if uniform directories are grouped as "dir/*" in debian/copyright
+LC_ALL=C.UTF-8
+export LC_ALL
+
+mkdir foo-1.0
+cd foo-1.0
+mkdir -p vendor/zlib vendor/other
+for i in 1 2 3 4 5 6 7 8; do
+	printf '/* Copyright 2000 Zlib Author\n * altered source versions must be plainly marked as such */\nint z%s;\n' $i > vendor/zlib/z$i.c
+	printf '// SPDX-License-Identifier: MIT\n// Copyright 2010 Other Author\nint o%s;\n' $i > vendor/other/o$i.c
+	printf '// SPDX-License-Identifier: GPL-2.0-or-later\n// Copyright 2026 Foo Author\nint f%s;\n' $i > f$i.c
+done
+printf '// SPDX-License-Identifier: BSL-1.0\n// Copyright 2020 Odd Author\nint odd;\n' > vendor/zlib/odd.c
+printf 'all:\n\ttrue\n' > Makefile
+debmake -y --no-cache > ../debmake.log
+cat debian/copyright
+grep -A2 "^Files: vendor/zlib/\*" debian/copyright | grep "^License: Zlib"
+grep -A2 "^Files: vendor/other/\*" debian/copyright | grep "^License: Expat"
+grep -A2 "^Files: vendor/zlib/odd.c" debian/copyright | grep "^License: BSL-1.0"
+! grep "z1.c\|o1.c\|f1.c" debian/copyright
+test "$(grep -c '^Files:' debian/copyright)" -le 5
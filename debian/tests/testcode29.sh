@@ -0,0 +1,24 @@
+#!/bin/sh -e
+# check if debian/* rendered by debmake are wrapped and sorted in-process
+LC_ALL=C.UTF-8
+export LC_ALL
+
+mkdir foo-1.0 bin
+cd foo-1.0
+echo 'int main(){}' > foo.c
+printf 'all:\n\ttrue\n' > Makefile
+printf '#!/bin/sh\necho "$*" >> %s/../wrap-and-sort.args\n' "$(pwd)" > ../bin/wrap-and-sort
+chmod 755 ../bin/wrap-and-sort
+PATH="$(pwd)/../bin:$PATH"
+debmake -y > ../debmake-1.log
+cat debian/control
+grep -A1 "^Build-Depends:$" debian/control | grep "^ debhelper-compat (= 13),$"
+grep -A2 "^Depends:$" debian/control | grep "^ \${shlibs:Depends},$"
+! grep "wrap-and-sort" ../debmake-1.log
+test ! -e ../wrap-and-sort.args
+# files not rendered by debmake in this run are left to wrap-and-sort
+printf 'usr/bin\netc\n' > debian/foo.install
+debmake -y > ../debmake-2.log
+grep "I: \[foo-1.0\] \$ wrap-and-sort -ast .*-f debian/foo.install" ../debmake-2.log
+grep -- "-f debian/foo.install" ../wrap-and-sort.args
+! grep -- "-f debian/control" ../wrap-and-sort.args
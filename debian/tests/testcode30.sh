@@ -0,0 +1,22 @@
+#!/bin/sh -e
+# check if the upstream tarball is expanded again with in-process rm/mv/ln
+LC_ALL=C.UTF-8
+export LC_ALL
+
+mkdir foo-1.0
+echo 'int main(){}' > foo-1.0/foo.c
+printf 'all:\n\ttrue\n' > foo-1.0/Makefile
+tar --xz -cf foo-1.0.tar.xz foo-1.0
+rm -rf foo-1.0
+debmake -y foo-1.0.tar.xz > debmake-1.log
+grep "\$ mkdir -p 'foo-1.0.temp_dir'" debmake-1.log
+grep "\$ mv -f 'foo-1.0.temp_dir/foo-1.0/' 'foo-1.0'" debmake-1.log
+grep "\$ ln -sf 'foo-1.0.tar.xz' 'foo_1.0.orig.tar.xz'" debmake-1.log
+test "$(readlink foo_1.0.orig.tar.xz)" = "foo-1.0.tar.xz"
+test ! -e foo-1.0.temp_dir
+test -f foo-1.0/foo.c
+touch foo-1.0/stale
+debmake -y --restart foo-1.0.tar.xz > debmake-2.log
+grep "\$ rm -rf 'foo-1.0'" debmake-2.log
+test ! -e foo-1.0/stale
+test -f foo-1.0/debian/rules
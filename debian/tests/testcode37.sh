@@ -0,0 +1,19 @@
+#!/bin/sh -e
+# check if dir_debmake runs again when the upstream debian/ is edited
+LC_ALL=C.UTF-8
+export LC_ALL
+
+mkdir -p baz/debian
+echo 'int main(){}' > baz/baz.c
+printf 'all:\n\ttrue\n' > baz/Makefile
+echo one > baz/debian/README.source
+cd baz
+debmake -y -p foo -u 1.0 > ../debmake-1.log
+grep -x one ../foo-1.0/debian/README.source
+debmake -y -p foo -u 1.0 > ../debmake-2.log
+grep "I: skip dir_debmake: unchanged" ../debmake-2.log
+echo two > debian/README.source
+touch -d '2001-01-01 00:00:00' debian/README.source
+debmake -y -p foo -u 1.0 > ../debmake-3.log
+! grep "I: skip dir_debmake" ../debmake-3.log
+grep -x two ../foo-1.0/debian/README.source
@@ -0,0 +1,37 @@
+#!/bin/sh -e
+# check if --profile and --profile-trace write the stage events
+LC_ALL=C.UTF-8
+export LC_ALL
+
+rm -f foo-1.0*.tar.?z foo_1.0.orig.tar.?z profile.json trace.json
+rm -rf foo-1.0
+mkdir foo-1.0
+echo 'int main(){}' > foo-1.0/foo.c
+printf 'all:\n\ttrue\n' > foo-1.0/Makefile
+cd foo-1.0
+debmake -y --profile ../profile.json --profile-trace ../trace.json > ../debmake.log
+cd ..
+grep 'I: wrote run profile to ".*/profile.json"' debmake.log
+grep 'I: wrote Chrome trace-event file to ".*/trace.json"' debmake.log
+python3 -c '
+import json
+with open("profile.json", encoding="utf-8") as f:
+    profile = json.load(f)
+names = {event["name"] for event in profile["events"] if event["category"] == "stage"}
+for name in ("para", "dir_debmake", "dir_tar", "tar_orig", "analyze", "debian"):
+    assert name in names, name
+assert profile["package"] == "foo", profile["package"]
+assert profile["total"]["wall"] > 0
+print("I: profile stages: {}".format(" ".join(sorted(names))))
+'
+python3 -c '
+import json
+with open("trace.json", encoding="utf-8") as f:
+    trace = json.load(f)
+events = trace["traceEvents"]
+assert events
+for event in events:
+    assert event["ph"] == "X" and event["dur"] >= 0, event
+assert "debian" in {event["name"] for event in events}
+print("I: {} trace events".format(len(events)))
+'
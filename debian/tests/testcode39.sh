@@ -0,0 +1,67 @@
+#!/bin/sh -e
+# check if tar_wget is skipped only with the downloaded tarball and if
+# dir_git always fetches the new upstream commits
+LC_ALL=C.UTF-8
+export LC_ALL
+
+if ! command -v git > /dev/null; then
+	echo "skip: missing git"
+	exit 0
+fi
+if ! command -v wget > /dev/null && ! command -v curl > /dev/null; then
+	echo "skip: missing wget and curl"
+	exit 0
+fi
+rm -rf srv work
+mkdir srv work
+cd srv
+mkdir foo-1.0
+echo 'int main(){}' > foo-1.0/foo.c
+printf 'all:\n\ttrue\n' > foo-1.0/Makefile
+tar --xz -cf foo-1.0.tar.xz foo-1.0
+cd foo-1.0
+git init -q
+git add .
+git -c user.name=A -c user.email=a@b.c commit -qm 1
+cd ..
+git clone -q --bare foo-1.0 bar.git
+git -C bar.git update-server-info
+# serve srv/ over HTTP on a free port
+PORT="$(python3 -c 'import socket; s = socket.socket(); s.bind(("127.0.0.1", 0)); print(s.getsockname()[1])')"
+python3 -m http.server -b 127.0.0.1 "$PORT" > ../http.log 2>&1 &
+SERVER=$!
+trap 'kill $SERVER' EXIT
+python3 -c "
+import time, urllib.request
+for i in range(50):
+    try:
+        urllib.request.urlopen('http://127.0.0.1:$PORT/')
+        break
+    except OSError:
+        time.sleep(0.1)
+"
+cd ../work
+URL="http://localhost:$PORT"
+debmake -y "$URL/foo-1.0.tar.xz" > debmake-1.log
+! grep "I: skip tar_wget" debmake-1.log
+debmake -y "$URL/foo-1.0.tar.xz" > debmake-2.log
+grep "I: skip tar_wget" debmake-2.log
+! grep "backup" debmake-2.log
+test -f foo-1.0.tar.xz
+rm foo-1.0.tar.xz
+debmake -y "$URL/foo-1.0.tar.xz" > debmake-3.log
+! grep "I: skip tar_wget" debmake-3.log
+test -f foo-1.0.tar.xz
+# dir_git
+debmake -y -p bar -u 1.0 "$URL/bar.git" > debmake-4.log
+test ! -e bar-1.0/NEWS
+cd ../srv/foo-1.0
+echo news > NEWS
+git add NEWS
+git -c user.name=A -c user.email=a@b.c commit -qm 2
+git push -q ../bar.git HEAD
+git -C ../bar.git update-server-info
+cd ../../work
+debmake -y -p bar -u 1.0 "$URL/bar.git" > debmake-5.log
+! grep "I: skip dir_git" debmake-5.log
+grep -x news bar-1.0/NEWS
@@ -0,0 +1,15 @@
+#!/bin/sh -e
+# check if all placeholders of the shipped templates are substituted
+LC_ALL=C.UTF-8
+export LC_ALL
+
+rm -f foo-1.0*.tar.?z foo_1.0.orig.tar.?z
+rm -rf foo-1.0
+mkdir foo-1.0
+echo 'int main(){}' > foo-1.0/foo.c
+printf 'all:\n\ttrue\n' > foo-1.0/Makefile
+cd foo-1.0
+debmake -y -x4 -b",libfoo1,libfoo-dev,foo-doc:doc,foo-data:data" > ../debmake.log
+cd ..
+test -z "$(grep "W: unknown" debmake.log)"
+grep -x "= FOO(1)" foo-1.0/debian/manpage.asciidoc.ex
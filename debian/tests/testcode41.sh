@@ -0,0 +1,22 @@
+#!/bin/sh -e
+# check if the source tree with special files is copied as cp -dR does
+LC_ALL=C.UTF-8
+export LC_ALL
+
+rm -rf foo foo-1.0 foo-1.0.tar.xz foo_1.0.orig.tar.xz
+mkdir -p foo/src
+cd foo
+echo 'int main(){}' > src/foo.c
+printf 'all:\n\ttrue\n' > Makefile
+ln -s src/foo.c foo.c
+mkfifo src/pipe
+touch -d '2001-01-01' src
+debmake -y -p foo -u 1.0 > ../debmake.log
+cat ../debmake.log
+grep "cp -dR" ../debmake.log
+cd ..
+test -p foo-1.0/src/pipe
+test -L foo-1.0/foo.c
+test "$(readlink foo-1.0/foo.c)" = "src/foo.c"
+# directory times are not copied
+test "$(stat -c %Y foo-1.0/src)" != "$(stat -c %Y foo/src)"
@@ -0,0 +1,49 @@
+#!/bin/sh -e
+# check if licensecheck in the background is killed when debian/* fails
+LC_ALL=C.UTF-8
+export LC_ALL
+
+rm -rf foo-1.0 bin licensecheck.pid
+mkdir bin
+cat > bin/licensecheck << END
+#!/bin/sh
+sleep 60 &
+echo \$! > "$(pwd)/licensecheck.pid"
+wait
+END
+chmod 755 bin/licensecheck
+PATH="$(pwd)/bin:$PATH"
+export PATH
+mkdir foo-1.0
+echo 'int main(){}' > foo-1.0/foo.c
+printf 'all:\n\ttrue\n' > foo-1.0/Makefile
+python3 - > debmake.log << END
+import os
+import time
+
+import debmake
+import debmake.control
+
+
+def control(para):
+    # fail while licensecheck is running
+    while not os.path.exists("$(pwd)/licensecheck.pid"):
+        time.sleep(0.1)
+    raise RuntimeError("broken control")
+
+
+debmake.control.control = control
+try:
+    debmake.run(["-y", "--licensecheck"], "foo-1.0")
+except BaseException as e:
+    print("E: {}".format(e))
+else:
+    raise SystemExit("debmake did not fail")
+END
+cat debmake.log
+grep "E: broken control" debmake.log
+grep "I: kill licensecheck" debmake.log
+# the child of licensecheck is gone (or left as a zombie for init)
+pid="$(cat licensecheck.pid)"
+sleep 1
+test ! -e /proc/$pid || grep -q "^State:.*Z" /proc/$pid/status
@@ -0,0 +1,29 @@
+#!/bin/sh -e
+# check if debmake --batch works as expected
+LC_ALL=C.UTF-8
+export LC_ALL
+
+PROJECT1=foo-8.0
+PROJECT2=bar-8.1
+rm -f ${PROJECT1}*.tar.?z ${PROJECT2}*.tar.?z
+rm -rf ${PROJECT1} ${PROJECT2}
+mkdir ${PROJECT1} ${PROJECT2}
+echo "DUMMY ${PROJECT1}" > ${PROJECT1}/dummy-${PROJECT1}
+echo "DUMMY ${PROJECT2}" > ${PROJECT2}/dummy-${PROJECT2}
+cat > manifest <<EOM
+# batch manifest
+${PROJECT1} -x0
+${PROJECT2} -n -x1 -D P
+EOM
+debmake --batch manifest --jobs 2
+test -x ${PROJECT1}/debian/rules
+test -x ${PROJECT2}/debian/rules
+test -f manifest.002.log
+test -f manifest.003.log
+# each worker runs with --jobs 1 (no nested process pools)
+grep 'para\[jobs\] = "1"' manifest.003.log
+# a failing entry makes the whole batch fail
+echo "missing-8.2.tar.xz" >> manifest
+if debmake --batch manifest ; then
+  exit 1
+fi
@@ -0,0 +1,39 @@
+#!/bin/sh -e
+# check if debmake.run() works without changing the current directory
+LC_ALL=C.UTF-8
+export LC_ALL
+
+PROJECT1=foo-9.0
+PROJECT2=bar-9.1
+rm -rf work ${PROJECT1} ${PROJECT2}
+mkdir -p work/${PROJECT1} work/${PROJECT2}
+echo "DUMMY ${PROJECT1}" > work/${PROJECT1}/dummy-${PROJECT1}
+echo "DUMMY ${PROJECT2}" > work/${PROJECT2}/dummy-${PROJECT2}
+python3 - <<EOM
+import concurrent.futures
+import os
+import debmake
+import debmake.error
+
+cwd = os.getcwd()
+with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+    futures = [
+        executor.submit(debmake.run, ["-y", "-x0"], "work/${PROJECT1}"),
+        executor.submit(debmake.run, ["-y", "-n", "-x1"], "work/${PROJECT2}"),
+    ]
+    results = [future.result() for future in futures]
+assert os.getcwd() == cwd
+environ = dict(os.environ)
+debmake.run(["-y", "-D", "p"], "work/${PROJECT1}")
+assert dict(os.environ) == environ, "os.environ changed by -D"
+assert results[0].package == "foo" and results[0].version == "9.0"
+assert results[1].native
+try:
+    debmake.run(["-y", "missing-9.2.tar.xz"], "work")
+    raise AssertionError("missing tarball accepted")
+except debmake.error.SourceError as e:
+    print("E: {}".format(e))
+EOM
+test -x work/${PROJECT1}/debian/rules
+test -x work/${PROJECT2}/debian/rules
+test -f work/foo_9.0.orig.tar.xz
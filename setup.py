@@ -0,0 +1,27 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+setuptools hook to pack debmake/data/ into debmake/data.pack (see
+src/debmake/pack.py).  All other settings are in pyproject.toml.
+"""
+import os
+import sys
+
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+
+class build_py_pack(build_py):
+    def run(self):
+        super().run()
+        src = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+        sys.path.insert(0, src)
+        import debmake.pack
+
+        data_path = os.path.join(src, "debmake", "data") + "/"
+        file = os.path.join(self.build_lib, "debmake", "data.pack")
+        n = debmake.pack.write_pack(data_path, file)
+        print("I: packed {} files of {} into {}".format(n, data_path, file))
+
+
+setup(cmdclass={"build_py": build_py_pack})
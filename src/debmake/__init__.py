@@ -57,4 +57,18 @@ __all__ = [
     "__version__",
     "__copyright__",
     "__license__",
+    "run",
 ]
+
+
+#######################################################################
+# Library API (see debmake.api)
+#######################################################################
+def run(config, base_dir=None):
+    """
+    Run debmake with the command line arguments config in base_dir and
+    return debmake.api.Result.  Errors are raised as debmake.error.DebmakeError.
+    """
+    import debmake.api
+
+    return debmake.api.run(config, base_dir)
@@ -23,12 +23,10 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
-import glob
-import itertools
-import os.path
-import sys
-
-import debmake.grep
+import debmake.buildtype
+import debmake.cache
+import debmake.error
+import debmake.index
 import debmake.scanext
 import debmake.yn
 
@@ -38,7 +36,8 @@ import debmake.yn
 ###########################################################################
 def check_popular_ext_type(ext_type, msg, para):
     n_max_files = 3
-    if ext_type in itertools.islice(para["ext_type_counter"].keys(), 0, n_max_files):
+    popular = debmake.scanext.top_ext_types(para["ext_type_counter"], n_max_files)
+    if ext_type in [popular_ext_type for popular_ext_type, count in popular]:
         ext_type_found = False
         for deb in para["debs"]:
             type = deb["type"]  # -b (python3 also reports python)
@@ -88,13 +87,11 @@ def analyze(para):
         else:
             para["scripts"].append(deb["binpackage"])
     if len(para["debs"]) != 1 and len(para["dev"]) != len(para["lib"]):
-        print(
-            'E: # of "dev":{} != # of "lib": {}.'.format(
+        raise debmake.error.PackagingError(
+            '# of "dev":{} != # of "lib": {}.'.format(
                 len(para["dev"]), len(para["lib"])
-            ),
-            file=sys.stderr,
+            )
         )
-        exit(1)
     if para["lib"] != []:
         setmultiarch = True
     elif para["bin"] != [] and len(para["debs"]) == 1:
@@ -117,13 +114,11 @@ def analyze(para):
             if deb["binpackage"][-4:] == "-dev":
                 pkg = deb["binpackage"][:-4]
             else:
-                print(
-                    'E: Type=dev package "{}" should end with "-dev"'.format(
+                raise debmake.error.PackagingError(
+                    'Type=dev package "{}" should end with "-dev"'.format(
                         deb["binpackage"]
-                    ),
-                    file=sys.stderr,
+                    )
                 )
-                exit(1)
             match = False
             for libpkg in para["lib"]:
                 if libpkg[: len(pkg)] == pkg:
@@ -133,13 +128,11 @@ def analyze(para):
                     match = True
                     break
             if not match:
-                print(
-                    'E: {} does not have matching library in "{}".'.format(
+                raise debmake.error.PackagingError(
+                    '{} does not have matching library in "{}".'.format(
                         deb["binpackage"], ", ".join(para["lib"])
-                    ),
-                    file=sys.stderr,
+                    )
                 )
-                exit(1)
         elif deb["type"] == "perl":
             for libpkg in para["lib"]:
                 para["debs"][i]["depends"].update(
@@ -206,196 +199,47 @@ def analyze(para):
     #   para["export"] -- exported build environment variable type
     #   para["override"] -- set override_dh_* setting type
     #######################################################################
-    para["build_type"] = ""  # reset value
-    para["dh_buildsystem"] = ""  # normally not needed
-    # check if '*.pro' for Qmake project exist in advance.
-    pro = glob.glob("*.pro")
-    if pro:
-        pro = pro[0]
-    else:
-        pro = ""
-    # check if '*.spec.in' for RPM
-    # GNU coding standard with autotools = autoconf+automake
-    if (
-        os.path.isfile("configure.ac")
-        and os.path.isfile("Makefile.am")
-        and ("autotools-dev" not in para["dh_with"])
-    ):
-        para["dh_with"].update({"autoreconf"})
-        para["build_type"] = "Autotools with autoreconf"
-        para["build_depends"].update({"dh-autoreconf"})
-        para["export"].update({"autotools"})
-        if os.path.isfile("autogen.sh"):
-            para["override"].update({"autogen"})
-        else:
-            para["override"].update({"autoreconf"})
-    elif (
-        os.path.isfile("configure.in")
-        and os.path.isfile("Makefile.am")
-        and ("autotools-dev" not in para["dh_with"])
-    ):
-        para["dh_with"].update({"autoreconf"})
-        para["build_type"] = "Autotools with autoreconf (old)"
-        para["build_depends"].update({"dh-autoreconf"})
-        para["export"].update({"autotools"})
-        if os.path.isfile("autogen.sh"):
-            para["override"].update({"autogen"})
-        else:
-            para["override"].update({"autoreconf"})
-        print("W: Use of configure.in has been deprecated since 2001.")
-    elif (
-        os.path.isfile("configure.ac")
-        and os.path.isfile("Makefile.am")
-        and os.path.isfile("configure")
-    ):
-        para["dh_with"].update({"autotools-dev"})
-        para["build_type"] = "Autotools"
-        para["build_depends"].update({"autotools-dev"})
-        para["export"].update({"autotools"})
-    elif (
-        os.path.isfile("configure.in")
-        and os.path.isfile("Makefile.am")
-        and os.path.isfile("configure")
-    ):
-        para["dh_with"].update({"autotools-dev"})
-        para["build_type"] = "Autotools (old)"
-        para["build_depends"].update({"autotools-dev"})
-        para["export"].update({"autotools"})
-        print("W: Use of configure.in has been deprecated since 2001.")
-    elif "autoreconf" in para["dh_with"]:
-        print(
-            'E: missing configure.ac or Makefile.am required for "dh $@ --with autoreconf".',
-            file=sys.stderr,
+    # one traversal of the source tree shared by all checks below (or
+    # the replay of the cached one if the tree is unchanged)
+    index = None
+    if para["cache"]:
+        index = debmake.cache.load(
+            para["work_dir"], para["program_version"], para["sniff"], para["scan_jobs"]
         )
-        exit(1)
-    elif "autotools-dev" in para["dh_with"]:
-        print(
-            'E: missing configure.ac or Makefile.am or configure required for "dh $@ --with autotools-dev".',
-            file=sys.stderr,
+    if index is None:
+        index = debmake.index.SourceTreeIndex(
+            para["work_dir"],
+            para["scan_jobs"],
+            noext=para["sniff"],
+            dirs=para["cache"],
+            files=not para["licensecheck"],
         )
-        exit(1)
-    # GNU coding standard with configure
-    elif os.path.isfile("configure"):
-        para["build_type"] = "configure"
-        if setmultiarch:
-            para["override"].update({"multiarch"})
-    # GNU coding standard with Cmake
-    elif os.path.isfile("CMakeLists.txt"):
-        para["build_type"] = "Cmake"
-        para["build_depends"].update({"cmake"})
-        para["override"].update({"cmake"})
-        if setmultiarch:
-            para["override"].update({"multiarch"})
-    # GNU coding standard with make
-    elif os.path.isfile("Makefile"):
-        para["build_type"] = "make"
-        para["override"].update({"makefile"})
-        if setmultiarch:
-            para["override"].update({"multiarch"})
-    # Python setuptools
-    elif os.path.isfile("setup.py"):
-        para["dh_with"].update({"python3"})
-        para["build_type"] = "Python setuptools (setup.py)"
-        para["dh_buildsystem"] = "pybuild"
-        # dh-python and python3-build are pulled in by pybuild-plugin-pyproject"
-        para["build_depends"].update({"python3-all", "pybuild-plugin-pyproject"})
-        if debmake.grep.grep("setup.py", "python3", 0, 1) or debmake.grep.grep(
-            "setup.py", "python", 0, 1
-        ):
-            # http://docs.python.org/3/distutils/
-            if debmake.grep.grep(
-                "setup.py", r"from\s+setuptools\s+import\s+setup", 0, -1
-            ):
-                # TODO: this needs verification
-                para["build_depends"].update({"python3-setuptools"})
-            else:
-                # non-setuptools (pure distutil?) may not be supported
-                print(
-                    "W: no setuptools. (distutils?)  check setup.py.",
-                )
-        else:
-            print("W: unknown python system.  check setup.py.")
-    elif os.path.isfile("setup.cnf"):
-        para["dh_with"].update({"python3"})
-        para["build_type"] = "Python setuptools (setup.cnf)"
-        para["dh_buildsystem"] = "pybuild"
-        # dh-python and python3-build are pulled in by pybuild-plugin-pyproject"
-        para["build_depends"].update({"python3-all", "pybuild-plugin-pyproject"})
-        # TODO: check if this is good idea
-        para["build_depends"].update({"python3-setuptools"})
-    elif os.path.isfile("pyproject.toml"):
-        para["dh_with"].update({"python3"})
-        para["build_type"] = "Python (pyproject.toml: PEP-518, PEP-621, PEP-660)"
-        para["dh_buildsystem"] = "pybuild"
-        # dh-python and python3-build are pulled in by pybuild-plugin-pyproject"
-        para["build_depends"].update({"python3-all", "pybuild-plugin-pyproject"})
-        if debmake.grep.grep("pyproject.toml", r"setuptools", 0, -1):
-            # TODO: check if this is good idea
-            para["build_depends"].update({"python3-setuptools"})
-            # para["build_depends"].update({"python3-setuptools-whl"})
-            print("W: setuptools build system.")
-        elif debmake.grep.grep("pyproject.toml", r"hatchling", 0, -1):
-            # TODO: check if this is good idea
-            para["build_depends"].update({"python3-hatchling"})
-            print("W: Hatchling build system.")
-        elif debmake.grep.grep("pyproject.toml", r"flit_core", 0, -1):
-            # TODO: check if this is good idea
-            para["build_depends"].update({"flit"})
-            print("W: Flit build system.")
-        elif debmake.grep.grep("pyproject.toml", r"pdm-backend", 0, -1):
-            # TODO: check if this is good idea
-            para["build_depends"].update({"python3-pdm"})
-            # para["build_depends"].update({"python3-pdm-pep517"})
-            print("W: PDM build system.")
-        else:
-            # TODO: check if this is good idea
-            print("W: unknown python build system.")
-    # Perl
-    elif os.path.isfile("Build.PL"):
-        # Preferred over Makefile.PL after debhelper v8
-        para["build_type"] = "Perl Module::Build"
-        para["build_depends"].update({"perl"})
-    elif os.path.isfile("Makefile.PL"):
-        para["build_type"] = "Perl ExtUtils::MakeMaker"
-        para["build_depends"].update({"perl"})
-    # Ruby
-    elif os.path.isfile("setup.rb"):
-        print(
-            "W: dh-make-ruby(1) (gem2deb package) may provide better packaging results.",
-        )
-        para["build_type"] = "Ruby setup.rb"
-        para["build_depends"].update({"ruby", "gem2deb"})
-    # Javascript nodejs
-    elif os.path.isfile("package.json"):
-        para["build_type"] = "nodejs"
-        para["dh_with"].update({"nodejs"})
-        para["build_depends"].update({"dh-nodejs"})
-    # Java
-    elif os.path.isfile("build.xml"):
-        para["build_type"] = "Java ant"
-        para["dh_with"].update({"javahelper"})
-        # XXX FIXME XXX which compiler to use?
-        para["build_depends"].update({"javahelper", "gcj"})
-        para["export"].update({"java", "compiler"})
-        para["override"].update({"java"})
-        if setmultiarch:
-            para["override"].update({"multiarch"})
-    # Qmake
-    elif os.path.isfile(pro):
-        # XXX FIXME XXX Is this right?
-        para["build_type"] = "QMake"
-        para["build_depends"].update({"qt4-qmake"})
-        if setmultiarch:
-            para["override"].update({"multiarch"})
-    else:
-        para["build_type"] = "Unknown"
-        if setmultiarch:
-            para["override"].update({"multiarch"})
+    # reused by debmake.copyright
+    para["index"] = index
+    para["build_type"] = ""  # reset value
+    para["dh_buildsystem"] = ""  # normally not needed
+    # first matching rule in debmake.buildtype.rules
+    rule = debmake.buildtype.detect(index, para["dh_with"])
+    debmake.buildtype.apply(rule, index, para, setmultiarch)
     print("I: build_type = {}".format(para["build_type"]))
     #######################################################################
+    # prefill by the upstream metadata (pyproject.toml, setup.cfg, package.json)
+    #######################################################################
+    metadata = index.metadata()
+    if not para["desc"].strip() and metadata["summary"]:
+        para["desc"] = metadata["summary"]
+        print('I: desc = "{}" (upstream metadata)'.format(para["desc"]))
+    if para["homepage"].startswith("<") and metadata["homepage"]:
+        para["homepage"] = metadata["homepage"]
+        print('I: homepage = "{}" (upstream metadata)'.format(para["homepage"]))
+    #######################################################################
     # analyze file extensions
     #######################################################################
-    para["ext_type_counter"] = debmake.scanext.scanext()
+    para["ext_type_counter"] = debmake.scanext.scanext(
+        index, para["sniff"], para["sniff_jobs"]
+    )
+    if para["cache"] and isinstance(index, debmake.index.SourceTreeIndex):
+        debmake.cache.save(index, para["program_version"], para["sniff"])
     #######################################################################
     # compiler: set build dependency etc. if they are used
     if "c" in para["ext_type_counter"].keys():
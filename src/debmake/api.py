@@ -0,0 +1,313 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import collections
+import importlib
+import os
+import shlex
+import sys
+import time
+
+import debmake
+import debmake.debug
+import debmake.error
+import debmake.para
+import debmake.sh
+import debmake.timing
+
+
+#######################################################################
+# initial para[...] values
+#######################################################################
+def init_para(start_dir=None):
+    """
+    Return para[...] with their initial values.  All relative paths
+    given later are resolved against start_dir (default: current directory).
+    """
+    debmake.timing.reset()
+    para = {}  # effective global variable storage
+    para["program_name"] = debmake.__programname__
+    para["program_version"] = debmake.__version__
+    para["program_copyright"] = debmake.__copyright__
+    para["program_license"] = debmake.__license__
+    print(
+        "I: {} (version: {})".format(para["program_name"], para["program_version"]),
+    )
+    print(
+        "I: {}".format(para["program_copyright"]),
+    )
+    if start_dir is None:
+        start_dir = os.getcwd()
+    para["start_dir"] = os.path.abspath(start_dir)
+    para["debug"] = os.environ.get("DEBUG", "")  # overridden by -D
+    para["date"] = time.strftime("%a, %d %b %Y %H:%M:%S %z")
+    para["shortdate"] = time.strftime("%d %b %Y")
+    para["year"] = time.strftime("%Y")
+    para["standard_version"] = debmake.__debian_policy__  # Debian policy_
+    para["compat"] = debmake.__debian_compat__  # debhelper
+    para["build_depends"] = {"debhelper-compat (= " + para["compat"] + ")"}
+    para["desc"] = ""
+    para["desc_long"] = ""
+    para["export"] = set()
+    para["override"] = set()
+    para["data_path"] = ""  # resolved by data_path() when needed
+    para["tarball"] = ""
+    para["package"] = ""
+    para["version"] = ""
+    para["revision"] = ""
+    para["tarz"] = ""
+    para["debs"] = []
+    return para
+
+
+#######################################################################
+# data_path: path to debmake/data/ with / at the end
+#######################################################################
+def data_path():
+    # importlib.resources is slow to import and only needed for templates
+    import importlib.resources
+
+    return "{}/data/".format(importlib.resources.files("debmake"))
+
+
+#######################################################################
+# call: import the stage module only when its stage is selected and
+# skip the stage if its checkpoint is still valid
+#######################################################################
+def call(name, para):
+    checkpoint = importlib.import_module("debmake.checkpoint")
+    # the inputs are fingerprinted once for skip() and record()
+    values = None
+    if checkpoint.checkpointed(name, para):
+        values = checkpoint.inputs(name, para)
+        if checkpoint.skip(name, para, values):
+            return
+    module = importlib.import_module("debmake." + name)
+    debmake.timing.call(getattr(module, name), para)
+    checkpoint.forget(para)
+    if values is not None:
+        checkpoint.record(name, para, values)
+    return
+
+
+#######################################################################
+# parse: set para[...] from the command line arguments (default: sys.argv)
+#######################################################################
+def parse(para, argv=None):
+    debmake.debug.debug("initial values", para=para)
+    with debmake.timing.stage("para"):
+        debmake.para.para(para, argv)
+    debmake.debug.debug("values set by CLI", type="p", para=para)
+    return
+
+
+#######################################################################
+# execute: run the pipeline and write the run profile if requested
+#######################################################################
+def execute(para):
+    try:
+        pipeline(para)
+    finally:
+        # --profile, --profile-trace
+        debmake.timing.write(para)
+    return
+
+
+#######################################################################
+# pipeline: get the upstream source and make debian/* package files
+#######################################################################
+def pipeline(para):
+    #######################################################################
+    # print basic package info
+    #######################################################################
+    if para["native"]:
+        print(
+            'I: Native Debian package pkg="{}", ver="{}" method="{}"'.format(
+                para["package"], para["version"], para["method"]
+            ),
+        )
+    else:
+        print(
+            'I: Non-native Debian package pkg="{}", ver="{}", rev="{}" method="{}"'.format(
+                para["package"], para["version"], para["revision"], para["method"]
+            ),
+        )
+    #######################################################################
+    # get working tree to local base directory
+    #######################################################################
+    if para["method"] == "tar_wget":
+        # obtain tarball from URL and expand to package-version/
+        call("tar_wget", para)
+        call("tar_orig", para)
+        call("tar_expand", para)
+    elif para["method"] == "tar_copy":
+        # obtain tarball from PATH and expand to package-version/
+        call("tar_copy", para)
+        call("tar_orig", para)
+        call("tar_expand", para)
+    elif para["method"] == "dir_git":
+        # work tree at package-version copied from
+        # clone work tree at package/
+        call("dir_git", para)
+        call("dir_debmake", para)
+        if not para["native"]:
+            call("dir_tar", para)
+            call("tar_orig", para)
+    elif para["method"] == "dir_debmake":
+        # work tree at package-version copied from PATH
+        call("dir_debmake", para)
+        if not para["native"]:
+            call("dir_tar", para)
+            call("tar_orig", para)
+    else:
+        debmake.debug.debug('values causing "bug in para.py"', type="p", para=para)
+        raise debmake.error.DebmakeError(
+            'bug in para.py? method="{}"'.format(para["method"])
+        )
+    #######################################################################
+    # -q: quit here before generating template debian/* package files
+    #######################################################################
+    if para["quitearly"]:
+        print("I: quit early after making the upstream tarball.")
+        debmake.debug.debug('values at "quit early"', type="p", para=para)
+        return
+    #######################################################################
+    # Prep to create debian/* package files in debmake_dir
+    #######################################################################
+    # debian/* are generated in para["work_dir"]=base_dir/package-version
+    # without changing the current directory of the process
+    print(
+        "I: [{}] $ cd {}".format(
+            os.path.basename(para["base_dir"]), para["debmake_dir"]
+        )
+    )
+    call("debs", para)
+    debmake.debug.debug(
+        'values after "-b" option parsing to debs[...]', type="d", para=para
+    )
+    call("analyze", para)
+    debmake.debug.debug("values after analyzing the source", type="d", para=para)
+    # debmake.gui()          # GUI setting
+    # debmake.debug.debug(after gui", type="P", para=para)
+    #######################################################################
+    # Make debian/* package files
+    #######################################################################
+    if not para["data_path"]:
+        para["data_path"] = data_path()
+    # one read for all templates if they are packed (see debmake.pack)
+    importlib.import_module("debmake.read").load_pack(para["data_path"])
+    call("debian", para)
+    #######################################################################
+    # Make Debian package(s)
+    #######################################################################
+    if para["invoke"]:
+        # This is safe string
+        print("I: invoke dbuild/sbuild equivalents")
+        with debmake.timing.stage("invoke"):
+            debmake.sh.sh(para["invoke"], para["work_dir"])
+    #######################################################################
+    # Make Debian package(s)
+    #######################################################################
+    work_dir = os.path.normpath(para["work_dir"])
+    if work_dir != para["start_dir"]:
+        # abspath comparison
+        print(
+            'I: "cd {}" to the directory where debian/* are generated'.format(
+                os.path.relpath(work_dir, para["start_dir"])
+            )
+        )
+    return
+
+
+#######################################################################
+# run: library entry point
+#######################################################################
+# base_dir: directory holding the tarball and the source tree
+# work_dir: directory where debian/* are generated
+# binaries: binary package names
+# para:     all the values used for this run
+Result = collections.namedtuple(
+    "Result",
+    [
+        "package",
+        "version",
+        "revision",
+        "native",
+        "method",
+        "base_dir",
+        "work_dir",
+        "binaries",
+        "para",
+    ],
+)
+
+
+def run(config, base_dir=None):
+    """
+    Run debmake as if "cd base_dir; debmake config..." were typed and
+    return Result.  config is the list of command line arguments (or a
+    string to be split as the shell does).  The current directory of the
+    process is never changed, so this can be called from threads.
+
+    Errors are raised as debmake.error.DebmakeError subclasses.  None is
+    returned if only --help or --version is requested.
+    """
+    if isinstance(config, str):
+        argv = shlex.split(config)
+    else:
+        argv = [str(arg) for arg in config]
+    para = init_para(base_dir)
+    try:
+        parse(para, argv)
+    except SystemExit as e:
+        if e.code in (0, None):
+            return None
+        raise debmake.error.UsageError(
+            "invalid arguments: {}".format(" ".join(argv))
+        ) from None
+    if para["batch"]:
+        raise debmake.error.UsageError("--batch is not supported by debmake.run()")
+    execute(para)
+    return Result(
+        package=para["package"],
+        version=para["version"],
+        revision=para["revision"],
+        native=para["native"],
+        method=para["method"],
+        base_dir=para["base_dir"],
+        work_dir=os.path.normpath(para["work_dir"]),
+        binaries=[deb["binpackage"] for deb in para["debs"]],
+        para=para,
+    )
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    try:
+        print(run(sys.argv[1:]))
+    except debmake.error.DebmakeError as e:
+        print("E: {}".format(e), file=sys.stderr)
+        exit(1)
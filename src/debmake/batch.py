@@ -0,0 +1,211 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import concurrent.futures
+import os
+import shlex
+import sys
+import time
+import traceback
+
+import debmake.api
+import debmake.error
+
+
+#######################################################################
+# read_manifest: list of (line number, argument list)
+#######################################################################
+def read_manifest(manifest):
+    """
+    Each non-empty line of the manifest holds the URL (or PATH) and its
+    per-package options as if typed on the debmake command line, e.g.:
+
+        https://example.org/foo-1.0.tar.gz -r 2 -b ",libfoo1,libfoo-dev"
+        bar -p bar -u 2.0~rc1 -z gz   # comments are ignored
+    """
+    if not os.path.isfile(manifest):
+        raise debmake.error.UsageError('batch manifest missing: "{}"'.format(manifest))
+    entries = []
+    with open(manifest, mode="r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            try:
+                argv = shlex.split(line, comments=True)
+            except ValueError as e:
+                raise debmake.error.UsageError(
+                    'batch manifest "{}" line {}: {}'.format(manifest, lineno, e)
+                ) from None
+            if argv:
+                entries.append((lineno, argv))
+    return entries
+
+
+def exit_status(code):
+    # convert SystemExit.code to the shell exit status
+    if code is None:
+        return 0
+    elif isinstance(code, int):
+        return code
+    else:
+        return 1
+
+
+#######################################################################
+# batch_entry: run the whole debmake pipeline for one manifest entry
+#######################################################################
+def batch_entry(start_dir, argv, log):
+    """
+    Executed in a worker process.  Its stdin is /dev/null and its
+    stdout/stderr (including those of the invoked shell commands) are
+    redirected to the log file.  Return (status, package, elapsed).
+    """
+    begin = time.monotonic()
+    status = 1
+    package = ""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = [os.dup(fd) for fd in (0, 1, 2)]
+    with open(os.devnull, mode="r") as null, open(log, mode="w") as f:
+        os.dup2(null.fileno(), 0)
+        os.dup2(f.fileno(), 1)
+        os.dup2(f.fileno(), 2)
+        try:
+            para = debmake.api.init_para(start_dir)
+            debmake.api.parse(para, argv)
+            package = para["package"]
+            debmake.api.execute(para)
+            status = 0
+        except debmake.error.DebmakeError as e:
+            print("E: {}".format(e), file=sys.stderr)
+            status = 1
+        except SystemExit as e:
+            status = exit_status(e.code)
+        except Exception:
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            for fd, saved_fd in zip((0, 1, 2), saved_fds):
+                os.dup2(saved_fd, fd)
+                os.close(saved_fd)
+    return (status, package, time.monotonic() - begin)
+
+
+#######################################################################
+# batch: called from debmake.main()
+#######################################################################
+def batch(para):
+    """
+    Run the debmake pipeline for each entry of para["batch"] with a pool
+    of para["jobs"] worker processes and return the aggregated status.
+
+    Nobody can answer [Y/n] prompts of workers.  So -y is implied unless
+    -y/-yy is given explicitly.  Each worker runs with --jobs 1 so that
+    its license scan does not start another pool of para["jobs"] worker
+    processes (unless its manifest line sets --jobs).
+    """
+    entries = read_manifest(para["batch"])
+    if not entries:
+        print('W: no entry in batch manifest "{}"'.format(para["batch"]))
+        return 0
+    if para["yes"] == 0:
+        print("I: batch mode answers all prompts with yes (use -yy to answer no)")
+        yes = 1
+    else:
+        yes = para["yes"]
+    common_argv = ["-y"] * yes
+    if para["verbose"]:
+        common_argv.append("-V")
+    # the pool is the only parallelism of the batch
+    common_argv.extend(["--jobs", "1"])
+    jobs = min(para["jobs"], len(entries))
+    print(
+        'I: batch {} entries from "{}" with {} jobs'.format(
+            len(entries), para["batch"], jobs
+        )
+    )
+    begin = time.monotonic()
+    results = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        for lineno, argv in entries:
+            log = "{}.{:03d}.log".format(para["batch"], lineno)
+            future = executor.submit(
+                batch_entry, para["start_dir"], common_argv + argv, log
+            )
+            futures[future] = (lineno, argv, log)
+        for future in concurrent.futures.as_completed(futures):
+            lineno, argv, log = futures[future]
+            try:
+                status, package, elapsed = future.result()
+            except Exception as e:
+                # worker process died
+                status, package, elapsed = 1, "", 0.0
+                print("E: batch line {}: {}".format(lineno, e), file=sys.stderr)
+            results[lineno] = (status, package or argv[0], elapsed, log)
+            print(
+                "I: batch [{}/{}] line {}: {} ({}, {:.1f}s)".format(
+                    len(results),
+                    len(entries),
+                    lineno,
+                    "OK" if status == 0 else "FAILED",
+                    package or argv[0],
+                    elapsed,
+                )
+            )
+    #######################################################################
+    # aggregated summary in the manifest order
+    #######################################################################
+    failed = 0
+    print("I: batch summary ==================================== status")
+    for lineno, argv in entries:
+        status, package, elapsed, log = results[lineno]
+        if status != 0:
+            failed += 1
+        print(
+            "I:   line {:>4} {:<24} {:>7.1f}s {:>4}  {}".format(
+                lineno,
+                package,
+                elapsed,
+                status,
+                os.path.relpath(log, para["start_dir"]),
+            )
+        )
+    print(
+        "I: batch {} entries: {} succeeded, {} failed in {:.1f}s".format(
+            len(entries), len(entries) - failed, failed, time.monotonic() - begin
+        )
+    )
+    if failed:
+        print("E: batch had {} failed entries".format(failed), file=sys.stderr)
+        return 1
+    return 0
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    for lineno, argv in read_manifest(sys.argv[1]):
+        print("X: line {}: {}".format(lineno, argv))
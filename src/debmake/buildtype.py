@@ -0,0 +1,334 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import debmake.error
+
+#######################################################################
+# Build system detection rules
+#
+# The first rule whose conditions all hold sets the build system.
+#
+# conditions:
+#   "unless_dh_with": not in para["dh_with"] (-w option)
+#   "when_dh_with":   in para["dh_with"] (-w option)
+#   "files":          all files exist in the top directory
+#   "glob":           some file matches in the top directory
+#   "grep":           all (file, regex, begin, end) match its lines
+#                     (see debmake.grep.grep)
+#   "backend":        PEP 517 build backend of pyproject.toml is one of
+#                     them (see debmake.metadata)
+# results:
+#   "error":          raise debmake.error.PackagingError
+#   "build_type":     para["build_type"]
+#   "dh_buildsystem": para["dh_buildsystem"]
+#   "dh_with", "build_depends", "export", "override":
+#                     added to the set para[...]
+#   "multiarch":      add "multiarch" to para["override"] if multiarch
+#   "warning":        printed
+#   "variants":       the first matching sub-rule adds its results
+#
+# The conditions are answered by debmake.index.SourceTreeIndex which has
+# the top directory entries from its single traversal and reads each
+# file only once.
+#######################################################################
+autoreconf_variants = [
+    {"files": ["autogen.sh"], "override": {"autogen"}},
+    {"override": {"autoreconf"}},
+]
+python_depends = {"python3-all", "pybuild-plugin-pyproject"}
+rules = [
+    # GNU coding standard with autotools = autoconf+automake
+    {
+        "unless_dh_with": "autotools-dev",
+        "files": ["configure.ac", "Makefile.am"],
+        "build_type": "Autotools with autoreconf",
+        "dh_with": {"autoreconf"},
+        "build_depends": {"dh-autoreconf"},
+        "export": {"autotools"},
+        "variants": autoreconf_variants,
+    },
+    {
+        "unless_dh_with": "autotools-dev",
+        "files": ["configure.in", "Makefile.am"],
+        "build_type": "Autotools with autoreconf (old)",
+        "dh_with": {"autoreconf"},
+        "build_depends": {"dh-autoreconf"},
+        "export": {"autotools"},
+        "variants": autoreconf_variants,
+        "warning": "W: Use of configure.in has been deprecated since 2001.",
+    },
+    {
+        "files": ["configure.ac", "Makefile.am", "configure"],
+        "build_type": "Autotools",
+        "dh_with": {"autotools-dev"},
+        "build_depends": {"autotools-dev"},
+        "export": {"autotools"},
+    },
+    {
+        "files": ["configure.in", "Makefile.am", "configure"],
+        "build_type": "Autotools (old)",
+        "dh_with": {"autotools-dev"},
+        "build_depends": {"autotools-dev"},
+        "export": {"autotools"},
+        "warning": "W: Use of configure.in has been deprecated since 2001.",
+    },
+    {
+        "when_dh_with": "autoreconf",
+        "error": 'missing configure.ac or Makefile.am required for "dh $@ --with autoreconf".',
+    },
+    {
+        "when_dh_with": "autotools-dev",
+        "error": 'missing configure.ac or Makefile.am or configure required for "dh $@ --with autotools-dev".',
+    },
+    # GNU coding standard with configure
+    {
+        "files": ["configure"],
+        "build_type": "configure",
+        "multiarch": True,
+    },
+    # GNU coding standard with Cmake
+    {
+        "files": ["CMakeLists.txt"],
+        "build_type": "Cmake",
+        "build_depends": {"cmake"},
+        "override": {"cmake"},
+        "multiarch": True,
+    },
+    # GNU coding standard with make
+    {
+        "files": ["Makefile"],
+        "build_type": "make",
+        "override": {"makefile"},
+        "multiarch": True,
+    },
+    # Python setuptools
+    # (dh-python and python3-build are pulled in by pybuild-plugin-pyproject)
+    {
+        "files": ["setup.py"],
+        "build_type": "Python setuptools (setup.py)",
+        "dh_with": {"python3"},
+        "dh_buildsystem": "pybuild",
+        "build_depends": python_depends,
+        "variants": [
+            # http://docs.python.org/3/distutils/
+            {
+                "grep": [
+                    ("setup.py", r"python", 0, 1),
+                    ("setup.py", r"from\s+setuptools\s+import\s+setup", 0, -1),
+                ],
+                # TODO: this needs verification
+                "build_depends": {"python3-setuptools"},
+            },
+            {
+                # non-setuptools (pure distutil?) may not be supported
+                "grep": [("setup.py", r"python", 0, 1)],
+                "warning": "W: no setuptools. (distutils?)  check setup.py.",
+            },
+            {"warning": "W: unknown python system.  check setup.py."},
+        ],
+    },
+    {
+        "files": ["setup.cnf"],
+        "build_type": "Python setuptools (setup.cnf)",
+        "dh_with": {"python3"},
+        "dh_buildsystem": "pybuild",
+        # TODO: check if python3-setuptools is good idea
+        "build_depends": python_depends | {"python3-setuptools"},
+    },
+    {
+        "files": ["pyproject.toml"],
+        "build_type": "Python (pyproject.toml: PEP-518, PEP-621, PEP-660)",
+        "dh_with": {"python3"},
+        "dh_buildsystem": "pybuild",
+        "build_depends": python_depends,
+        # TODO: check if these are good idea
+        "variants": [
+            {
+                "backend": ["setuptools"],
+                "build_depends": {"python3-setuptools"},
+                "warning": "W: setuptools build system.",
+            },
+            {
+                "backend": ["hatchling"],
+                "build_depends": {"python3-hatchling"},
+                "warning": "W: Hatchling build system.",
+            },
+            {
+                "backend": ["flit_core", "flit"],
+                "build_depends": {"flit"},
+                "warning": "W: Flit build system.",
+            },
+            {
+                "backend": ["pdm"],
+                "build_depends": {"python3-pdm"},
+                "warning": "W: PDM build system.",
+            },
+            {
+                "backend": ["poetry"],
+                "build_depends": {"python3-poetry-core"},
+                "warning": "W: Poetry build system.",
+            },
+            {"warning": "W: unknown python build system."},
+        ],
+    },
+    # Perl (Build.PL is preferred over Makefile.PL after debhelper v8)
+    {
+        "files": ["Build.PL"],
+        "build_type": "Perl Module::Build",
+        "build_depends": {"perl"},
+    },
+    {
+        "files": ["Makefile.PL"],
+        "build_type": "Perl ExtUtils::MakeMaker",
+        "build_depends": {"perl"},
+    },
+    # Ruby
+    {
+        "files": ["setup.rb"],
+        "build_type": "Ruby setup.rb",
+        "build_depends": {"ruby", "gem2deb"},
+        "warning": "W: dh-make-ruby(1) (gem2deb package) may provide better packaging results.",
+    },
+    # Javascript nodejs
+    {
+        "files": ["package.json"],
+        "build_type": "nodejs",
+        "dh_with": {"nodejs"},
+        "build_depends": {"dh-nodejs"},
+    },
+    # Java
+    {
+        "files": ["build.xml"],
+        "build_type": "Java ant",
+        "dh_with": {"javahelper"},
+        # XXX FIXME XXX which compiler to use?
+        "build_depends": {"javahelper", "gcj"},
+        "export": {"java", "compiler"},
+        "override": {"java"},
+        "multiarch": True,
+    },
+    # Qmake
+    {
+        "glob": "*.pro",
+        # XXX FIXME XXX Is this right?
+        "build_type": "QMake",
+        "build_depends": {"qt4-qmake"},
+        "multiarch": True,
+    },
+    {
+        "build_type": "Unknown",
+        "multiarch": True,
+    },
+]
+
+
+#######################################################################
+# match: True if all conditions of the rule hold
+#######################################################################
+def match(rule, index, dh_with):
+    if "unless_dh_with" in rule and rule["unless_dh_with"] in dh_with:
+        return False
+    if "when_dh_with" in rule and rule["when_dh_with"] not in dh_with:
+        return False
+    for name in rule.get("files", []):
+        if not index.isfile(name):
+            return False
+    if "glob" in rule and not index.glob(rule["glob"]):
+        return False
+    prefetch([rule], index)
+    for relpath, rtext, begin, end in rule.get("grep", []):
+        if not index.grep(relpath, rtext, begin, end):
+            return False
+    if "backend" in rule and index.metadata()["backend"] not in rule["backend"]:
+        return False
+    return True
+
+
+#######################################################################
+# prefetch: answer all grep conditions of rules with one pass per file
+#######################################################################
+def prefetch(rules, index):
+    patterns = {}
+    for rule in rules:
+        for relpath, rtext, begin, end in rule.get("grep", []):
+            patterns.setdefault(relpath, []).append((rtext, begin, end))
+    for relpath, file_patterns in patterns.items():
+        index.grep_many(relpath, file_patterns)
+    return
+
+
+#######################################################################
+# detect: the first matching rule
+#######################################################################
+def detect(index, dh_with, rules=rules):
+    for rule in rules:
+        if match(rule, index, dh_with):
+            return rule
+    return {}
+
+
+#######################################################################
+# apply: set para[...] by the rule (and its first matching variant)
+#######################################################################
+def apply(rule, index, para, setmultiarch):
+    if "error" in rule:
+        raise debmake.error.PackagingError(rule["error"])
+    if "build_type" in rule:
+        para["build_type"] = rule["build_type"]
+    if "dh_buildsystem" in rule:
+        para["dh_buildsystem"] = rule["dh_buildsystem"]
+    for key in ["dh_with", "build_depends", "export", "override"]:
+        para[key].update(rule.get(key, set()))
+    if rule.get("multiarch", False) and setmultiarch:
+        para["override"].update({"multiarch"})
+    prefetch(rule.get("variants", []), index)
+    for variant in rule.get("variants", []):
+        if match(variant, index, para["dh_with"]):
+            apply(variant, index, para, setmultiarch)
+            break
+    if "warning" in rule:
+        print(rule["warning"])
+    return
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    import sys
+
+    import debmake.index
+
+    index = debmake.index.SourceTreeIndex(sys.argv[1] if len(sys.argv) > 1 else ".")
+    para = {
+        "build_type": "",
+        "dh_buildsystem": "",
+        "dh_with": set(),
+        "build_depends": set(),
+        "export": set(),
+        "override": set(),
+    }
+    apply(detect(index, para["dh_with"]), index, para, True)
+    for key, value in para.items():
+        print("I: {:<16} = {}".format(key, value))
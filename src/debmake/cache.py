@@ -0,0 +1,273 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import collections
+import hashlib
+import json
+import os
+
+import debmake.index
+
+#######################################################################
+# Analysis cache
+#
+# The results of the probes of analyze.analyze() on the source tree
+# (isfile, glob, grep, metadata) and the extension counters of
+# scanext.scanext() are kept in
+# $XDG_CACHE_HOME/debmake/<hash of the tree path>.json.  The
+# decisions made from them depend on the command line options (-b, -w,
+# -m, ...) and are always made again, so changing options only replays
+# the cached probes without scanning the tree.
+#
+# The cache is keyed by a cheap fingerprint of the tree:
+#   * the names in the top directory (and if they are files)
+#   * (st_ino, st_mtime_ns) of all descended subdirectories; adding,
+#     removing or renaming a file changes the mtime of its directory
+#     (for a git work tree: .git/index, see debmake.index)
+#   * (st_ino, st_size, st_mtime_ns) of the files read by grep or sniff
+# Verifying it needs one scandir of the top directory and one stat per
+# subdirectory and per read file.  Like git's "racy" index entries, an
+# entry modified within RACY_NS before the scan (e.g. a tree just made by
+# tar or cp) may change again in the same mtime tick unseen, so its
+# content is also kept:
+#   * sha256 of the sorted names in a subdirectory or of a file
+# and checked again by each load.  Only a tree modified while it was
+# scanned (timestamps lag the clock by up to TICK_NS, or by up to
+# RACY_NS on filesystems with whole second timestamps) is not cached.
+#######################################################################
+CACHE_FORMAT = 2
+RACY_NS = 2 * 10**9
+TICK_NS = 10**8
+
+
+def cache_dir():
+    cache_home = os.environ.get("XDG_CACHE_HOME", "")
+    if not cache_home:
+        cache_home = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "debmake")
+
+
+def path(top):
+    top = os.path.realpath(top)
+    name = hashlib.sha256(top.encode("utf-8", "surrogateescape")).hexdigest()
+    return os.path.join(cache_dir(), name[:32] + ".json")
+
+
+#######################################################################
+# fingerprint pieces
+#######################################################################
+def top_names(top):
+    # name -> True if file, without debian/ (written by debmake itself)
+    names = {}
+    with os.scandir(top) as it:
+        for entry in it:
+            if entry.name == "debian":
+                continue
+            try:
+                names[entry.name] = entry.is_file()
+            except OSError:
+                names[entry.name] = False
+    return names
+
+
+def file_stat(path):
+    st = os.stat(path)
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def content(path):
+    # sha256 of the sorted names in a directory or of the file
+    if os.path.isdir(path):
+        data = "\0".join(sorted(os.listdir(path))).encode("utf-8", "surrogateescape")
+    else:
+        with open(path, mode="rb") as f:
+            data = f.read()
+    return hashlib.sha256(data).hexdigest()
+
+
+#######################################################################
+# CachedIndex: replay of debmake.index.SourceTreeIndex
+#######################################################################
+class CachedIndex:
+    """
+    Same queries as debmake.index.SourceTreeIndex answered from the
+    cache.  A query not in the cache (only after debmake itself changed)
+    falls back to a real scan of the tree.
+    """
+
+    def __init__(self, top, record, jobs=1, noext=False):
+        self.top = top
+        self.ext_counter = collections.Counter(dict(record["ext_counter"]))
+        self.noext = record["noext"]
+        # None if not collected when saved
+        self.relpaths = record.get("relpaths")
+        self.sniffed = collections.Counter(dict(record["sniffed"]))
+        self.probes = {tuple(json.loads(key)): value for key, value in record["probes"]}
+        self.jobs = jobs
+        self.collect_noext = noext
+        self.index = None
+
+    def query(self, *key):
+        if key not in self.probes:
+            if self.index is None:
+                self.index = debmake.index.SourceTreeIndex(
+                    self.top, self.jobs, noext=self.collect_noext
+                )
+            self.probes[key] = getattr(self.index, key[0])(*key[1:])
+        return self.probes[key]
+
+    def isfile(self, name):
+        return self.query("isfile", name)
+
+    def glob(self, pattern):
+        return self.query("glob", pattern)
+
+    def grep(self, relpath, rtext, *range):
+        return self.query("grep", relpath, rtext, *range)
+
+    def grep_many(self, relpath, patterns):
+        return [self.query("grep", relpath, *pattern) for pattern in patterns]
+
+    def metadata(self):
+        return self.query("metadata")
+
+    def sniff(self, jobs=0):
+        return self.sniffed
+
+    def files(self):
+        if self.relpaths is None:
+            self.relpaths = list(debmake.index.files(self.top))
+        return self.relpaths
+
+
+#######################################################################
+# load: CachedIndex if the tree is unchanged, otherwise None
+#######################################################################
+def load(top, program_version, sniff=False, jobs=1):
+    try:
+        with open(path(top), mode="r", encoding="utf-8") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(record, dict)
+        or record.get("format") != CACHE_FORMAT
+        or record.get("program_version") != program_version
+        or record.get("top") != os.path.realpath(top)
+        or record.get("sniff") != sniff
+    ):
+        return None
+    try:
+        if record["names"] != top_names(top):
+            return None
+        for reldir, (ino, mtime_ns) in record["dirs"].items():
+            st = os.lstat(os.path.join(top, reldir))
+            if (st.st_ino, st.st_mtime_ns) != (ino, mtime_ns):
+                return None
+        for relpath, stat in record["files"].items():
+            if file_stat(os.path.join(top, relpath)) != stat:
+                return None
+        for relpath, digest in record["contents"].items():
+            if content(os.path.join(top, relpath)) != digest:
+                return None
+        index = CachedIndex(top, record, jobs, noext=sniff)
+    except (OSError, KeyError, TypeError, ValueError):
+        return None
+    print("I: use the cached analysis of the unchanged source tree")
+    return index
+
+
+#######################################################################
+# save: record a debmake.index.SourceTreeIndex after analyze
+#######################################################################
+def save(index, program_version, sniff=False):
+    # only the files read by grep and sniff matter
+    relpaths = list(index.read)
+    if sniff:
+        relpaths.extend(index.noext)
+    try:
+        files = {
+            relpath: file_stat(os.path.join(index.top, relpath)) for relpath in relpaths
+        }
+        names = top_names(index.top)
+    except OSError:
+        return
+    mtimes = {relpath: mtime_ns for relpath, (ino, mtime_ns) in index.dirs.items()}
+    mtimes.update((relpath, stat[2]) for relpath, stat in files.items())
+    if any(mtime_ns % 10**9 for mtime_ns in mtimes.values()):
+        tick_ns = TICK_NS
+    else:
+        tick_ns = RACY_NS
+    if max(list(mtimes.values()) + [0]) > index.scan_time_ns - tick_ns:
+        return
+    try:
+        contents = {
+            relpath: content(os.path.join(index.top, relpath))
+            for relpath, mtime_ns in mtimes.items()
+            if mtime_ns > index.scan_time_ns - RACY_NS
+        }
+    except OSError:
+        return
+    record = {
+        "format": CACHE_FORMAT,
+        "program_version": program_version,
+        "top": os.path.realpath(index.top),
+        "sniff": sniff,
+        "names": names,
+        "dirs": index.dirs,
+        "files": files,
+        "contents": contents,
+        "ext_counter": list(index.ext_counter.items()),
+        "noext": index.noext,
+        "relpaths": index.relpaths if index.collect_files else None,
+        "sniffed": list((index.sniffed or {}).items()),
+        "probes": [[json.dumps(key), value] for key, value in index.probes.items()],
+    }
+    file = path(index.top)
+    temp = "{}.{}.new".format(file, os.getpid())
+    try:
+        os.makedirs(cache_dir(), exist_ok=True)
+        with open(temp, mode="w", encoding="utf-8") as f:
+            json.dump(record, f)
+            f.write("\n")
+        os.replace(temp, file)
+    except OSError as e:
+        print("W: can not save the analysis cache: {}".format(e))
+    return
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    import sys
+
+    top = sys.argv[1] if len(sys.argv) > 1 else "."
+    index = load(top, "test")
+    if index is None:
+        print("I: scan {}".format(top))
+        index = debmake.index.SourceTreeIndex(top, dirs=True)
+        index.isfile("setup.py")
+        save(index, "test")
+    print("I: {} (ext_counter: {})".format(path(top), dict(index.ext_counter)))
@@ -22,18 +22,107 @@ CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
+import hashlib
 import os
+import shutil
+
+import debmake.wrap
+
+#######################################################################
+# Output layer for debian/*
+#
+# The content is normalized (one trailing newline) and written only if
+# its hash differs from the existing file so that unchanged files keep
+# their mtime.  The counts are kept in para["cat"] and reported by
+# summary().  The text rendered by debmake is wrapped and sorted by
+# debmake.wrap before it is compared.
+#
+# Files are not written at once but staged in para["staged"]
+# (path -> bytes) and written together by commit():
+#   * without debian/, all files are written to a temporary directory
+#     which is renamed to debian/ at once
+#   * with debian/, each file is written to a temporary file which
+#     replaces it, the files given as last (e.g., debian/changelog)
+#     after all the others
+# So a killed or failed run never leaves a partial debian/ which makes
+# the next run assume the existing packaging (-x 0).
+#######################################################################
+results = ["written", "unchanged", "skipped"]
+# temporary names in the same directory (for atomic rename)
+staging_dir = ".debian.debmake-new"
+staging_suffix = ".debmake-new"
+
+
+def count(result, para):
+    if "cat" not in para:
+        para["cat"] = {key: 0 for key in results}
+    para["cat"][result] += 1
+    return
+
+
+def digest(data):
+    return hashlib.sha256(data).digest()
+
+
+def content(file, para):
+    # staged or existing content of file (bytes) or None if missing
+    staged = para.get("staged", {})
+    if file in staged:
+        return staged[file]
+    try:
+        with open(file, mode="rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def nonempty(file, para):
+    staged = para.get("staged", {})
+    if file in staged:
+        return len(staged[file]) != 0
+    return os.path.exists(file) and os.stat(file).st_size != 0
+
+
+def unchanged(file, data, para):
+    # True if file has the same content as data (bytes)
+    old = content(file, para)
+    if old is None or len(old) != len(data):
+        return False
+    return digest(old) == digest(data)
+
+
+#######################################################################
+# stage: data (bytes) to be written to file by commit()
+def stage(file, data, para):
+    # file: path relative to para["work_dir"]
+    file = os.path.join(para["work_dir"], file)
+    if unchanged(file, data, para):
+        count("unchanged", para)
+        return
+    para.setdefault("staged", {})[file] = data
+    count("written", para)
+    return
+
+
+#######################################################################
+# chmod: set mode of file after commit()
+def chmod(file, mode, para):
+    # file: path relative to para["work_dir"]
+    para.setdefault("modes", {})[os.path.join(para["work_dir"], file)] = mode
+    return
 
 
 #######################################################################
 # cat >file
 def cat(file, text, para):
+    # file: path relative to para["work_dir"]
+    file = os.path.join(para["work_dir"], file)
     if file[-3:] != ".ex":
         file_noex = file
     else:
         file_noex = file[:-3]
     file_ex = file_noex + ".ex"
-    if os.path.exists(file_noex) and os.stat(file_noex).st_size != 0:
+    if nonempty(file_noex, para):
         if para["backup"]:
             file_write = file_ex
         else:
@@ -42,17 +131,74 @@ def cat(file, text, para):
         file_write = file
     if file_write == "":
         # skip if a file exists and non-zero content
-        print("I: skip writing: {})".format(file))
+        relfile = os.path.relpath(file, para["work_dir"])
+        print("I: skip writing: {})".format(relfile))
+        count("skipped", para)
+        # as written by an earlier run: no need of wrap-and-sort
+        if unchanged(file, render(relfile, text), para):
+            debmake.wrap.rendered(relfile, para)
+        return
+    file_write = os.path.relpath(file_write, para["work_dir"])
+    stage(file_write, render(file_write, text), para)
+    debmake.wrap.rendered(file_write, para)
+    return
+
+
+def render(file, text):
+    # normalized content (bytes) of text for file
+    text = debmake.wrap.wrap(file, text)
+    return (text.rstrip() + "\n").encode("utf-8")
+
+
+#######################################################################
+# commit: write all staged files
+def commit(para, last=()):
+    # last: paths relative to para["work_dir"] written after the others
+    work_dir = para["work_dir"]
+    debian_dir = os.path.join(work_dir, "debian")
+    staged = para.pop("staged", {})
+    modes = para.pop("modes", {})
+    last = [os.path.join(work_dir, file) for file in last]
+    files = sorted(staged.keys(), key=lambda file: file in last)
+    new_dir = os.path.join(work_dir, staging_dir)
+    if os.path.isdir(new_dir):
+        # left by a killed run
+        shutil.rmtree(new_dir)
+    if not os.path.isdir(debian_dir) and all(
+        file.startswith(debian_dir + os.sep) for file in files
+    ):
+        for file in files:
+            write(new_dir + file[len(debian_dir) :], staged[file])
+        os.makedirs(new_dir, exist_ok=True)
+        os.rename(new_dir, debian_dir)
     else:
-        newtext = ""
-        for line in text.split("\n"):
-            newtext += line + "\n"
-        newtext = newtext.rstrip() + "\n"
-        file_dirpath = os.path.dirname(file)
-        if file_dirpath:
-            os.makedirs(file_dirpath, exist_ok=True)
-        with open(file_write, mode="w", encoding="utf-8") as f:
-            print(newtext, file=f, end="")
+        for file in files:
+            write(file + staging_suffix, staged[file], file)
+            os.replace(file + staging_suffix, file)
+    for file, mode in modes.items():
+        if os.path.exists(file):
+            os.chmod(file, mode)
+    return
+
+
+def write(file, data, old=""):
+    # old: existing file whose mode is kept
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+    with open(file, mode="wb") as f:
+        f.write(data)
+    if old and os.path.exists(old):
+        shutil.copymode(old, file)
+    return
+
+
+#######################################################################
+# summary: report the counts of cat()
+def summary(para):
+    counts = para.get("cat", {})
+    print(
+        "I: debian/* files: "
+        + ", ".join("{} {}".format(counts.get(key, 0), key) for key in results)
+    )
     return
 
 
@@ -62,6 +208,7 @@ def cat(file, text, para):
 if __name__ == "__main__":
     para = {}
     para["backup"] = True
+    para["work_dir"] = "."
     file1 = "00_testfile0"
     file2 = "00_testfile0"
     print('{} -> {} with para["backup"] = {}'.format(file1, file2, para["backup"]))
@@ -93,3 +240,5 @@ if __name__ == "__main__":
     print('{} -> {} with para["backup"] = {}'.format(file1, file2, para["backup"]))
     cat(file1, "0fooo\n###barrrr\n####CCCC\nbazzzzz", para)
     cat(file2, "1fooo\n###barrrr\n####CCCC\nbazzzzz", para)
+    commit(para)
+    summary(para)
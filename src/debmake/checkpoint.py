@@ -0,0 +1,282 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import hashlib
+import json
+import os
+import stat
+
+#######################################################################
+# Stage checkpoints
+#
+# After each stage which gets the upstream source to the local base
+# directory, its inputs and outputs are recorded in
+# base_dir/package-version.debmake-checkpoint (JSON).  A re-run skips the
+# stage if both its inputs and its outputs are still the same, e.g., after
+# debian.debian() failed for a missing licensecheck.
+#
+# The debian/ directory is excluded from the fingerprints since it is
+# (re)generated later and may be edited by the user, except from the
+# source directory copied by dir_debmake (with its debian/) to a
+# different package-version directory.
+#
+# The inputs are fingerprinted once per stage by api.call() and passed
+# to skip() and record() (the stages do not change their inputs).  The
+# fingerprints are kept in para["fingerprints"] until a stage runs, so
+# that the output of a stage is reused as the input of the next one.
+# dir_debmake in the package-version directory itself does nothing and
+# has no checkpoint.
+#
+# dir_git is always executed to pull new upstream commits (the remote
+# can not be fingerprinted locally).  tar_wget is keyed on its URL and
+# the existence of the downloaded tarball (a local copy of the URL).
+#######################################################################
+CHECKPOINT_FORMAT = 1
+# stages with checkpoints (the other stages are always executed)
+stages = {
+    "tar_wget",
+    "tar_copy",
+    "dir_debmake",
+    "dir_tar",
+    "tar_orig",
+    "tar_expand",
+}
+# para[...] values used by all stages with checkpoints
+input_keys = [
+    "method",
+    "url",
+    "package",
+    "version",
+    "native",
+    "tarz",
+    "option_z",
+    "tarball",
+    "source_dir",
+    "debmake_dir",
+]
+# never fingerprinted
+exclude_dirs = {".git", ".hg", ".svn", ".bzr", "CVS", ".pc"}
+
+
+#######################################################################
+# fingerprint: cheap fingerprint of a file or a directory tree
+#######################################################################
+def fingerprint(path, exclude="debian"):
+    """
+    Return the hexdigest of the relative path, type, size and mtime of
+    all files under path (only stat() is used, contents are not read).
+    The top level exclude directory and VCS directories are skipped.
+    Return "" if path is missing.
+    """
+    h = hashlib.sha256()
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return ""
+    if not stat.S_ISDIR(st.st_mode):
+        h.update("{} {} {}".format(st.st_mode, st.st_size, st.st_mtime_ns).encode())
+        return h.hexdigest()
+    stack = [""]
+    while stack:
+        reldir = stack.pop()
+        with os.scandir(os.path.join(path, reldir)) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            relpath = os.path.join(reldir, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in exclude_dirs or relpath == exclude:
+                    continue
+                stack.append(relpath)
+                h.update("d {}\0".format(relpath).encode())
+            elif entry.is_symlink():
+                h.update("l {} {}\0".format(relpath, os.readlink(entry.path)).encode())
+            else:
+                st = entry.stat(follow_symlinks=False)
+                h.update(
+                    "f {} {} {} {}\0".format(
+                        relpath, st.st_mode, st.st_size, st.st_mtime_ns
+                    ).encode()
+                )
+    return h.hexdigest()
+
+
+def cached_fingerprint(para, path, exclude="debian"):
+    """fingerprint() kept in para["fingerprints"] until forget()"""
+    fingerprints = para.setdefault("fingerprints", {})
+    key = (path, exclude)
+    if key not in fingerprints:
+        fingerprints[key] = fingerprint(path, exclude)
+    return fingerprints[key]
+
+
+def forget(para):
+    """forget the fingerprints after a stage which may change files"""
+    para["fingerprints"] = {}
+    return
+
+
+#######################################################################
+# checkpointed: True if the stage has a checkpoint
+#######################################################################
+def in_place(para):
+    # dir_debmake: source_dir is already the package-version directory
+    base_dir = para["base_dir"]
+    return os.path.normpath(os.path.join(base_dir, para["source_dir"])) == (
+        os.path.normpath(os.path.join(base_dir, para["debmake_dir"]))
+    )
+
+
+def checkpointed(name, para):
+    if name == "dir_debmake":
+        return not in_place(para)
+    return name in stages
+
+
+#######################################################################
+# inputs and outputs of each stage
+#######################################################################
+def inputs(name, para):
+    base_dir = para["base_dir"]
+    values = {key: para.get(key, "") for key in input_keys}
+    if name == "tar_copy":
+        values["source"] = cached_fingerprint(para, os.path.join(base_dir, para["url"]))
+    elif name == "dir_debmake":
+        # debian/ is copied, too
+        values["source"] = cached_fingerprint(
+            para, os.path.join(base_dir, para["source_dir"]), exclude=None
+        )
+    elif name == "dir_tar":
+        values["source"] = cached_fingerprint(
+            para, os.path.join(base_dir, para["debmake_dir"])
+        )
+    elif name in ("tar_orig", "tar_expand"):
+        values["source"] = cached_fingerprint(
+            para, os.path.join(base_dir, para["tarball"])
+        )
+    return values
+
+
+def outputs(name, para):
+    base_dir = para["base_dir"]
+    if name == "tar_wget":
+        # not fingerprinted (any local copy of the URL is used)
+        path = para["tarball"]
+        return {path: os.path.isfile(os.path.join(base_dir, path))}
+    elif name in ("tar_copy", "dir_tar"):
+        path = para["tarball"]
+    elif name == "tar_orig":
+        path = para["package"] + "_" + para["version"] + ".orig." + para["tarz"]
+    else:  # dir_debmake, tar_expand
+        path = para["debmake_dir"]
+    return {path: cached_fingerprint(para, os.path.join(base_dir, path))}
+
+
+#######################################################################
+# load and save the checkpoint file
+#######################################################################
+def path(para):
+    return os.path.join(para["base_dir"], para["debmake_dir"] + ".debmake-checkpoint")
+
+
+def load(para):
+    try:
+        with open(path(para), mode="r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(checkpoint, dict)
+        or checkpoint.get("format") != CHECKPOINT_FORMAT
+    ):
+        return {}
+    return checkpoint.get("stages", {})
+
+
+def save(para, records):
+    checkpoint = {
+        "format": CHECKPOINT_FORMAT,
+        "program_version": para["program_version"],
+        "stages": records,
+    }
+    temp = path(para) + ".new"
+    with open(temp, mode="w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(temp, path(para))
+    return
+
+
+#######################################################################
+# done: True if the stage can be skipped
+#######################################################################
+def done(name, para, values=None):
+    # values: inputs(name, para) if already computed
+    if not checkpointed(name, para) or para.get("restart", False):
+        return False
+    record = load(para).get(name)
+    if not record:
+        return False
+    if values is None:
+        values = inputs(name, para)
+    if record.get("inputs") != values:
+        return False
+    return record.get("outputs") == outputs(name, para)
+
+
+#######################################################################
+# skip: done() with a log message
+#######################################################################
+def skip(name, para, values=None):
+    if done(name, para, values):
+        print(
+            'I: skip {}: unchanged since "{}"'.format(
+                name, os.path.basename(path(para))
+            )
+        )
+        return True
+    return False
+
+
+#######################################################################
+# record: record a completed stage
+#######################################################################
+def record(name, para, values=None):
+    if not checkpointed(name, para):
+        return
+    if values is None:
+        values = inputs(name, para)
+    records = load(para)
+    records[name] = {"inputs": values, "outputs": outputs(name, para)}
+    save(para, records)
+    return
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    import sys
+
+    for arg in sys.argv[1:]:
+        print("{}  {}".format(fingerprint(arg), arg))
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import json
+import os
+import socket
+import sys
+
+#######################################################################
+# Thin client of "debmake --serve SOCKET"
+#
+# request: one JSON line {"argv": [...], "cwd": "...", "env": {...}} sent
+#          with stdin, stdout and stderr attached as SCM_RIGHTS so that
+#          the server writes the I:/W:/E: log (and the output of the
+#          invoked commands) directly to them and reads [Y/n] answers.
+# reply:   one JSON line {"status": N, "package": "...", ...}
+#######################################################################
+MAX_REQUEST = 1024 * 1024  # maximum size of the JSON request line
+
+
+#######################################################################
+# socket_path: pick --connect SOCKET (or DEBMAKE_SOCKET) from argv
+#######################################################################
+def socket_path(argv):
+    """
+    Return (socket path, explicit, argv without --connect SOCKET).
+    The socket path is "" if this command line runs locally.
+    """
+    path = ""
+    explicit = False
+    rest = []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--connect" and i + 1 < len(argv):
+            path = argv[i + 1]
+            explicit = True
+            i += 2
+            continue
+        elif arg.startswith("--connect="):
+            path = arg[len("--connect=") :]
+            explicit = True
+        else:
+            rest.append(arg)
+        i += 1
+    if not explicit and "--serve" not in rest:
+        path = os.environ.get("DEBMAKE_SOCKET", "")
+    return (path, explicit, rest)
+
+
+#######################################################################
+# connect: forward argv to the server and return its exit status
+#######################################################################
+def connect(path, argv):
+    request = {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+    data = json.dumps(request).encode("utf-8") + b"\n"
+    if len(data) > MAX_REQUEST:
+        raise OSError("request too large ({} bytes)".format(len(data)))
+    sys.stdout.flush()
+    sys.stderr.flush()
+    reply = b""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        socket.send_fds(sock, [data], [0, 1, 2])
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            reply += chunk
+    if not reply:
+        print(
+            'E: debmake server on "{}" closed the connection'.format(path),
+            file=sys.stderr,
+        )
+        return 1
+    return json.loads(reply)["status"]
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    print(socket_path(["-y", "--connect", "/tmp/debmake.sock", "foo-1.0"]))
+    print(socket_path(["--connect=/tmp/debmake.sock", "-n"]))
+    print(socket_path(["--serve", "/tmp/debmake.sock"]))
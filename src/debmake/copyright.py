@@ -0,0 +1,606 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import collections
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+
+import debmake.cache
+import debmake.index
+import debmake.scanext
+
+#######################################################################
+# Builtin license and copyright scanner
+#
+# Same DEP-5 (machine-readable debian/copyright) output as
+#   licensecheck --recursive --copyright --deb-machine .
+# but only the header region (first HEAD_SIZE bytes) of each file is
+# read and the files listed by the index of the source tree built by
+# debmake.analyze (SourceTreeIndex.files()) are scanned by a pool of
+# worker processes.  Files classified as binary, archive or
+# media by their extension (debmake.scanext.ext_to_type) and files with
+# NUL bytes in their header are skipped.
+#
+# The findings of each file are cached by the sha256 of its header
+# region in the SQLite database $XDG_CACHE_HOME/debmake/license.sqlite3
+# shared by all debmake runs, so a file seen before in any source tree
+# (vendored zlib, sqlite3.c, jquery, gnulib modules, ...) is not matched
+# again.  The database is in WAL mode with a busy timeout to be written
+# by concurrent debmake runs (e.g. --batch).  When its findings exceed
+# CACHE_MAX_BYTES, the least recently used ones are evicted.
+#######################################################################
+HEAD_SIZE = 8192
+# scan in this process for fewer files (process startup is not free)
+PARALLEL_MIN = 256
+# files per task sent to a worker process
+CHUNK_SIZE = 64
+# size of the findings kept in the cache (least recently used evicted)
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+# PRAGMA user_version: bump when scan_head() finds differently
+CACHE_FORMAT = 1
+# seconds to wait for the lock of the other writers
+CACHE_TIMEOUT = 30
+skipped_ext_type = ["binary", "archive", "media"]
+
+# comment characters (/* */ // # ; % -- <!-- --> ...) replaced by spaces
+# so that license texts spanning comment lines are matched as phrases
+comment_table = str.maketrans("#*;%!<>", "       ")
+re_trailer = re.compile(r"\s*(?:\*+/|-->|\*\))\s*$")
+re_copyright = re.compile(
+    r"(?:\bcopyright\b[ \t]*(?:\(c\)|©)?|©|\(c\)(?=[ \t]*\d{4}))[ \t]*:?[ \t]*(?P<text>.*)$",
+    re.IGNORECASE,
+)
+re_year = re.compile(r"\b(?:19|20)\d\d\b")
+re_rights = re.compile(r"[,.;\s]*all rights reserved.*$", re.IGNORECASE)
+re_spdx = re.compile(
+    r"SPDX-License-Identifier:[ \t]*(?P<expr>[^*\n]*?)[ \t]*(?:\*/|-->)?[ \t]*$",
+    re.MULTILINE,
+)
+# "<year> <name of author>" of license templates
+re_placeholder = re.compile(r"<[^>@]*>")
+
+# SPDX identifier -> DEP-5 short name
+spdx_to_dep5 = {
+    "MIT": "Expat",
+    "BSD-2-Clause": "BSD-2-clause",
+    "BSD-3-Clause": "BSD-3-clause",
+    "BSD-4-Clause": "BSD-4-clause",
+    "Unlicense": "Unlicense",
+    "CC0-1.0": "CC0-1.0",
+}
+re_spdx_gpl = re.compile(
+    r"^(?P<family>GPL|LGPL|AGPL)-(?P<version>\d(?:\.\d)?)(?P<suffix>-or-later|\+|-only)?$"
+)
+# (regex on lowercased header text without comments, DEP-5 name)
+license_texts = [
+    (
+        re.compile(
+            r"permission is hereby granted, free of charge, to any person obtaining a copy"
+        ),
+        "Expat",
+    ),
+    (
+        re.compile(r"licensed under the apache license|apache license,? version 2\.0"),
+        "Apache-2.0",
+    ),
+    (
+        re.compile(r"mozilla public license,? v(?:ersion|\.) ?2\.0"),
+        "MPL-2.0",
+    ),
+    (
+        re.compile(
+            r"permission to use, copy, modify, and(?:/or)? distribute this software for any purpose with or without fee"
+        ),
+        "ISC",
+    ),
+    (
+        re.compile(r"altered source versions must be plainly marked"),
+        "Zlib",
+    ),
+    (re.compile(r"boost software license"), "BSL-1.0"),
+    (
+        re.compile(
+            r"this is free and unencumbered software released into the public domain"
+        ),
+        "Unlicense",
+    ),
+    (re.compile(r"\bcc0\b"), "CC0-1.0"),
+    (re.compile(r"same terms as perl itself"), "Artistic or GPL-1+"),
+]
+re_gnu = re.compile(
+    r"gnu (?P<family>affero |lesser |library )?general public license(?P<tail>.{0,300})"
+)
+re_gnu_version = re.compile(r"version (?P<version>\d(?:\.\d)?)")
+re_bsd = re.compile(r"redistribution and use in source and binary forms")
+re_public_domain = re.compile(
+    r"\b(?:is|are|placed|released) (?:in|into) the public domain"
+)
+
+
+###################################################################
+# Match one header region
+###################################################################
+def copyrights(text):
+    # return the list of copyright statements ("YEARS Holder")
+    found = []
+    lower = text.lower()
+    if "copyright" not in lower and "©" not in text and "(c)" not in lower:
+        return found
+    for line in text.splitlines():
+        lower = line.lower()
+        if "copyright" not in lower and "©" not in line and "(c)" not in lower:
+            continue
+        match = re_copyright.search(line)
+        if not match:
+            continue
+        holder = re_rights.sub("", match.group("text"))
+        holder = " ".join(holder.replace("(C)", "").replace("(c)", "").split())
+        holder = re_trailer.sub("", holder).strip(" ,.;:")
+        # skip "Copyright notice", "Copyright (C) <year> <name of author>"
+        if (
+            not holder
+            or not re_year.search(holder)
+            or re_placeholder.search(holder)
+            or "$" in holder
+        ):
+            continue
+        if holder not in found:
+            found.append(holder)
+    return found
+
+
+def spdx_license(expr):
+    # "GPL-2.0-or-later OR MIT" -> "GPL-2+ or Expat"
+    names = []
+    for word in expr.replace("(", " ").replace(")", " ").split():
+        if word in ("OR", "AND", "WITH"):
+            names.append(word.lower())
+            continue
+        match = re_spdx_gpl.match(word)
+        if match:
+            version = match.group("version")
+            if version.endswith(".0"):
+                version = version[:-2]
+            later = "+" if match.group("suffix") in ("-or-later", "+") else ""
+            names.append("{}-{}{}".format(match.group("family"), version, later))
+        else:
+            names.append(spdx_to_dep5.get(word, word))
+    return " ".join(names)
+
+
+def text_license(text):
+    # text: lowercased header with comments and newlines made spaces
+    names = []
+    match = re_gnu.search(text)
+    if match:
+        family = {
+            None: "GPL",
+            "affero ": "AGPL",
+            "lesser ": "LGPL",
+            "library ": "LGPL",
+        }[match.group("family")]
+        tail = match.group("tail")
+        version_match = re_gnu_version.search(tail)
+        if version_match:
+            version = version_match.group("version")
+            if version.endswith(".0"):
+                version = version[:-2]
+            family += "-" + version
+            if "any later version" in tail:
+                family += "+"
+        names.append(family)
+    if re_bsd.search(text):
+        if "advertising materials" in text:
+            names.append("BSD-4-clause")
+        elif "neither the name" in text or "endorse or promote" in text:
+            names.append("BSD-3-clause")
+        else:
+            names.append("BSD-2-clause")
+    for regex, name in license_texts:
+        if regex.search(text) and name not in names:
+            names.append(name)
+    if not names and "public domain" in text and re_public_domain.search(text):
+        names.append("public-domain")
+    if not names:
+        return "UNKNOWN"
+    return " and/or ".join(names)
+
+
+def scan_head(head):
+    # return [license, [copyright, ...]] of a header region (bytes)
+    text = head.decode("utf-8", "replace")
+    match = re_spdx.search(text)
+    if match and match.group("expr").strip():
+        license = spdx_license(match.group("expr"))
+    else:
+        plain = text.translate(comment_table).replace("//", " ").replace("--", " ")
+        license = text_license(" ".join(plain.lower().split()))
+    return [license, copyrights(text)]
+
+
+###################################################################
+# Scan files
+###################################################################
+# cache database connection of a pool worker process (set by init_worker)
+db = None
+
+
+def init_worker(path):
+    # open the cache database in each worker process (connections are
+    # not shared across fork)
+    global db
+    db = open_cache(path) if path else None
+
+
+def scan_file(path, conn):
+    # conn: cache database connection or None
+    # return (digest, [license, [copyright, ...]], new) or None if skipped
+    try:
+        with open(path, mode="rb") as f:
+            head = f.read(HEAD_SIZE)
+    except OSError:
+        return None
+    if b"\0" in head:
+        return None
+    digest = hashlib.sha256(head).hexdigest()
+    finding = lookup(conn, digest)
+    if finding is not None:
+        return (digest, finding, False)
+    return (digest, scan_head(head), True)
+
+
+def scan_files(top, relpaths, conn=None):
+    return [scan_file(os.path.join(top, relpath), conn) for relpath in relpaths]
+
+
+def scan_files_worker(top, relpaths):
+    # in a pool worker process
+    return scan_files(top, relpaths, db)
+
+
+def scannable(relpath):
+    match = debmake.index.re_ext.search(os.path.basename(relpath))
+    if not match:
+        return True
+    ext_type = debmake.scanext.ext_to_type.get(match.group("ext"), "")
+    return ext_type not in skipped_ext_type
+
+
+###################################################################
+# Cache of findings keyed by the hash of the header region
+###################################################################
+def cache_path():
+    return os.path.join(debmake.cache.cache_dir(), "license.sqlite3")
+
+
+def create_cache(conn):
+    conn.execute("DROP TABLE IF EXISTS findings")
+    conn.execute(
+        "CREATE TABLE findings (digest TEXT PRIMARY KEY, finding TEXT NOT NULL, "
+        "size INTEGER NOT NULL, atime INTEGER NOT NULL)"
+    )
+    conn.execute("CREATE INDEX findings_atime ON findings (atime)")
+    conn.execute("PRAGMA user_version = {}".format(CACHE_FORMAT))
+    return
+
+
+def open_cache(path):
+    # return sqlite3 connection or None if the cache can not be used
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=CACHE_TIMEOUT, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = {}".format(CACHE_TIMEOUT * 1000))
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_FORMAT:
+            conn.execute("BEGIN IMMEDIATE")
+            # another writer may have created it meanwhile
+            if conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_FORMAT:
+                create_cache(conn)
+            conn.execute("COMMIT")
+    except (OSError, sqlite3.Error) as e:
+        print("W: license cache not used: {}".format(e))
+        return None
+    return conn
+
+
+def lookup(conn, digest):
+    # return [license, [copyright, ...]] or None if not cached
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT finding FROM findings WHERE digest = ?", (digest,)
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    return json.loads(row[0])
+
+
+def store(conn, new, used):
+    # new: {digest: finding} to add, used: [digest] of hits
+    now = int(time.time())
+    rows = []
+    for digest, finding in new.items():
+        text = json.dumps(finding)
+        rows.append((digest, text, len(digest) + len(text), now))
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany("INSERT OR REPLACE INTO findings VALUES (?, ?, ?, ?)", rows)
+        conn.executemany(
+            "UPDATE findings SET atime = ? WHERE digest = ?",
+            [(now, digest) for digest in used],
+        )
+        evict(conn, CACHE_MAX_BYTES)
+        conn.execute("COMMIT")
+    except sqlite3.Error as e:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        print("W: license cache not updated: {}".format(e))
+    return
+
+
+def evict(conn, max_bytes):
+    # delete the least recently used findings down to 3/4 of max_bytes
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM findings").fetchone()[0]
+    if total <= max_bytes:
+        return
+    excess = total - max_bytes * 3 // 4
+    evicted = []
+    for digest, size in conn.execute(
+        "SELECT digest, size FROM findings ORDER BY atime"
+    ):
+        evicted.append((digest,))
+        excess -= size
+        if excess <= 0:
+            break
+    conn.executemany("DELETE FROM findings WHERE digest = ?", evicted)
+    return
+
+
+###################################################################
+# Scan the source tree
+###################################################################
+def scan(index, jobs=1, use_cache=True):
+    # index: debmake.index.SourceTreeIndex or debmake.cache.CachedIndex
+    # return {relpath: (license, (copyright, ...))} of scanned files
+    top = index.top
+    relpaths = sorted(relpath for relpath in index.files() if scannable(relpath))
+    path = cache_path() if use_cache else ""
+    # the connection of this scan() (debmake.run() may be called from
+    # many threads at once)
+    conn = None
+    try:
+        if jobs <= 1 or len(relpaths) < PARALLEL_MIN:
+            print("I: scan {} files for license and copyright".format(len(relpaths)))
+            conn = open_cache(path) if path else None
+            results = scan_files(top, relpaths, conn)
+        else:
+            print(
+                "I: scan {} files for license and copyright with {} processes".format(
+                    len(relpaths), jobs
+                )
+            )
+            chunks = [
+                relpaths[i : i + CHUNK_SIZE]
+                for i in range(0, len(relpaths), CHUNK_SIZE)
+            ]
+            results = []
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=jobs, initializer=init_worker, initargs=(path,)
+            ) as executor:
+                for chunk_results in executor.map(
+                    scan_files_worker, [top] * len(chunks), chunks
+                ):
+                    results.extend(chunk_results)
+            # opened after the fork of the workers
+            conn = open_cache(path) if path else None
+        files = {}
+        new = {}
+        used = []
+        for relpath, result in zip(relpaths, results):
+            if result is None:
+                continue
+            digest, finding, scanned = result
+            if scanned:
+                new[digest] = finding
+            else:
+                used.append(digest)
+            files[relpath] = (finding[0], tuple(finding[1]))
+        if conn is not None:
+            print(
+                "I: {} of {} files found in the license cache".format(
+                    len(used), len(files)
+                )
+            )
+            store(conn, new, used)
+    finally:
+        if conn is not None:
+            conn.close()
+    return files
+
+
+###################################################################
+# DEP-5 output
+###################################################################
+def field(name, values):
+    # multi-line field: first value on the field line, rest indented
+    return "{}: {}\n".format(name, "\n ".join(values))
+
+
+#######################################################################
+# Stanza grouping
+#
+# A DEP-5 "Files: dir/*" matches all files under dir and the last
+# matching stanza wins.  The (license, copyrights) of the files are put
+# in a directory trie and each directory either inherits the key of its
+# parent or gets its own "dir/*" glob, whichever needs fewer patterns
+# for its whole subtree (files which differ from their directory are
+# listed as exceptions).  Then the patterns scale with the number of
+# distinct licensing regions instead of the number of files.
+#
+# Stanzas are written as "Files: *", the globs grouped by (depth, key)
+# from the top, then the exceptions grouped by key, so that a more
+# specific pattern always follows the less specific ones.
+#######################################################################
+def trie(files):
+    # files: {relpath: key} -> nested {"dirs": {name: node}, "files": {name: key}}
+    root = {"dirs": {}, "files": {}}
+    for relpath, key in files.items():
+        node = root
+        names = relpath.split("/")
+        for name in names[:-1]:
+            node = node["dirs"].setdefault(name, {"dirs": {}, "files": {}})
+        node["files"][names[-1]] = key
+    return root
+
+
+def plan(node):
+    # set for the subtree of node (patterns below node, not node itself):
+    #   node["costs"]:  {key: patterns if key is inherited} for its keys
+    #   node["absent"]: patterns if a key not in the subtree is inherited
+    #   node["glob"]:   (key, patterns) of the best "node/*" glob
+    counts = collections.Counter(node["files"].values())
+    n_files = len(node["files"])
+    base = 0
+    delta = collections.Counter()
+    for child in node["dirs"].values():
+        plan(child)
+        glob_cost = 1 + child["glob"][1]
+        default = min(child["absent"], glob_cost)
+        base += default
+        for key, cost in child["costs"].items():
+            delta[key] += min(cost, glob_cost) - default
+    node["absent"] = n_files + base
+    node["costs"] = {
+        key: n_files - counts[key] + base + delta[key]
+        for key in set(counts) | set(delta)
+    }
+    if node["costs"]:
+        # ties: the key of most files directly in the directory
+        node["glob"] = min(
+            node["costs"].items(),
+            key=lambda item: (item[1], -counts[item[0]], item[0]),
+        )
+    else:
+        node["glob"] = (None, node["absent"])
+    return
+
+
+def assign(node, prefix, key, depth, globs, exceptions):
+    # collect "dir/*" globs by (depth, key) and exceptions by key
+    for name, file_key in node["files"].items():
+        if file_key != key:
+            exceptions[file_key].append(prefix + name)
+    for name, child in node["dirs"].items():
+        glob_key, glob_cost = child["glob"]
+        if 1 + glob_cost < child["costs"].get(key, child["absent"]):
+            globs[(depth, glob_key)].append(prefix + name + "/*")
+            assign(child, prefix + name + "/", glob_key, depth + 1, globs, exceptions)
+        else:
+            assign(child, prefix + name + "/", key, depth + 1, globs, exceptions)
+    return
+
+
+def group(files):
+    # files: {relpath: key} -> [(key, [pattern, ...]), ...] in DEP-5 order
+    root = trie(files)
+    plan(root)
+    key = root["glob"][0] or ("UNKNOWN", ())
+    globs = collections.defaultdict(list)
+    exceptions = collections.defaultdict(list)
+    assign(root, "", key, 0, globs, exceptions)
+    stanzas = [(key, ["*"])]
+    for (depth, glob_key), patterns in sorted(
+        globs.items(), key=lambda item: (item[0][0], sorted(item[1])[0])
+    ):
+        stanzas.append((glob_key, sorted(patterns)))
+    for file_key, relpaths in sorted(
+        exceptions.items(), key=lambda item: sorted(item[1])[0]
+    ):
+        stanzas.append((file_key, sorted(relpaths)))
+    return stanzas
+
+
+re_license_op = re.compile(r" (?:and/or|and|or) ")
+
+
+def license_names(license):
+    # "GPL-2+ and/or Expat" -> ["GPL-2+", "Expat"]: the short names of a
+    # license expression which need their standalone License: paragraph
+    # (exceptions as "GPL-2+ with Autoconf-exception-2.0" are kept)
+    return re_license_op.split(license)
+
+
+def dep5(files, name="FIXME", source="FIXME"):
+    # files: {relpath: (license, (copyright, ...))}
+    text = (
+        "Format: https://www.debian.org/doc/packaging-manuals/copyright-format/1.0/\n"
+    )
+    text += "Upstream-Name: {}\n".format(name)
+    text += "Upstream-Contact: FIXME\n"
+    text += "Source: {}\n".format(source)
+    text += "Disclaimer: Autogenerated by debmake\n"
+    licenses = []
+    for (license, holders), patterns in group(files):
+        text += "\n"
+        text += field("Files", patterns)
+        text += field("Copyright", holders or ["NONE"])
+        text += "License: {}\n".format(license)
+        for short_name in license_names(license):
+            if short_name not in licenses:
+                licenses.append(short_name)
+    for license in licenses:
+        text += "\nLicense: {}\n FIXME\n".format(license)
+    return text
+
+
+def copyright(para):
+    # return the DEP-5 debian/copyright text for the source tree
+    source = para["homepage"]
+    if source.startswith("<"):
+        source = "FIXME"
+    files = scan(para["index"], para["jobs"], para["cache"])
+    return dep5(files, para["package"], source)
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    import sys
+
+    top = sys.argv[1] if len(sys.argv) > 1 else "."
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    start = time.perf_counter()
+    files = scan(debmake.index.SourceTreeIndex(top, files=True), jobs, use_cache=False)
+    print(dep5(files))
+    print("{} files in {:.3f}s".format(len(files), time.perf_counter() - start))
@@ -29,9 +29,40 @@ import shutil
 
 import debmake.cat
 import debmake.control
+import debmake.copyright
 import debmake.read
 import debmake.sed
 import debmake.sh
+import debmake.wrap
+
+
+#######################################################################
+def copyright(para, file):
+    # stage DEP-5 file made by builtin scanner or return the background
+    # job of licensecheck (--licensecheck) for finish()
+    if para["licensecheck"]:
+        command = "licensecheck --recursive --copyright --deb-machine "
+        if para["verbose"]:
+            command += "--verbose "
+        command += " ."
+        return (file, debmake.sh.sh_start(command, para["work_dir"]))
+    text = debmake.wrap.wrap(file, debmake.copyright.copyright(para))
+    debmake.cat.stage(file, text.encode("utf-8"), para)
+    debmake.wrap.rendered(file, para)
+    print("I: creating {} by the builtin license scanner.".format(file))
+    return None
+
+
+def finish(para, job):
+    # wait for the background job of licensecheck or lrc
+    file, sh_job = job
+    if file:
+        debmake.cat.stage(file, debmake.sh.sh_wait(sh_job), para)
+        print("I: creating {} by licensecheck.".format(file))
+    else:
+        debmake.sh.sh_wait(sh_job, echo=True)
+        print("I: verifying debian/copyright by lrc (licenserecon package).")
+    return
 
 
 #######################################################################
@@ -41,6 +72,8 @@ def debian(para):
     # bin_type="bin" list for executable deb["type"]
     ###################################################################
     exec_deb_type_list = {"bin", "perl", "python3", "ruby", "script"}
+    # debian/* are generated in para["work_dir"]
+    work_dir = para["work_dir"]
     ###################################################################
     # set output detail level: para["extra"]
     ###################################################################
@@ -48,7 +81,7 @@ def debian(para):
     if para["extra"] == "":  # -x, --extra default
         para["extra"] = "2"
         for conf in conf_required:
-            if os.path.isfile("debian/" + conf):
+            if os.path.isfile(os.path.join(work_dir, "debian", conf)):
                 print('I: found "debian/' + conf + '"')
                 para["extra"] = "0"
     try:
@@ -64,6 +97,7 @@ def debian(para):
     substlist = {
         "@PACKAGE@": para["package"],
         "@UCPACKAGE@": para["package"].upper(),
+        "@UPACKAGE@": para["package"].upper(),  # manpage.asciidoc
         "@YEAR@": para["year"],
         "@FULLNAME@": para["fullname"],
         "@EMAIL@": para["email"],
@@ -156,195 +190,204 @@ def debian(para):
     #  debian/rules
     #  debian/source/format
     ###################################################################
-    # ensure debian/ directory to exist
-    os.makedirs("debian", exist_ok=True)
-    # debian/copyright (generate or verify)
-    if not os.path.exists("debian/copyright"):
+    # all debian/* files are staged and written by debmake.cat.commit()
+    # debian/copyright (generate or verify): licensecheck and lrc run in
+    # the background while the other debian/* files are generated
+    if not os.path.exists(os.path.join(work_dir, "debian/copyright")):
         # generate debian/copyright
-        command = "licensecheck --recursive --copyright --deb-machine "
-        if para["verbose"]:
-            command = "--verbose "
-        command += " . > " + "debian/copyright"
-        debmake.sh.sh(command)
-        print("I: creating debian/copyright by licensecheck.")
+        job = copyright(para, "debian/copyright")
     elif shutil.which("lrc"):
         # verify existing debian/copyright
-        command = "lrc"
-        debmake.sh.sh(command)
-        print("I: verifying debian/copyright by lrc (licenserecon package).")
+        job = (None, debmake.sh.sh_start("lrc", work_dir))
     else:
-        command = "licensecheck --recursive --copyright --deb-machine "
-        if para["verbose"]:
-            command = "--verbose "
-        command += " . > " + "debian/copyright.ex"
-        debmake.sh.sh(command)
-        print("I: creating debian/copyright.ex by licensecheck.")
-    # debian/control
-    print(
-        "I: creating {} from control.py".format("debian/control"),
-    )
-    debmake.cat.cat("debian/control", debmake.control.control(para), para)
-    # debian/changelog, debian/rules
-    debmake.sed.sed("extra0_*", "debian/", substlist, "", para)
-    os.chmod("debian/rules", 0o755)
-    # debian/source/format
-    debmake.sed.sed(
-        "extra0source_*",
-        "debian/source/",
-        substlist,
-        "",
-        para,
-    )
-    ###################################################################
-    # generate desirable configuration files, if missing (extra=1-4).
-    # some templates are produced only for the first binary package.
-    ###################################################################
-    if extra >= 1:
-        # debian/clean
-        # debian/dirs
-        # debian/docs
-        # debian/examples
-        # debian/gbp.conf
-        # debian/links
-        # debian/manpages
-        # debian/README.Debian
-        # debian/README.source
-        # debian/salsa-ci.yml
+        job = copyright(para, "debian/copyright.ex")
+    try:
+        # debian/control
+        print(
+            "I: creating {} from control.py".format("debian/control"),
+        )
+        debmake.cat.cat("debian/control", debmake.control.control(para), para)
+        # debian/changelog, debian/rules
+        debmake.sed.sed("extra0_*", "debian/", substlist, "", para)
+        debmake.cat.chmod("debian/rules", 0o755, para)
+        # debian/source/format
         debmake.sed.sed(
-            "extra1_*",
-            "debian/",
+            "extra0source_*",
+            "debian/source/",
             substlist,
             "",
             para,
         )
-        if not para["native"]:
-            # debian/watch
+        ###################################################################
+        # generate desirable configuration files, if missing (extra=1-4).
+        # some templates are produced only for the first binary package.
+        ###################################################################
+        if extra >= 1:
+            # debian/clean
+            # debian/dirs
+            # debian/docs
+            # debian/examples
+            # debian/gbp.conf
+            # debian/links
+            # debian/manpages
+            # debian/README.Debian
+            # debian/README.source
+            # debian/salsa-ci.yml
             debmake.sed.sed(
-                "extra1nn_*",
+                "extra1_*",
                 "debian/",
                 substlist,
                 "",
                 para,
             )
-        # tests/control
-        debmake.sed.sed(
-            "extra1tests_*",
-            "debian/tests/",
-            substlist,
-            "",
-            para,
-        )
-        # upstream/metadata
-        debmake.sed.sed(
-            "extra1upstream_*",
-            "debian/upstream/",
-            substlist,
-            "",
-            para,
-        )
-        if not para["native"]:
-            # patches/series
+            if not para["native"]:
+                # debian/watch
+                debmake.sed.sed(
+                    "extra1nn_*",
+                    "debian/",
+                    substlist,
+                    "",
+                    para,
+                )
+            # tests/control
             debmake.sed.sed(
-                "extra1patches_*",
-                "debian/patches/",
+                "extra1tests_*",
+                "debian/tests/",
                 substlist,
                 "",
                 para,
             )
-    ###################################################################
-    # generate basic .ex configuration files, if missing (extra=2-4).
-    ###################################################################
-    if extra >= 2:
-        # bug-control.ex
-        # bug-presubj.ex
-        # bug-script.ex
-        # maintscript.ex
-        # manpage.1.ex
-        # doc-base.ex
-        # info.ex
-        # lintian-overrides.ex
-        debmake.sed.sed(
-            "extra2_*",
-            "debian/",
-            substlist,
-            "",
-            para,
-        )
-        debmake.sed.sed("extra2source_*", "debian/source/", substlist, "", para)
-        if not para["native"]:
-            # source/options.ex
-            # source/patch-header.ex
-            # source/lintian-overrides.ex
+            # upstream/metadata
             debmake.sed.sed(
-                "extra2source.nn_*",
-                "debian/source/",
+                "extra1upstream_*",
+                "debian/upstream/",
                 substlist,
                 "",
                 para,
             )
-    ###################################################################
-    # generate typical optional .ex configuration files, if missing (extra=3, 4).
-    ###################################################################
-    # create templates only for the first binary package
-    if extra >= 3:
-        debmake.sed.sed("extra3_*", "debian/", substlist, "", para)
-    ###################################################################
-    # generate all optional .ex configuration files, if missing (extra=4).
-    ###################################################################
-    # create templates only for the first binary package
-    if extra >= 4:
-        debmake.sed.sed(
-            "extra4_*",
-            "debian/",
-            substlist,
-            "",
-            para,
-        )
-        debmake.sed.sed("extra2source_*", "debian/source/", substlist, "", para)
-        if not para["native"]:
-            # source/local-options.ex
-            # source/local-patch-header.ex
+            if not para["native"]:
+                # patches/series
+                debmake.sed.sed(
+                    "extra1patches_*",
+                    "debian/patches/",
+                    substlist,
+                    "",
+                    para,
+                )
+        ###################################################################
+        # generate basic .ex configuration files, if missing (extra=2-4).
+        ###################################################################
+        if extra >= 2:
+            # bug-control.ex
+            # bug-presubj.ex
+            # bug-script.ex
+            # maintscript.ex
+            # manpage.1.ex
+            # doc-base.ex
+            # info.ex
+            # lintian-overrides.ex
             debmake.sed.sed(
-                "extra2source.nn_*",
-                "debian/source/",
+                "extra2_*",
+                "debian/",
                 substlist,
                 "",
                 para,
             )
-    ###################################################################
-    # generate desirable configuration files, if missing (extra=1-4).
-    #  - loop over binary packages
-    ###################################################################
-    if extra >= 1:
-        # package-install, package.docs for multi-binary debs
-        for deb in para["debs"]:
-            substlist["@BINPACKAGE@"] = deb["binpackage"]
-            if len(para["debs"]) == 1:
-                binpackagedot = ""
-            else:
-                binpackagedot = substlist["@BINPACKAGE@"] + "."
-            deb_type = deb["type"]
-            if deb_type in exec_deb_type_list:
-                deb_type = "bin"
-
-            # deb_type is reduced to {bin, data, dev, doc, lib}
+            debmake.sed.sed("extra2source_*", "debian/source/", substlist, "", para)
+            if not para["native"]:
+                # source/options.ex
+                # source/patch-header.ex
+                # source/lintian-overrides.ex
+                debmake.sed.sed(
+                    "extra2source.nn_*",
+                    "debian/source/",
+                    substlist,
+                    "",
+                    para,
+                )
+        ###################################################################
+        # generate typical optional .ex configuration files, if missing (extra=3, 4).
+        ###################################################################
+        # create templates only for the first binary package
+        if extra >= 3:
+            debmake.sed.sed("extra3_*", "debian/", substlist, "", para)
+        ###################################################################
+        # generate all optional .ex configuration files, if missing (extra=4).
+        ###################################################################
+        # create templates only for the first binary package
+        if extra >= 4:
             debmake.sed.sed(
-                "extra1" + deb_type + "_*",
+                "extra4_*",
                 "debian/",
                 substlist,
-                binpackagedot,
+                "",
                 para,
             )
+            debmake.sed.sed("extra2source_*", "debian/source/", substlist, "", para)
+            if not para["native"]:
+                # source/local-options.ex
+                # source/local-patch-header.ex
+                debmake.sed.sed(
+                    "extra2source.nn_*",
+                    "debian/source/",
+                    substlist,
+                    "",
+                    para,
+                )
+        ###################################################################
+        # generate desirable configuration files, if missing (extra=1-4).
+        #  - loop over binary packages
+        ###################################################################
+        if extra >= 1:
+            # package-install, package.docs for multi-binary debs
+            for deb in para["debs"]:
+                substlist["@BINPACKAGE@"] = deb["binpackage"]
+                if len(para["debs"]) == 1:
+                    binpackagedot = ""
+                else:
+                    binpackagedot = substlist["@BINPACKAGE@"] + "."
+                deb_type = deb["type"]
+                if deb_type in exec_deb_type_list:
+                    deb_type = "bin"
+
+                # deb_type is reduced to {bin, data, dev, doc, lib}
+                debmake.sed.sed(
+                    "extra1" + deb_type + "_*",
+                    "debian/",
+                    substlist,
+                    binpackagedot,
+                    para,
+                )
+        ###################################################################
+        # wait for licensecheck or lrc
+        ###################################################################
+        if job:
+            finish(para, job)
+            job = None
+    finally:
+        # kill and reap licensecheck or lrc left behind by an error
+        if job:
+            debmake.sh.sh_kill(job[1])
+    ###################################################################
+    # write all staged debian/* files (conf_required at last)
     ###################################################################
-    # wrap-and-sort -vast
+    debmake.cat.commit(para, ["debian/" + conf for conf in conf_required])
+    ###################################################################
+    # wrap-and-sort -vast only for the files not rendered by debmake
+    # (rendered ones are wrapped and sorted by debmake.wrap)
     # comments may be reordered to be placed after an empty line
     ###################################################################
-    if para["verbose"]:
-        command = "wrap-and-sort -vast"
-    else:
-        command = "wrap-and-sort -ast"
-    debmake.sh.sh(command)
-    print("I: debian/* may have a blank line at the top.")
+    files = debmake.wrap.external(para)
+    if files:
+        if para["verbose"]:
+            command = "wrap-and-sort -vast"
+        else:
+            command = "wrap-and-sort -ast"
+        for file in files:
+            command += " -f " + file
+        debmake.sh.sh(command, work_dir)
+        print("I: debian/* may have a blank line at the top.")
+    debmake.cat.summary(para)
     return
 
 
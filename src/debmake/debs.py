@@ -22,7 +22,7 @@ CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
-import sys
+import debmake.error
 
 
 ###########################################################################
@@ -52,11 +52,9 @@ def debs(para):
         ###################################################################
         y = x.split(":")
         if len(y) >= 3:
-            print(
-                "E: -b does not support the 3rd argument yet: {}".format(x),
-                file=sys.stderr,
+            raise debmake.error.UsageError(
+                "-b does not support the 3rd argument yet: {}".format(x)
             )
-            exit(1)
         ###################################################################
         # get real binary package name: p
         ###################################################################
@@ -204,8 +202,9 @@ def debs(para):
             elif t == "":  # bin as default
                 pass
             else:
-                print("E: -b: {} has undefined type: {}".format(p, t), file=sys.stderr)
-                exit(1)
+                raise debmake.error.UsageError(
+                    "-b: {} has undefined type: {}".format(p, t)
+                )
         ###################################################################
         # update binary package type from dh_with and arch setting
         ###################################################################
@@ -225,13 +224,11 @@ def debs(para):
             elif a == "any":  # bin as default
                 t = "bin"
             else:
-                print(
-                    "E: -b: {} has arch={}, dh_with={} and null type.".format(
+                raise debmake.error.UsageError(
+                    "-b: {} has arch={}, dh_with={} and null type.".format(
                         p, a, para["dh_with"]
-                    ),
-                    file=sys.stderr,
+                    )
                 )
-                exit(1)
         # t always have non NULL string value !
         ###################################################################
         # monoarch = non-multi-arch
@@ -266,11 +263,9 @@ def debs(para):
             "I: binary package={} Type={} / Arch={} M-A={}".format(p, t, a, m),
         )
         if p in pset:
-            print(
-                'E: duplicate definition of package name "{}"'.format(p),
-                file=sys.stderr,
+            raise debmake.error.UsageError(
+                'duplicate definition of package name "{}"'.format(p)
             )
-            exit(1)
         pset.update({p})
         if t in tset:
             print(
@@ -53,7 +53,12 @@ key_parameters = [
 # All Debug outputs to STDERR
 #######################################################################
 def debug(msg, type="s", para=dict()):
-    env = os.environ.get("DEBUG", "")
+    # para["debug"]: debug level (set from DEBUG environment variable
+    # and -D option)
+    env = para.get("debug")
+    if env is None:
+        # before para is set
+        env = os.environ.get("DEBUG", "")
     if type == "s" and "s" in env:
         # simple debug progress report
         print(
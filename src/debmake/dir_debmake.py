@@ -40,25 +40,28 @@ def dir_debmake(para):
         * Existing para['debmake_dir'] may be replaced with the current content
           after pausing for [Y/n]
     """
-    if os.path.abspath(para["debmake_dir"]) == os.path.abspath(para["source_dir"]):
+    base_dir = para["base_dir"]
+    if os.path.normpath(
+        os.path.join(base_dir, para["debmake_dir"])
+    ) == os.path.normpath(os.path.join(base_dir, para["source_dir"])):
         print(
             'I: already in the package-version form: "{}"'.format(para["debmake_dir"])
         )
     else:
-        if os.path.isdir(para["debmake_dir"]):
+        if os.path.isdir(os.path.join(base_dir, para["debmake_dir"])):
             debmake.yn.yn(
                 'remove the old versioned directory "{}"'.format(para["debmake_dir"]),
-                "rm -rf '" + para["debmake_dir"] + "'",
+                lambda: debmake.sh.rm_rf(para["debmake_dir"], base_dir),
                 para["yes"],
+                cwd=base_dir,
             )
         # copy from para["source_dir"]/. to para["debmake_dir"] (with debian/* data)
-        if para["verbose"]:
-            command = "cp -dRv "
-        else:
-            command = "cp -dR "
-        command += "'" + para["base_dir"] + "/" + para["source_dir"] + "/.' '"
-        command += para["debmake_dir"] + "'"
-        debmake.sh.sh(command)
+        debmake.sh.cp_dR(
+            base_dir + "/" + para["source_dir"],
+            para["debmake_dir"],
+            base_dir,
+            verbose=para["verbose"],
+        )
     return
 
 
@@ -69,4 +72,6 @@ if __name__ == "__main__":
     para["source_dir"] = sys.argv[1]
     para["debmake_dir"] = sys.argv[2]
     para["yes"] = 0
+    para["verbose"] = False
+    para["base_dir"] = os.getcwd()
     dir_debmake(para)
@@ -26,6 +26,7 @@ import os.path
 import shutil
 import sys
 
+import debmake.error
 import debmake.sh
 
 
@@ -40,28 +41,24 @@ def dir_git(para):
         * para['source_dir'] is created if it doesn't exist.
         * Existing para['source_dir'] may be updated
     """
+    base_dir = para["base_dir"]
     if not shutil.which("git"):
-        print("E: please install git.", file=sys.stderr)
-        exit(1)
-    if not os.path.exists(para["source_dir"]):
+        raise debmake.error.UsageError("please install git.")
+    if not os.path.exists(os.path.join(base_dir, para["source_dir"])):
         print('I: checked out to "{}"'.format(para["source_dir"]), file=sys.stderr)
         command = "git clone '" + para["url"] + "'"
-        debmake.sh.sh(command)
-    elif os.path.exists(para["source_dir"] + "/.git/config"):
+        debmake.sh.sh(command, base_dir)
+    elif os.path.exists(os.path.join(base_dir, para["source_dir"], ".git/config")):
         print(
             'I: update the local work tree at "{}"'.format(para["source_dir"]),
             file=sys.stderr,
         )
         command = "cd '" + para["source_dir"] + "' ; git pull ; cd -"
-        debmake.sh.sh(command)
+        debmake.sh.sh(command, base_dir)
     else:
-        print(
-            'E: "{}" exists but isn\'t the valid git repository'.format(
-                para["source_dir"]
-            ),
-            file=sys.stderr,
+        raise debmake.error.SourceError(
+            '"{}" exists but isn\'t the valid git repository'.format(para["source_dir"])
         )
-        exit(1)
     return
 
 
@@ -70,4 +67,5 @@ if __name__ == "__main__":
     para["url"] = sys.argv[1]
     para["source_dir"] = os.path.basename(para["url"])
     para["yes"] = 0
+    para["base_dir"] = os.getcwd()
     dir_git(para)
@@ -23,8 +23,9 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 import os
-import sys
 
+import debmake.error
+import debmake.index
 import debmake.sh
 
 
@@ -38,20 +39,25 @@ def dir_tar(para):
     """
     #######################################################################
     # make distribution tarball using tar excluding debian/ directory
-    # VCS tree are not copied.
+    # VCS tree are not copied.  For a git work tree, only the files
+    # tracked in its git index are archived as debmake.index analyzes.
     #######################################################################
-    if not os.path.isdir(para["debmake_dir"]):
-        print(
-            'E: missing debmake_dir: "{}"'.format(para["debmake_dir"]),
-            file=sys.stderr,
+    if not os.path.isdir(os.path.join(para["base_dir"], para["debmake_dir"])):
+        raise debmake.error.SourceError(
+            'missing debmake_dir: "{}"'.format(para["debmake_dir"])
         )
-        exit(1)
-    if not os.path.exists(para["tarball"]):
+    if not os.path.exists(os.path.join(para["base_dir"], para["tarball"])):
         # missing tar while excluding VCS and debian directories
         if para["verbose"]:
             command = "tar --verbose "
         else:
             command = "tar "
+        records = debmake.index.git_files(
+            os.path.join(para["base_dir"], para["debmake_dir"])
+        )
+        if records:
+            git_tar(para, command, records)
+            return
         command += (
             "--exclude '"
             + para["debmake_dir"]
@@ -60,7 +66,37 @@ def dir_tar(para):
             + para["option_z"]
         )
         command += " -cvf '" + para["tarball"] + "' '" + para["debmake_dir"] + "'"
-        debmake.sh.sh(command)
+        debmake.sh.sh(command, para["base_dir"])
+    return
+
+
+def git_tar(para, command, records):
+    # records: debmake.index.git_files() of debmake_dir
+    list_file = para["debmake_dir"] + ".tar-files"
+    names = [para["debmake_dir"]]
+    dirs = set(names)
+    for mode, relpath in records:
+        # submodules are not descended (their files are not tracked)
+        if mode == "160000" or relpath.split("/")[0] == "debian":
+            continue
+        name = os.path.join(para["debmake_dir"], relpath)
+        parents = []
+        parent = os.path.dirname(name)
+        while parent not in dirs:
+            dirs.add(parent)
+            parents.append(parent)
+            parent = os.path.dirname(parent)
+        names.extend(reversed(parents))
+        names.append(name)
+    with open(os.path.join(para["base_dir"], list_file), mode="wb") as f:
+        for name in names:
+            f.write(os.fsencode(name) + b"\0")
+    command += "--no-recursion " + para["option_z"]
+    command += " -cvf '" + para["tarball"] + "' --null --files-from '" + list_file + "'"
+    try:
+        debmake.sh.sh(command, para["base_dir"])
+    finally:
+        os.remove(os.path.join(para["base_dir"], list_file))
     return
 
 
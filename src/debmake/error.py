@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+#######################################################################
+# Errors reported by the debmake command as "E: ..."
+#######################################################################
+class DebmakeError(Exception):
+    """base class of all errors raised by debmake"""
+
+
+class UsageError(DebmakeError):
+    """invalid command line option, URL/PATH or their combination"""
+
+
+class SourceError(DebmakeError):
+    """missing or invalid upstream source (tarball, directory, git repository)"""
+
+
+class PackagingError(DebmakeError):
+    """binary package specification inconsistent with itself or the source"""
+
+
+class AbortError(DebmakeError):
+    """terminated since "n" was chosen at a [Y/n] prompt"""
+
+
+class CommandError(DebmakeError):
+    """external command failed"""
+
+    def __init__(self, command, returncode):
+        super().__init__(
+            "command failed (exit status {}): {}".format(returncode, command)
+        )
+        self.command = command
+        self.returncode = returncode
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    try:
+        raise CommandError("false", 1)
+    except DebmakeError as e:
+        print("E: {}".format(e))
@@ -22,37 +22,89 @@ CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
+import functools
+import mmap
 import os
 import re
 
 
 #######################################################################
-# grep rtext file
-def grep(file, rtext, *range):
+# compile_regex: cached re.compile()
+@functools.lru_cache(maxsize=256)
+def compile_regex(rtext):
+    return re.compile(rtext)
+
+
+#######################################################################
+# line_range: (lbgn, lend) of range
+def line_range(*range):
     # range 0,1: grep on the first line (0-th)
     # range 5,8: grep on the 6-th line to the 8-th line
     # range 5,-1: grep on the 6-th line to the last line
-    lines = ""
+    if len(range) == 0:
+        return (0, 1)
+    elif len(range) == 1:
+        return (range[0], range[0] + 1)
+    else:
+        return (range[0], range[1])
+
+
+#######################################################################
+# iter_lines: lines of file read by mmap (non-UTF-8 bytes are replaced)
+def iter_lines(file):
+    with open(file, mode="rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            return
+        with mm:
+            pos = 0
+            size = len(mm)
+            while pos < size:
+                end = mm.find(b"\n", pos)
+                end = size if end < 0 else end + 1
+                yield mm[pos:end].decode("utf-8", errors="replace")
+                pos = end
+
+
+#######################################################################
+# grep_patterns: first matching line of each (rtext, lbgn, lend)
+def grep_patterns(text_lines, patterns):
+    # patterns: list of (rtext, *range)
+    # return a list of the first matching line ("" if none) of each
+    # pattern.  Reading text_lines stops when all patterns are answered.
+    results = [""] * len(patterns)
+    pending = {}
+    for k, (rtext, *range) in enumerate(patterns):
+        pending[k] = (compile_regex(rtext),) + line_range(*range)
+    for i, line in enumerate(text_lines):
+        for k, (reg, lbgn, lend) in list(pending.items()):
+            if (lend >= 0) and (lend <= i):
+                # out of range
+                del pending[k]
+            elif (i >= lbgn) and reg.search(line):
+                results[k] = line
+                del pending[k]
+        if not pending:
+            break
+    return results
+
+
+#######################################################################
+# grep rtext file
+def grep(file, rtext, *range):
+    # return the first matching line in the range ("" if none)
     if not os.path.isfile(file):
         print("I: skipping :: {} (missing file)".format(file))
-    else:
-        reg = re.compile(rtext)
-        if len(range) == 0:
-            lbgn = 0
-            lend = 1
-        elif len(range) == 1:
-            lbgn = range[0]
-            lend = lbgn + 1
-        else:
-            lbgn = range[0]
-            lend = range[1]
-        with open(file, mode="r", encoding="utf-8") as f:
-            for i, line in enumerate(f.readlines()):
-                if (i >= lbgn) and ((lend < 0) or (lend > i)):
-                    match = reg.search(line)
-                    if match:
-                        lines += line
-    return lines
+        return ""
+    return grep_patterns(iter_lines(file), [(rtext,) + range])[0]
+
+
+#######################################################################
+# grep rtext on lines already read (see debmake.index)
+def grep_lines(text_lines, rtext, *range):
+    return grep_patterns(text_lines, [(rtext,) + range])[0]
 
 
 #######################################################################
@@ -68,3 +120,5 @@ if __name__ == "__main__":
     print("----")
     if not grep("/bin/zcat", r"teXXXXs", 0, 10):
         print("not found")
+    print("----")
+    print(grep_patterns(iter_lines("/bin/zcat"), [(r"^#!",), (r"gzip", 0, -1)]))
@@ -0,0 +1,460 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import collections
+import concurrent.futures
+import fnmatch
+import os
+import re
+import time
+
+import debmake.grep
+import debmake.metadata
+import debmake.sniff
+
+#######################################################################
+# Define constants
+#######################################################################
+# do not descend to VCS dirs and debian/ directory
+prune_dirs = {"CVS", ".svn", ".pc", ".git", ".hg", ".bzr", "debian"}
+# re.search file name extension (ignoring compression)
+re_ext = re.compile(r"\.(?P<ext>[^.]+)(?:\.in|\.gz|\.bz2|\.xz|\.Z\|\.z|~)*$")
+
+
+#######################################################################
+# SourceTreeIndex: one os.scandir traversal of the source tree
+#######################################################################
+class SourceTreeIndex:
+    """
+    Index of the source tree at top built by a single traversal.
+
+    top_entries: name -> os.DirEntry of the top directory
+    ext_counter: collections.Counter of file name extensions of regular
+                 files (not symlinks) in the order first found by os.walk
+                 (top-down).  Symlinks to directories and pruned
+                 directories are not descended.
+    n_files:     number of non-directory entries
+    n_symlinks:  number of symlinks among them
+    noext:       relative paths of regular files without extension (only
+                 with noext=True, for debmake.sniff)
+    relpaths:    relative paths of regular files (only with files=True,
+                 for debmake.copyright, see files())
+    dirs:        relative path -> (st_ino, st_mtime_ns) of the descended
+                 subdirectories (only with dirs=True, for debmake.cache)
+    probes:      (method, *args) -> result of isfile(), glob(), grep() and
+                 metadata() calls (for debmake.cache)
+    read:        relative paths of the files read by lines() and grep()
+                 (for debmake.cache)
+
+    Only the counters are kept for the subdirectories, so the memory
+    stays constant per distinct extension for any number of files.
+    For a git work tree (top/.git directory), the files are listed from
+    the git index by "git ls-files" instead (tracked files only, no stat
+    of each file) unless git=False.
+    File sizes and file contents are read only when asked.
+    """
+
+    def __init__(self, top=".", jobs=1, noext=False, dirs=False, git=True, files=False):
+        self.top = top
+        self.top_entries = {}
+        self.ext_counter = collections.Counter()
+        self.n_files = 0
+        self.n_symlinks = 0
+        self.collect_noext = noext
+        self.noext = []
+        self.collect_files = files
+        self.relpaths = []
+        self.collect_dirs = dirs
+        self.dirs = {}
+        self.probes = {}
+        self.sizes = {}
+        self.texts = {}
+        self.read = set()
+        self.sniffed = None
+        self.scan_time_ns = time.time_ns()
+        if git and self.scan_git():
+            pass
+        elif jobs > 1:
+            self.scan_parallel(jobs)
+        else:
+            self.scan()
+
+    def scandir(self, reldir):
+        """
+        Scan one directory and return (entries, ext_counter, n_files,
+        n_symlinks, noext, relpaths, dirs, subdirs) where entries are kept
+        only for the top directory and subdirs are the relative paths to
+        descend.
+        """
+        entries = []
+        ext_counter = collections.Counter()
+        n_files = 0
+        n_symlinks = 0
+        noext = []
+        relpaths = []
+        dirs = {}
+        subdirs = []
+        with os.scandir(os.path.join(self.top, reldir)) as it:
+            for entry in it:
+                if reldir == "":
+                    entries.append(entry)
+                is_symlink = entry.is_symlink()
+                if entry.is_dir():
+                    # is_dir() follows symlinks like os.walk()
+                    if not is_symlink and entry.name not in prune_dirs:
+                        subdir = os.path.join(reldir, entry.name)
+                        subdirs.append(subdir)
+                        if self.collect_dirs:
+                            # stat before its scandir: later changes are seen
+                            st = entry.stat(follow_symlinks=False)
+                            dirs[subdir] = (st.st_ino, st.st_mtime_ns)
+                    continue
+                n_files += 1
+                if is_symlink:
+                    n_symlinks += 1
+                    continue
+                if self.collect_files and entry.is_file():
+                    relpaths.append(os.path.join(reldir, entry.name))
+                re_ext_match = re_ext.search(entry.name)
+                if re_ext_match:
+                    ext_counter[re_ext_match.group("ext")] += 1
+                elif self.collect_noext:
+                    noext.append(os.path.join(reldir, entry.name))
+        return (
+            entries,
+            ext_counter,
+            n_files,
+            n_symlinks,
+            noext,
+            relpaths,
+            dirs,
+            subdirs,
+        )
+
+    def merge(self, reldir, result):
+        (
+            entries,
+            ext_counter,
+            n_files,
+            n_symlinks,
+            noext,
+            relpaths,
+            dirs,
+            subdirs,
+        ) = result
+        if reldir == "":
+            self.top_entries = {entry.name: entry for entry in entries}
+        self.ext_counter.update(ext_counter)
+        self.n_files += n_files
+        self.n_symlinks += n_symlinks
+        self.noext.extend(noext)
+        self.relpaths.extend(relpaths)
+        self.dirs.update(dirs)
+        return subdirs
+
+    def scan(self):
+        stack = [""]
+        while stack:
+            reldir = stack.pop()
+            subdirs = self.merge(reldir, self.scandir(reldir))
+            # visit subdirectories in the scandir order (top-down)
+            stack.extend(reversed(subdirs))
+        return
+
+    def scan_parallel(self, jobs):
+        """
+        Same result as scan() but directories are scanned by a pool of
+        threads.  This helps on network file systems where each scandir
+        is latency bound.  The per-directory counters are merged in the
+        order of scan() as soon as all their predecessors are merged.
+        """
+        results = {}
+        stack = [""]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(self.scandir, ""): ""}
+            while futures:
+                done, pending = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    reldir = futures.pop(future)
+                    results[reldir] = future.result()
+                    for subdir in results[reldir][-1]:
+                        futures[executor.submit(self.scandir, subdir)] = subdir
+                while stack and stack[-1] in results:
+                    reldir = stack.pop()
+                    subdirs = self.merge(reldir, results.pop(reldir))
+                    stack.extend(reversed(subdirs))
+        return
+
+    def scan_git(self):
+        """
+        Same counters as scan() but for the files tracked in the git
+        index of the work tree at top.  The git index file replaces the
+        subdirectories in dirs.  Return False if top is not a git work
+        tree or git fails (then scan() is used).
+        """
+        index_file = os.path.join(".git", "index")
+        try:
+            st = os.stat(os.path.join(self.top, index_file))
+        except OSError:
+            return False
+        records = git_files(self.top)
+        if not records:
+            return False
+        top_names = set()
+        for mode, relpath in records:
+            names = relpath.split("/")
+            top_names.add(names[0])
+            if mode == "160000":
+                # submodule: not descended as its files are not tracked
+                continue
+            self.n_files += 1
+            if mode == "120000":
+                self.n_symlinks += 1
+                continue
+            if self.collect_files:
+                self.relpaths.append(relpath)
+            re_ext_match = re_ext.search(names[-1])
+            if re_ext_match:
+                self.ext_counter[re_ext_match.group("ext")] += 1
+            elif self.collect_noext:
+                self.noext.append(relpath)
+        with os.scandir(self.top) as it:
+            self.top_entries = {
+                entry.name: entry for entry in it if entry.name in top_names
+            }
+        if self.collect_dirs:
+            self.dirs = {index_file: (st.st_ino, st.st_mtime_ns)}
+        print("I: list {} files tracked by git".format(self.n_files))
+        return True
+
+    def files(self):
+        """
+        relative paths of the regular files counted by this index (same
+        as debmake.index.files(top), listed again if not collected)
+        """
+        if not self.collect_files:
+            self.relpaths = list(files(self.top))
+            self.collect_files = True
+        return self.relpaths
+
+    ###################################################################
+    # queries on the top directory
+    ###################################################################
+    def isfile(self, name):
+        """os.path.isfile() of name in the top directory"""
+        entry = self.top_entries.get(name)
+        if entry is None:
+            result = False
+        else:
+            try:
+                result = entry.is_file()
+            except OSError:
+                result = False
+        self.probes[("isfile", name)] = result
+        return result
+
+    def glob(self, pattern):
+        """glob.glob(pattern) in the top directory (no hidden files)"""
+        result = [
+            name
+            for name in fnmatch.filter(self.top_entries.keys(), pattern)
+            if name[0] != "."
+        ]
+        self.probes[("glob", pattern)] = result
+        return result
+
+    ###################################################################
+    # queries on files
+    ###################################################################
+    def path(self, relpath):
+        return os.path.join(self.top, relpath)
+
+    def size(self, relpath):
+        size = self.sizes.get(relpath)
+        if size is None:
+            size = os.lstat(self.path(relpath)).st_size
+            self.sizes[relpath] = size
+        return size
+
+    def lines(self, relpath):
+        """lines of the text file (read only once, non-UTF-8 replaced)"""
+        lines = self.texts.get(relpath)
+        if lines is None:
+            with open(
+                self.path(relpath), mode="r", encoding="utf-8", errors="replace"
+            ) as f:
+                lines = f.readlines()
+            self.texts[relpath] = lines
+            self.read.add(relpath)
+        return lines
+
+    def grep(self, relpath, rtext, *range):
+        """debmake.grep.grep() on the file"""
+        return self.grep_many(relpath, [(rtext,) + range])[0]
+
+    def grep_many(self, relpath, patterns):
+        """
+        debmake.grep.grep_patterns() of patterns [(rtext, *range), ...] on
+        the file.  Each result is kept as a probe and only the patterns not
+        asked before are searched in one pass.  The file is streamed by
+        debmake.grep.iter_lines() (only up to the last line needed) unless
+        its lines are already cached by lines().
+        """
+        keys = [("grep", relpath) + tuple(pattern) for pattern in patterns]
+        todo = [
+            pattern for key, pattern in zip(keys, patterns) if key not in self.probes
+        ]
+        if todo:
+            if os.sep in relpath:
+                exists = os.path.isfile(self.path(relpath))
+            else:
+                exists = self.isfile(relpath)
+            if not exists:
+                print("I: skipping :: {} (missing file)".format(self.path(relpath)))
+                results = [""] * len(todo)
+            else:
+                lines = self.texts.get(relpath)
+                if lines is None:
+                    lines = debmake.grep.iter_lines(self.path(relpath))
+                    self.read.add(relpath)
+                results = debmake.grep.grep_patterns(lines, todo)
+            for pattern, result in zip(todo, results):
+                self.probes[("grep", relpath) + tuple(pattern)] = result
+        return [self.probes[key] for key in keys]
+
+    def metadata(self):
+        """debmake.metadata.metadata() of the top directory (once)"""
+        if ("metadata",) not in self.probes:
+            self.probes[("metadata",)] = debmake.metadata.metadata(self)
+        return self.probes[("metadata",)]
+
+    def sniff(self, jobs=0):
+        """debmake.sniff.sniff() of the files without extension (once)"""
+        if self.sniffed is None:
+            self.sniffed = debmake.sniff.sniff(self.top, self.noext, jobs)
+        return self.sniffed
+
+
+#######################################################################
+# git_files: (mode, relpath) of files in the git index of top
+#######################################################################
+def git_files(top):
+    """
+    Return the list of (mode, relpath) tracked in the git index of the
+    work tree at top (one entry per path, pruned directories and files
+    deleted from the work tree skipped) or None if top has no .git/index
+    or git fails.  debmake.dir_tar makes the tarball of a git work tree
+    from the same list.
+    """
+    if not os.path.isfile(os.path.join(top, ".git", "index")):
+        return None
+    import subprocess
+
+    try:
+        # -s: "mode object stage\tpath" (conflicts have stages 1-3)
+        # -t -c -d: tagged "H " (cached) and also "R " (deleted)
+        result = subprocess.run(
+            ["git", "-C", top, "ls-files", "-z", "-s", "-t", "-c", "-d"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    records = []
+    deleted = set()
+    last = None
+    for record in result.stdout.split(b"\0"):
+        if not record:
+            continue
+        info, path = record.split(b"\t", 1)
+        tag, mode = info.split(b" ", 2)[:2]
+        if tag == b"R":
+            deleted.add(path)
+            continue
+        if path == last:
+            continue
+        last = path
+        relpath = os.fsdecode(path)
+        if any(name in prune_dirs for name in relpath.split("/")[:-1]):
+            continue
+        records.append((mode.decode(), relpath, path))
+    return [(mode, relpath) for mode, relpath, path in records if path not in deleted]
+
+
+#######################################################################
+# files: relative paths of all regular files in the source tree
+#######################################################################
+def files(top):
+    """
+    Generate the relative paths of the regular files (not symlinks) which
+    SourceTreeIndex(top) counts: tracked files for a git work tree or
+    all files outside the pruned directories.
+    """
+    records = git_files(top)
+    if records:
+        for mode, relpath in records:
+            if mode not in ("120000", "160000"):
+                yield relpath
+        return
+    stack = [""]
+    while stack:
+        reldir = stack.pop()
+        subdirs = []
+        with os.scandir(os.path.join(top, reldir)) as it:
+            for entry in it:
+                if entry.is_symlink():
+                    continue
+                relpath = os.path.join(reldir, entry.name)
+                if entry.is_dir():
+                    if entry.name not in prune_dirs:
+                        subdirs.append(relpath)
+                elif entry.is_file():
+                    yield relpath
+        stack.extend(reversed(subdirs))
+    return
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    import sys
+
+    top = sys.argv[1] if len(sys.argv) > 1 else "."
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    index = SourceTreeIndex(top, jobs)
+    print(
+        "I: {} files ({} symlinks), {} extensions, {} top entries".format(
+            index.n_files,
+            index.n_symlinks,
+            len(index.ext_counter),
+            len(index.top_entries),
+        )
+    )
+    for name in sorted(index.top_entries):
+        print("   {:<8} {}".format("file" if index.isfile(name) else "", name))
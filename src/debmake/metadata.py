@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import configparser
+import json
+import tomllib
+
+#######################################################################
+# Upstream metadata
+#
+# pyproject.toml, setup.cfg and package.json in the top directory are
+# parsed once each (with tomllib, configparser and json) and merged as
+#   backend:  top level module name of the PEP 517 build backend
+#             (pyproject.toml only, e.g., "setuptools", "hatchling")
+#   name, version, summary, homepage
+# The first file with a value wins in the above order.  Missing values
+# are "".
+#######################################################################
+keys = ["backend", "name", "version", "summary", "homepage"]
+# PEP 517: no build-backend means the setuptools legacy backend
+default_backend = "setuptools"
+
+
+def parse_pyproject(text):
+    data = tomllib.loads(text)
+    meta = {}
+    build_system = data.get("build-system", {})
+    backend = build_system.get("build-backend", "")
+    if backend:
+        # "setuptools.build_meta:__legacy__" -> "setuptools"
+        meta["backend"] = backend.split(":")[0].split(".")[0]
+    else:
+        meta["backend"] = default_backend
+    project = data.get("project", {})
+    meta["name"] = project.get("name", "")
+    meta["version"] = project.get("version", "")
+    meta["summary"] = project.get("description", "")
+    urls = {key.lower(): value for key, value in project.get("urls", {}).items()}
+    for key in ["homepage", "home", "documentation", "repository", "source"]:
+        if key in urls:
+            meta["homepage"] = urls[key]
+            break
+    return meta
+
+
+def parse_setup_cfg(text):
+    config = configparser.ConfigParser(interpolation=None)
+    config.read_string(text)
+    meta = {}
+    if config.has_section("metadata"):
+        metadata = config["metadata"]
+        meta["name"] = metadata.get("name", "")
+        meta["version"] = metadata.get("version", "")
+        meta["summary"] = metadata.get("description", "")
+        meta["homepage"] = metadata.get("url", metadata.get("home_page", ""))
+    return meta
+
+
+def parse_package_json(text):
+    data = json.loads(text)
+    meta = {}
+    if isinstance(data, dict):
+        meta["name"] = data.get("name", "")
+        meta["version"] = data.get("version", "")
+        meta["summary"] = data.get("description", "")
+        meta["homepage"] = data.get("homepage", "")
+    return meta
+
+
+parsers = [
+    ("pyproject.toml", parse_pyproject),
+    ("setup.cfg", parse_setup_cfg),
+    ("package.json", parse_package_json),
+]
+
+
+#######################################################################
+# metadata: merged metadata of the source tree
+#######################################################################
+def metadata(index):
+    # index: debmake.index.SourceTreeIndex (reads each file once)
+    meta = {key: "" for key in keys}
+    for name, parse in parsers:
+        if not index.isfile(name):
+            continue
+        try:
+            values = parse("".join(index.lines(name)))
+        except (
+            OSError,
+            UnicodeDecodeError,
+            tomllib.TOMLDecodeError,
+            configparser.Error,
+            ValueError,
+            AttributeError,
+        ) as e:
+            print("W: ignore unparsable {}: {}".format(name, e))
+            continue
+        for key in keys:
+            value = values.get(key, "")
+            if not meta[key] and isinstance(value, str):
+                meta[key] = value.strip()
+    return meta
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    import sys
+
+    import debmake.index
+
+    index = debmake.index.SourceTreeIndex(sys.argv[1] if len(sys.argv) > 1 else ".")
+    for key, value in metadata(index).items():
+        print("I: {:<8} = {}".format(key, value))
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import json
+import os
+import sys
+
+#######################################################################
+# Packed templates
+#
+# All files in debmake/data/ are packed into debmake/data.pack at build
+# time (by the build_py hook in setup.py) so that debmake.read.read()
+# reads them all with a single read instead of opening each template:
+#   b"DEBMAKE-PACK 1\n"
+#   JSON index {name: [offset, length], ...} in os.scandir() order + b"\n"
+#   concatenated file contents (offsets are relative to here)
+# The per-file sources in debmake/data/ stay the master copy.  Without
+# data.pack (e.g., in the source tree or an editable install) or with a
+# broken one, the files are read one by one.
+#######################################################################
+MAGIC = b"DEBMAKE-PACK 1\n"
+
+
+def pack_path(data_path):
+    # data_path: .../debmake/data/ -> .../debmake/data.pack
+    return data_path.rstrip("/") + ".pack"
+
+
+def write_pack(data_path, file=""):
+    ###################################################################
+    # data_path: directory path with / at the end
+    ###################################################################
+    if not file:
+        file = pack_path(data_path)
+    index = {}
+    payload = []
+    offset = 0
+    for entry in os.scandir(data_path):
+        if entry.is_file() and entry.name[0] != ".":
+            with open(entry.path, mode="rb") as f:
+                data = f.read()
+            # must be valid UTF-8 as debmake.read.read()
+            data.decode("utf-8")
+            index[entry.name] = [offset, len(data)]
+            payload.append(data)
+            offset += len(data)
+    with open(file + ".new", mode="wb") as f:
+        f.write(MAGIC)
+        f.write(json.dumps(index, ensure_ascii=False).encode("utf-8") + b"\n")
+        f.write(b"".join(payload))
+    os.replace(file + ".new", file)
+    return len(index)
+
+
+def read_pack(file):
+    # return {name: text} in the packed order or None if not packed
+    try:
+        with open(file, mode="rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if not data.startswith(MAGIC):
+        return None
+    try:
+        end = data.index(b"\n", len(MAGIC))
+        index = json.loads(data[len(MAGIC) : end])
+        payload = memoryview(data)[end + 1 :]
+        texts = {}
+        for name, (offset, length) in index.items():
+            if offset < 0 or length < 0 or offset + length > len(payload):
+                raise ValueError("truncated")
+            texts[name] = str(payload[offset : offset + length], "utf-8")
+    except (ValueError, TypeError, AttributeError, KeyError, IndexError):
+        # truncated or corrupt (json.JSONDecodeError and UnicodeDecodeError
+        # are ValueError)
+        print("W: ignoring the broken packed templates: {}".format(file))
+        return None
+    return texts
+
+
+#######################################################################
+# python3 -m debmake.pack [DATA_DIR [PACK]]
+#######################################################################
+if __name__ == "__main__":
+    data_path = sys.argv[1] if len(sys.argv) > 1 else "src/debmake/data"
+    data_path = data_path.rstrip("/") + "/"
+    file = sys.argv[2] if len(sys.argv) > 2 else ""
+    n = write_pack(data_path, file)
+    print(
+        "I: packed {} files of {} into {}".format(
+            n, data_path, file or pack_path(data_path)
+        )
+    )
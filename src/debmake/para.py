@@ -24,13 +24,15 @@ SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 import argparse
-import datetime
 import os
 import pwd
 import re
 import sys
+import time
 
 import debmake.debug
+import debmake.error
+import debmake.sh
 import debmake.yn
 
 re_url = re.compile(
@@ -67,14 +69,17 @@ re_safe = re.compile(
 #######################################################################
 # Initialize parameters
 #######################################################################
-def para(para):
+def para(para, argv=None):
     """
     Set para[...] from the command line and environment variables.
+
+    argv is the list of command line arguments (default: sys.argv[1:]).
     """
     #######################################################################
     # process command line
     #######################################################################
     p = argparse.ArgumentParser(
+        prog=para["program_name"],
         formatter_class=argparse.RawDescriptionHelpFormatter,
         description="""\
 {0}: make Debian source package    Version: {1}
@@ -162,7 +167,7 @@ Arguments to -b, -f, and -w options need to be quoted to protect them from the s
         "--debug",
         action="store",
         default="",
-        help='set DEBUG environment variable to <value> for debug logging (substring of "spPd",  use "_" to unset DEBUG)',
+        help='use <value> instead of DEBUG environment variable for debug logging (substring of "spPd",  use "_" to ignore DEBUG)',
         metavar="<value>",
     )
     p.add_argument(
@@ -257,6 +262,73 @@ Arguments to -b, -f, and -w options need to be quoted to protect them from the s
         default=False,
         help="keep the user editted ones without .ex suffix and create template files with .ex suffix",
     )
+    p.add_argument(
+        "--restart",
+        action="store_true",
+        default=False,
+        help="run all stages again ignoring the stage checkpoint file package-version.debmake-checkpoint",
+    )
+    p.add_argument(
+        "--sniff",
+        action="store_true",
+        default=False,
+        help="also classify files without extension by reading their first 512 bytes (#! line, ELF/PE/Mach-O/jar/zip magic)",
+    )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="neither use nor save the cached analysis of the source tree in ~/.cache/debmake",
+    )
+    p.add_argument(
+        "--licensecheck",
+        action="store_true",
+        default=False,
+        help="create debian/copyright with licensecheck instead of the builtin scanner",
+    )
+    p.add_argument(
+        "--batch",
+        action="store",
+        default="",
+        help="package all upstream sources listed in MANIFEST (one URL with its options per line) using a pool of worker processes",
+        metavar="MANIFEST",
+    )
+    p.add_argument(
+        "--jobs",
+        action="store",
+        type=int,
+        default=0,
+        help="set the number of parallel jobs for --batch (default: number of CPUs), the number of threads to scan the source tree (default: 1) and the number of processes of the builtin license scanner (default: number of CPUs)",
+        metavar="N",
+    )
+    p.add_argument(
+        "--serve",
+        action="store",
+        default="",
+        help='preload debmake and serve requests from "debmake --connect SOCKET" clients on the Unix SOCKET',
+        metavar="SOCKET",
+    )
+    p.add_argument(
+        "--connect",
+        action="store",
+        default="",
+        help='forward this command line to the "debmake --serve SOCKET" server (also set by DEBMAKE_SOCKET environment variable)',
+        metavar="SOCKET",
+    )
+    p.add_argument(
+        "--profile",
+        action="store",
+        default="",
+        help="write wall, CPU and child-process time of each stage and each shell command as JSON to FILE",
+        metavar="FILE",
+    )
+    p.add_argument(
+        "--profile-trace",
+        action="store",
+        default="",
+        help="write the same timing data as a Chrome trace-event file to FILE",
+        metavar="FILE",
+    )
     p.add_argument(
         "URL",
         nargs="?",
@@ -299,7 +371,7 @@ Arguments to -b, -f, and -w options need to be quoted to protect them from the s
         help=argparse.SUPPRESS,
     )
     p.add_argument("-T", "--tutorial", action="store_true", help=argparse.SUPPRESS)
-    args = p.parse_args()
+    args = p.parse_args(argv)
     #######################################################################
     # Debug
     #######################################################################
@@ -336,10 +408,42 @@ Arguments to -b, -f, and -w options need to be quoted to protect them from the s
     if args.tutorial:
         print("-T, --tutorial is ignored")
     #######################################################################
+    # --batch: each manifest entry is parsed again by its batch worker
+    #######################################################################
+    para["batch"] = args.batch  # --batch
+    para["jobs"] = args.jobs  # --jobs
+    if para["jobs"] <= 0:
+        para["jobs"] = os.cpu_count() or 1
+    # threads only pay off on network file systems (default: serial scan)
+    para["scan_jobs"] = max(args.jobs, 1)
+    para["sniff_jobs"] = max(args.jobs, 0)  # 0: default thread pool size
+    para["serve"] = args.serve  # --serve
+    if para["batch"] and para["serve"]:
+        raise debmake.error.UsageError("--batch and --serve are exclusive")
+    if para["batch"]:
+        if args.URL:
+            raise debmake.error.UsageError(
+                '--batch does not take URL/PATH: "{}"'.format(args.URL)
+            )
+        para["batch"] = os.path.normpath(os.path.join(para["start_dir"], args.batch))
+        para["yes"] = min(args.yes, 2)  # -y
+        para["verbose"] = args.verbose  # -V
+        return
+    #######################################################################
+    # --serve: each request is parsed again by its forked server process
+    #######################################################################
+    if para["serve"]:
+        if args.URL:
+            raise debmake.error.UsageError(
+                '--serve does not take URL/PATH: "{}"'.format(args.URL)
+            )
+        para["serve"] = os.path.normpath(os.path.join(para["start_dir"], args.serve))
+        return
+    #######################################################################
     # Set para[...] variables
     #######################################################################
     para["debmake_dir"] = ""
-    para["base_dir"] = os.path.abspath(".")
+    para["base_dir"] = para["start_dir"]
     # normalize URL
     para["url"] = args.URL
     if para["url"] == "" and args.archive:
@@ -349,18 +453,18 @@ Arguments to -b, -f, and -w options need to be quoted to protect them from the s
         # drop file:// for simplicity
         para["url"] = para["url"][7:]
     if para["url"] == "":
-        para["url"] = os.path.basename(os.getcwd())
-        print("I: [{}] $ cd ..".format(os.path.basename(os.getcwd())))
-        os.chdir("..")
-        para["base_dir"] = os.path.abspath(".")
+        # the base directory is the parent of the source tree
+        para["url"] = os.path.basename(para["start_dir"])
+        print("I: [{}] $ cd ..".format(para["url"]))
+        para["base_dir"] = os.path.dirname(para["start_dir"])
     para["binaryspec"] = args.binaryspec  # -b
-    debug = args.debug  # -d
+    debug = args.debug  # -D
     if debug:
         if "_" in debug:
             # ignore DEBUG environment
-            os.environ["DEBUG"] = ""
+            para["debug"] = ""
         else:
-            os.environ["DEBUG"] = debug
+            para["debug"] = debug
     para["email"] = args.email  # -e
     if para["email"]:
         pass
@@ -394,7 +498,11 @@ Arguments to -b, -f, and -w options need to be quoted to protect them from the s
     para["native"] = args.native  # -n
     para["package"] = args.package.lower()  # -p
     para["quitearly"] = args.quitearly  # -q
+    para["restart"] = args.restart  # --restart
+    para["cache"] = not args.no_cache  # --no-cache
+    para["licensecheck"] = args.licensecheck  # --licensecheck
     para["revision"] = args.revision  # -r
+    para["sniff"] = args.sniff  # --sniff
     para["tar"] = args.tar  # -t
     para["version"] = args.upstreamversion  # -u
     para["verbose"] = args.verbose  # -V
@@ -423,6 +531,18 @@ Arguments to -b, -f, and -w options need to be quoted to protect them from the s
         para["tarz"] = "tar.xz"
     #############################################
     para["backup"] = args.backup  # -B
+    #############################################
+    # profile output paths are relative to the start directory
+    para["profile"] = args.profile  # --profile
+    if para["profile"]:
+        para["profile"] = os.path.normpath(
+            os.path.join(para["start_dir"], para["profile"])
+        )
+    para["profile_trace"] = args.profile_trace  # --profile-trace
+    if para["profile_trace"]:
+        para["profile_trace"] = os.path.normpath(
+            os.path.join(para["start_dir"], para["profile_trace"])
+        )
     #######################################################################
     # analyze positional parameter for access and expand option
     #  para["method"] == "" --> Stop debmake
@@ -486,15 +606,13 @@ Arguments to -b, -f, and -w options need to be quoted to protect them from the s
         pass
     #######################################################################
     if para["method"] == "":
-        print(
-            'E: invalid URL/PATH used for debmake: "{}" (very restrictive)'.format(
-                para["url"]
-            ),
-            file=sys.stderr,
-        )
         print("I: consider executing debmake in the manually generated source tree.")
         debmake.debug.debug(" >>> mid-para ERROR for URL", type="p", para=para)
-        exit(1)
+        raise debmake.error.UsageError(
+            'invalid URL/PATH used for debmake: "{}" (very restrictive)'.format(
+                para["url"]
+            )
+        )
     #######################################################################
     # set legal fall back values
     #######################################################################
@@ -513,7 +631,7 @@ Arguments to -b, -f, and -w options need to be quoted to protect them from the s
     if para["revision"] == "":
         para["revision"] = "1"
     # timestamp shorthand string
-    timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%y%m%d%H%M")
+    timestamp = time.strftime("%y%m%d%H%M", time.gmtime())
     timestamp0 = "0~" + timestamp
     # for convenient native WIP version string: @: documented, #: hidden
     para["version"] = para["version"].replace("#", timestamp)
@@ -532,12 +650,10 @@ Arguments to -b, -f, and -w options need to be quoted to protect them from the s
     elif para["tarz"] in ["orig.tar.bz2", "tar.bz2", "tbz", "tb2", "tbz2"]:
         para["option_z"] = "--bzip2"
     else:
-        print(
-            'E: invalid -z option set for debmake: -z "{}"'.format(para["url"]),
-            file=sys.stderr,
-        )
         debmake.debug.debug(" >>> mid-para ERROR for -z option", type="p", para=para)
-        exit(1)
+        raise debmake.error.UsageError(
+            'invalid -z option set for debmake: -z "{}"'.format(para["url"])
+        )
 
     #######################################################################
     para["section"] = "unknown"
@@ -549,42 +665,41 @@ Arguments to -b, -f, and -w options need to be quoted to protect them from the s
     # Finalizing para[...] and sanity checks
     #######################################################################
     para["debmake_dir"] = para["package"] + "-" + para["version"]
+    # debian/* files are generated in this work tree
+    para["work_dir"] = os.path.join(para["base_dir"], para["debmake_dir"])
     if para["method"] == "tar_copy":
         para["tarball"] = para["url_pkg"] + para["url_ver"] + para["url_ext"]
         para["source_dir"] = para["debmake_dir"] + ".temp_dir"
-        if not os.path.exists(para["tarball"]):
-            print(
-                'E: tarball missing: "{}" for "{}"'.format(
-                    para["tarball"], para["method"]
-                ),
-                file=sys.stderr,
-            )
+        if not os.path.exists(os.path.join(para["base_dir"], para["tarball"])):
             debmake.debug.debug(" >>> late-para (tar_copy)", type="p", para=para)
-            exit(1)
+            raise debmake.error.SourceError(
+                'tarball missing: "{}" for "{}"'.format(para["tarball"], para["method"])
+            )
     elif para["method"] == "tar_wget":
         para["tarball"] = para["url_pkg"] + para["url_ver"] + para["url_ext"]
         para["source_dir"] = para["debmake_dir"] + ".temp_dir"
-        if os.path.exists(para["tarball"]):
-            command = "mv -f " + para["tarball"] + " " + para["tarball"] + ".backup"
+        if os.path.exists(
+            os.path.join(para["base_dir"], para["tarball"])
+        ) and not checkpoint_done("tar_wget", para):
             debmake.yn.yn(
                 'backup existing "{}" for "{}"'.format(para["tarball"], para["method"]),
-                command,
+                lambda: debmake.sh.mv_f(
+                    para["tarball"], para["tarball"] + ".backup", para["base_dir"]
+                ),
                 para["yes"],
                 exit_no=False,
+                cwd=para["base_dir"],
             )
     elif para["method"] == "dir_debmake":
         para["tarball"] = para["package"] + "-" + para["version"] + "." + para["tarz"]
         # switch CWD to the parent directory
         if para["url"] == "":
-            print(
-                'E: invalid URL = "" for method "{}" (never here)'.format(
-                    para["method"]
-                )
-            )
             debmake.debug.debug(
                 " >>> late-para (dir_debmake url==" ")", type="p", para=para
             )
-            exit(1)
+            raise debmake.error.UsageError(
+                'invalid URL = "" for method "{}" (never here)'.format(para["method"])
+            )
         elif para["url"][0] == "/":  # abspath
             # when invoked without optional positional argument as abspath,
             # para["url"] = no change
@@ -592,39 +707,49 @@ Arguments to -b, -f, and -w options need to be quoted to protect them from the s
         else:  # relpath
             # para["url"] = no change
             para["source_dir"] = para["url"]
-        if not os.path.exists(para["source_dir"]):
-            print(
-                'E: source_dir missing: "{}" for "{}"'.format(
+        if not os.path.exists(os.path.join(para["base_dir"], para["source_dir"])):
+            debmake.debug.debug(
+                " >>> late-para (dir_debmake missing source_dir)", type="p", para=para
+            )
+            raise debmake.error.SourceError(
+                'source_dir missing: "{}" for "{}"'.format(
                     os.path.relpath(
                         para["base_dir"] + "/" + para["source_dir"], para["start_dir"]
                     ),
                     para["method"],
-                ),
-                file=sys.stderr,
-            )
-            debmake.debug.debug(
-                " >>> late-para (dir_debmake missing source_dir)", type="p", para=para
+                )
             )
-            exit(1)
     elif para["method"] == "dir_git":
         para["tarball"] = para["package"] + "-" + para["version"] + "." + para["tarz"]
         para["source_dir"] = para["url_pkg"] + para["url_ver"]
-        if os.path.exists(para["source_dir"]):
+        if os.path.exists(os.path.join(para["base_dir"], para["source_dir"])):
             debmake.yn.yn(
                 'backup existing "{}/" for "{}"'.format(
                     para["source_dir"], para["method"]
                 ),
-                "mv -f " + para["source_dir"] + " " + para["source_dir"] + ".backup",
+                lambda: debmake.sh.mv_f(
+                    para["source_dir"], para["source_dir"] + ".backup", para["base_dir"]
+                ),
                 para["yes"],
                 exit_no=False,
+                cwd=para["base_dir"],
             )
     else:
-        print('E: invalid method "{}"'.format(para["method"]))
         debmake.debug.debug(" >>> late-para (else)", type="p", para=para)
-        exit(1)
+        raise debmake.error.UsageError('invalid method "{}"'.format(para["method"]))
     return
 
 
+#######################################################################
+# checkpoint_done: True if the stage will be skipped by its checkpoint
+#######################################################################
+def checkpoint_done(name, para):
+    # debmake.checkpoint is imported only when used (slow hashlib)
+    import debmake.checkpoint
+
+    return debmake.checkpoint.done(name, para)
+
+
 #######################################################################
 # Test code
 #######################################################################
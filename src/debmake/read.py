@@ -22,6 +22,46 @@ CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
+import os
+
+
+#######################################################################
+# Template files preloaded by "debmake --serve" or read from the packed
+# templates (path -> text)
+#######################################################################
+cache = {}
+# data_path -> names in data.pack (or None if not packed)
+packs = {}
+
+
+def load_pack(data_path):
+    ###################################################################
+    # data_path: directory path with / at the end
+    # return the names in data.pack (see debmake.pack) or None
+    ###################################################################
+    if data_path not in packs:
+        import debmake.pack
+
+        texts = debmake.pack.read_pack(debmake.pack.pack_path(data_path))
+        if texts is None:
+            packs[data_path] = None
+        else:
+            for name, text in texts.items():
+                cache[data_path + name] = text
+            packs[data_path] = list(texts.keys())
+    return packs[data_path]
+
+
+def preload(data_path):
+    ###################################################################
+    # data_path: directory path with / at the end
+    ###################################################################
+    if load_pack(data_path) is None:
+        for entry in os.scandir(data_path):
+            if entry.is_file():
+                with open(entry.path, mode="r", encoding="utf-8") as f:
+                    cache[data_path + entry.name] = f.read()
+    return len(cache)
 
 
 #######################################################################
@@ -29,8 +69,10 @@ def read(file):
     ###################################################################
     # file:      path to the file
     ###################################################################
-    with open(file, mode="r", encoding="utf-8") as f:
-        text = f.read()
+    text = cache.get(file)
+    if text is None:
+        with open(file, mode="r", encoding="utf-8") as f:
+            text = f.read()
     return text
 
 
@@ -23,9 +23,10 @@ TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 import collections
-import itertools
+import heapq
 import os
-import re
+
+import debmake.index
 
 ###################################################################
 # Define constants
@@ -102,62 +103,158 @@ ext_to_type = {
     "wav": "media",
 }
 ###################################################################
-# re.search file name extension (ignoring compression)
-
-re_ext = re.compile(r"\.(?P<ext>[^.]+)(?:\.in|\.gz|\.bz2|\.xz|\.Z\|\.z|~)*$")
+# exclude some non program source extensions
+###################################################################
+excluded_ext_type = ["text", "binary", "archive", "media"]
 
 
 ###################################################################
 # Scan source to count all program related extensions
 ###################################################################
-def scanext():
-    # exclude some non program source extensions
-    excluded_ext_type = ["text", "binary", "archive", "media"]
-    ext_type_list = []
-    # ext_type_list : representative code type
+def scanext(index, sniff=False, jobs=0):
+    # index: debmake.index.SourceTreeIndex of the source tree (or its
+    # replay debmake.cache.CachedIndex)
+    # (symlinks, VCS dirs and debian/ directory are skipped)
     # binary means possible non-DFSG component
-    for dir, subdirs, files in os.walk("."):
-        for file in files:
-            # dir iterates over ./ ./foo ./foo/bar/ ./foo/bar/baz ...
-            filepath = os.path.join(dir[2:], file)
-            if os.path.islink(filepath):
-                pass  # skip symlink (both for file and dir)
-            else:
-                re_ext_match = re_ext.search(file)
-                if re_ext_match:
-                    ext = re_ext_match.group("ext")
-                    if ext in ext_to_type.keys():
-                        ext_type = ext_to_type[ext]
-                    else:
-                        ext_type = ext
-                    # extrep is normalized extension
-                    if ext_type not in excluded_ext_type:
-                        ext_type_list.append(ext_type)
-        # do not descend to VCS dirs and debian/ directory
-        for vcs in ["CVS", ".svn", ".pc", ".git", ".hg", ".bzr", "debian"]:
-            if vcs in subdirs:
-                subdirs.remove(vcs)  # skip VCS
-    # Assume Python 3.7 or newer to preserve item order for dict
-    ext_type_counter = dict(
-        reversed(
-            sorted(collections.Counter(ext_type_list).items(), key=lambda item: item[1])
+    # Count per distinct extension (the index holds no per-file data) in
+    # the order first found.
+    # sniff: also classify files without extension by their first block
+    # (index made with noext=True) using jobs threads
+    ext_type_counter = collections.Counter()
+    n_binary = 0
+    for ext, count in index.ext_counter.items():
+        if ext in ext_to_type.keys():
+            ext_type = ext_to_type[ext]
+        else:
+            ext_type = ext
+        # extrep is normalized extension
+        if ext_type not in excluded_ext_type:
+            ext_type_counter[ext_type] += count
+        elif ext_type == "binary":
+            n_binary += count
+    if sniff:
+        sniffed = index.sniff(jobs)
+        print(
+            "I: sniffed {} files without extension: {} classified".format(
+                len(index.noext), sum(sniffed.values())
+            )
         )
-    )
+        for ext_type, count in sniffed.items():
+            if ext_type not in excluded_ext_type:
+                ext_type_counter[ext_type] += count
+            elif ext_type == "binary":
+                n_binary += count
+        if n_binary:
+            print(
+                "W: {} binary files (ELF, PE, Mach-O, jar, ...) found: possible non-DFSG components".format(
+                    n_binary
+                )
+            )
     n_max_files = 3
-    for ext_type in itertools.islice(ext_type_counter.keys(), 0, n_max_files):
+    for ext_type, count in top_ext_types(ext_type_counter, n_max_files):
         print(
-            "I: ext_type = {0:<16} {1:>8} files".format(
-                ext_type, ext_type_counter[ext_type]
-            ),
+            "I: ext_type = {0:<16} {1:>8} files".format(ext_type, count),
         )
     return ext_type_counter
 
 
+###################################################################
+# top_ext_types: n most popular (ext_type, count) with a heap
+###################################################################
+def top_ext_types(ext_type_counter, n):
+    # ties: the later found ext_type first (as reversed stable sort)
+    ranked = heapq.nlargest(
+        n,
+        enumerate(ext_type_counter.items()),
+        key=lambda item: (item[1][1], item[0]),
+    )
+    return [item for i, item in ranked]
+
+
+#######################################################################
+# Benchmark: peak RSS of scanext() must not grow with the number of files
+#######################################################################
+def measure(top):
+    # run in a fresh process per tree
+    import resource
+    import time
+
+    begin = time.perf_counter()
+    index = debmake.index.SourceTreeIndex(top)
+    ext_type_counter = scanext(index)
+    print(
+        "X: files={} ext_types={} seconds={:.2f} maxrss_kb={}".format(
+            index.n_files,
+            len(ext_type_counter),
+            time.perf_counter() - begin,
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        )
+    )
+    return
+
+
+def benchmark(n_files):
+    """
+    Make a synthetic tree of n_files hardlinks (1000 per directory, 10
+    shards) and compare the peak RSS of scanning one shard (n_files/10)
+    and the whole tree in separate processes.
+    """
+    import shutil
+    import subprocess
+    import sys
+    import tempfile
+
+    exts = ["c", "h", "py", "js", "txt", "png", "pl", "in", "Makefile"]
+    top = tempfile.mkdtemp(prefix="debmake-benchmark-")
+    try:
+        n_shard = max(n_files // 10, 1)
+        for i in range(n_files):
+            if i % 50000 == 0:
+                # file systems limit the number of hardlinks (ext4: 65000)
+                seed = os.path.join(top, "seed{}".format(i))
+                with open(seed, mode="w") as f:
+                    f.write("seed\n")
+            shard = os.path.join(top, "tree", str(i // n_shard))
+            d = os.path.join(shard, str(i % n_shard // 1000))
+            if i % 1000 == 0 or i % n_shard == 0:
+                os.makedirs(d, exist_ok=True)
+            os.link(seed, os.path.join(d, "f{}.{}".format(i, exts[i % len(exts)])))
+        maxrss = []
+        for tree in (os.path.join(top, "tree", "0"), os.path.join(top, "tree")):
+            result = subprocess.run(
+                [sys.executable, "-m", "debmake.scanext", "--measure", tree],
+                stdout=subprocess.PIPE,
+                text=True,
+                check=True,
+            )
+            print(result.stdout, end="")
+            maxrss.append(int(result.stdout.rsplit("maxrss_kb=", 1)[1]))
+    finally:
+        shutil.rmtree(top)
+    # flat: allow 10% + 2 MiB noise for 10 times more files
+    if maxrss[1] > maxrss[0] * 1.1 + 2048:
+        print("E: peak RSS grows with the number of files: {}".format(maxrss))
+        sys.exit(1)
+    print("I: peak RSS stays flat: {} kB -> {} kB".format(*maxrss))
+    return
+
+
 #######################################################################
 # Test script
 #######################################################################
 if __name__ == "__main__":
-    ext_type_counter = scanext()
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        # python3 -m debmake.scanext --benchmark [N]
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 2000000)
+        sys.exit(0)
+    if len(sys.argv) > 2 and sys.argv[1] == "--measure":
+        measure(sys.argv[2])
+        sys.exit(0)
+    # python3 -m debmake.scanext [--sniff]
+    sniff = len(sys.argv) > 1 and sys.argv[1] == "--sniff"
+    ext_type_counter = scanext(debmake.index.SourceTreeIndex(noext=sniff), sniff)
     print("I: ext_type ====================== file count")
-    for ext_type, count in ext_type_counter.items():
+    for ext_type, count in top_ext_types(ext_type_counter, len(ext_type_counter)):
         print("   ext_type = {0:<16} {1:>8} files".format(ext_type, count))
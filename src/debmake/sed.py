@@ -22,10 +22,86 @@ CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
-
-import glob
+import fnmatch
+import os
+import re
 
 import debmake.cat
+import debmake.read
+
+#######################################################################
+# Template registry
+#
+# The template names in data_path are listed once and each template is
+# compiled once into literal and placeholder segments by re_token.split()
+#   ["literal", "KEY", "literal", "KEY", "literal", ...]
+# so rendering is one pass over the segments regardless of the number
+# of substitution keys.  Unknown @KEY@ are left as they are and reported
+# except uscan(1) watch file tokens.
+#######################################################################
+re_token = re.compile(r"@([A-Z][A-Z0-9_]*)@")
+uscan_tokens = {
+    "ANY_VERSION",
+    "ARCHIVE_EXT",
+    "SIGNATURE_EXT",
+    "DEB_EXT",
+    "SEMANTIC_VERSION",
+    "STABLE_VERSION",
+    "COMPONENT",
+}
+# data_path -> template names in os.scandir() order (as glob.glob()) or
+# in the order of data.pack (see debmake.pack)
+listing = {}
+# template path -> compiled segments
+registry = {}
+
+
+def names(data_path):
+    if data_path not in listing:
+        packed = debmake.read.load_pack(data_path)
+        if packed is not None:
+            listing[data_path] = [name for name in packed if name[0] != "."]
+        else:
+            listing[data_path] = [
+                entry.name
+                for entry in os.scandir(data_path)
+                if entry.is_file() and entry.name[0] != "."
+            ]
+    return listing[data_path]
+
+
+def compile_template(file):
+    segments = registry.get(file)
+    if segments is None:
+        segments = re_token.split(debmake.read.read(file))
+        registry[file] = segments
+    return segments
+
+
+def preload(data_path):
+    # read and compile all templates (for "debmake --serve")
+    debmake.read.preload(data_path)
+    for name in names(data_path):
+        compile_template(data_path + name)
+    return len(registry)
+
+
+def render(segments, substlist, name=""):
+    ###################################################################
+    # segments:  compile_template() result
+    # substlist: substitution dictionary {"@KEY@": "value", ...}
+    # name:      template name for the report of unknown @KEY@
+    ###################################################################
+    parts = segments[:]
+    for i in range(1, len(parts), 2):
+        token = "@" + parts[i] + "@"
+        value = substlist.get(token)
+        if value is None:
+            if parts[i] not in uscan_tokens:
+                print("W: unknown {} left in {}".format(token, name))
+            value = token
+        parts[i] = value
+    return "".join(parts)
 
 
 #######################################################################
@@ -37,35 +113,71 @@ def sed(confmask, destdir, substlist, binpackagedot, para):
     # binpackagedot: binary package name with tailing dot or ""
     # para:          global variable
     ###################################################################
-    len_data_path = len(para["data_path"])
-    for file in glob.glob(para["data_path"] + confmask):
-        destname = file[len_data_path + file[len_data_path:].find("_") + 1 :]
+    for name in fnmatch.filter(names(para["data_path"]), confmask):
+        destname = name[name.find("_") + 1 :]
         newfile = destdir + binpackagedot + destname
         print(
-            "I: creating {} from {}".format(newfile, file[len_data_path:]),
+            "I: creating {} from {}".format(newfile, name),
         )
-        with open(file, mode="r", encoding="utf-8") as f:
-            text = f.read()
-        for k in substlist.keys():
-            text = text.replace(k, substlist[k])
+        text = render(compile_template(para["data_path"] + name), substlist, name)
         debmake.cat.cat(newfile, text, para)
     return
 
 
 #######################################################################
-# Test script
+# Micro-benchmark: python3 -m debmake.sed [N]
 #######################################################################
 if __name__ == "__main__":
-    para = {}
+    import sys
+    import time
+
+    import debmake.api
+
+    data_path = debmake.api.data_path()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
     substlist = {
-        "@BINPACKAGE@": "binpackage",
-        "@PACKAGE@": "package",
-        "@PACKAGEDOT@": "package.",
-        "@UCPACKAGE@": "package".upper(),
-        "@YEAR@": "2014",
-        "@FULLNAME@": "fullname",
-        "@EMAIL@": "email@example.org",
-        "@SHORTDATE@": "11 Jan. 2013",
+        "@" + key + "@": key.lower()
+        for key in [
+            "PACKAGE",
+            "UCPACKAGE",
+            "YEAR",
+            "FULLNAME",
+            "EMAIL",
+            "SHORTDATE",
+            "DATE",
+            "DEBMAKEVER",
+            "BINPACKAGE",
+            "COMPAT",
+            "PKGFORMAT",
+            "VERREV",
+            "EXPORT",
+            "OVERRIDE",
+            "DHWITH",
+            "DHBUILDSYSTEM",
+            "UPACKAGE",
+        ]
     }
-    sed("data/extra2_", "debian/", substlist, "package", para)
-    sed("data/extra3_", "debian/", substlist, "package", para)
+    files = [data_path + name for name in names(data_path)]
+    texts = [debmake.read.read(file) for file in files]
+    for n_keys in [len(substlist), 10 * len(substlist)]:
+        keys = dict(substlist)
+        for i in range(n_keys - len(substlist)):
+            keys["@UNUSED{}@".format(i)] = "x"
+        begin = time.perf_counter()
+        for j in range(n):
+            old = []
+            for text in texts:
+                for k in keys.keys():
+                    text = text.replace(k, keys[k])
+                old.append(text)
+        time_replace = time.perf_counter() - begin
+        begin = time.perf_counter()
+        for j in range(n):
+            new = [render(compile_template(file), keys) for file in files]
+        time_render = time.perf_counter() - begin
+        assert old == new
+        print(
+            "I: {} templates x {}, {:>3} keys: str.replace {:.3f}s, render {:.3f}s".format(
+                len(files), n, n_keys, time_replace, time_render
+            )
+        )
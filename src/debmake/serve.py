@@ -0,0 +1,187 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import traceback
+
+import debmake.api
+import debmake.batch
+import debmake.connect
+import debmake.error
+import debmake.sed
+
+
+#######################################################################
+# Server: fork a child process with the preloaded debmake per request
+#######################################################################
+class Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    # the current directory, environment variables and stdin/stdout/stderr
+    # are set per request in the forked child process.
+    pass
+
+
+class Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            request, fds = receive(self.request)
+        except (OSError, ValueError, KeyError) as e:
+            print("W: ignore invalid request: {}".format(e), file=sys.stderr)
+            return
+        if request is None:
+            # connection probe without request
+            return
+        print(
+            "I: [{}] $ debmake {} (pid={})".format(
+                os.path.basename(request["cwd"]), " ".join(request["argv"]), os.getpid()
+            )
+        )
+        reply = execute(request, fds)
+        self.request.sendall(json.dumps(reply).encode("utf-8") + b"\n")
+        return
+
+
+#######################################################################
+# receive: read the request line and the attached stdin/stdout/stderr
+#######################################################################
+def receive(sock):
+    data, fds, flags, address = socket.recv_fds(sock, 65536, 3)
+    if not data:
+        return (None, fds)
+    while not data.endswith(b"\n"):
+        if len(data) > debmake.connect.MAX_REQUEST:
+            raise ValueError("request too large")
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    if len(fds) != 3:
+        for fd in fds:
+            os.close(fd)
+        raise ValueError("stdin/stdout/stderr not attached")
+    request = json.loads(data)
+    request["argv"] = [str(arg) for arg in request["argv"]]
+    request["cwd"] = str(request["cwd"])
+    request["env"] = {str(k): str(v) for k, v in request["env"].items()}
+    return (request, fds)
+
+
+#######################################################################
+# execute: run one request in the forked child process
+#######################################################################
+def execute(request, fds):
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for fd, client_fd in zip((0, 1, 2), fds):
+        os.dup2(client_fd, fd)
+        os.close(client_fd)
+    os.environ.clear()
+    os.environ.update(request["env"])
+    reply = {"status": 1}
+    try:
+        para = debmake.api.init_para(request["cwd"])
+        debmake.api.parse(para, request["argv"])
+        if para["serve"]:
+            raise debmake.error.UsageError("--serve is not accepted by the server")
+        if para["batch"]:
+            reply["status"] = debmake.batch.batch(para)
+        else:
+            debmake.api.execute(para)
+            reply["status"] = 0
+            for key in ("package", "version", "revision", "work_dir"):
+                reply[key] = para[key]
+    except debmake.error.DebmakeError as e:
+        print("E: {}".format(e), file=sys.stderr)
+    except SystemExit as e:
+        reply["status"] = debmake.batch.exit_status(e.code)
+    except Exception:
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return reply
+
+
+#######################################################################
+# serve: called from debmake.main() for --serve SOCKET
+#######################################################################
+def serve(para):
+    """
+    Preload all debmake modules and template files once, then serve
+    "debmake --connect SOCKET ..." requests until SIGINT or SIGTERM.
+    Only the owner of the server can connect to SOCKET.
+    """
+    path = para["serve"]
+    if os.path.exists(path):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(path)
+        except ConnectionRefusedError:
+            # stale socket left by a killed server
+            os.remove(path)
+        else:
+            raise debmake.error.UsageError(
+                'debmake server is already running on "{}"'.format(path)
+            )
+    # the stage modules are imported lazily by debmake.api.call()
+    for name in (
+        "checkpoint",
+        "tar_wget",
+        "tar_copy",
+        "tar_orig",
+        "tar_expand",
+        "dir_git",
+        "dir_debmake",
+        "dir_tar",
+        "debs",
+        "analyze",
+        "debian",
+    ):
+        importlib.import_module("debmake." + name)
+    print(
+        "I: preloaded {} template files".format(
+            debmake.sed.preload(debmake.api.data_path())
+        )
+    )
+    umask = os.umask(0o077)
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(umask)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print('I: serving on "{}" (pid={})'.format(path, os.getpid()))
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("I: stop serving")
+    finally:
+        server.server_close()
+        os.remove(path)
+    return 0
@@ -24,19 +24,224 @@ SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 import os
 import os.path
-import subprocess
 import sys
 
+import debmake.error
+import debmake.timing
+
+
+###########################################################################
+def sh(command, cwd=None):
+    """
+    execute shell command as if on the shell prompt in the cwd directory
+    (default: current directory)
+    """
+    # subprocess is slow to import and not needed by --help/--version
+    import subprocess
+
+    if cwd is None:
+        cwd = os.getcwd()
+    print("I: [{}] $ {}".format(os.path.basename(cwd), command))
+    with debmake.timing.stage(command.split(" ", 1)[0], "command", command=command):
+        returncode = subprocess.call(command, shell=True, cwd=cwd)
+    if returncode != 0:
+        raise debmake.error.CommandError(command, returncode)
+    return
+
+
+###########################################################################
+def sh_start(command, cwd=None):
+    """
+    start shell command like sh() in the background and return its job
+    for sh_wait().  Its standard output is kept in a temporary file (not
+    a pipe which blocks the command once full).
+    """
+    import subprocess
+    import tempfile
+
+    if cwd is None:
+        cwd = os.getcwd()
+    print("I: [{}] $ {} &".format(os.path.basename(cwd), command))
+    stdout = tempfile.TemporaryFile()
+    begun = debmake.timing.begin()
+    # in its own process group for sh_kill()
+    process = subprocess.Popen(
+        command, shell=True, cwd=cwd, stdout=stdout, start_new_session=True
+    )
+    return (command, process, stdout, begun)
+
 
 ###########################################################################
-def sh(command):
+def sh_wait(job, echo=False):
     """
-    execute shell command as if on the shell prompt
+    wait for the command started by sh_start() and return its standard
+    output (bytes) or print it as sh() does if echo
     """
-    print("I: [{}] $ {}".format(os.path.basename(os.getcwd()), command))
-    if subprocess.call(command, shell=True) != 0:
-        print("E: command failed", file=sys.stderr)
-        exit(1)
+    command, process, stdout, begun = job
+    returncode = process.wait()
+    debmake.timing.end(begun, command.split(" ", 1)[0], "command", command=command)
+    with stdout:
+        stdout.seek(0)
+        output = stdout.read()
+    if echo:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(output)
+        sys.stdout.buffer.flush()
+    if returncode != 0:
+        raise debmake.error.CommandError(command, returncode)
+    return output
+
+
+###########################################################################
+def sh_kill(job):
+    """
+    kill the command started by sh_start() (with its children) if it is
+    still running and reap it without raising CommandError
+    """
+    import signal
+
+    command, process, stdout, begun = job
+    if process.poll() is None:
+        print("I: kill {}".format(command))
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    process.wait()
+    stdout.close()
+    return
+
+
+###########################################################################
+# Filesystem operations done in-process (no /bin/sh nor coreutils) but
+# logged as the equivalent shell commands.  Relative paths are relative
+# to cwd (default: current directory) as for sh().
+###########################################################################
+def fs(command, function, cwd=None):
+    """
+    call function() logged and timed as shell command in the cwd
+    directory.  OSError is reported like a failed command.
+    """
+    if cwd is None:
+        cwd = os.getcwd()
+    print("I: [{}] $ {}".format(os.path.basename(cwd), command))
+    with debmake.timing.stage(command.split(" ", 1)[0], "command", command=command):
+        try:
+            function()
+        except OSError as e:
+            print("{}: {}".format(command.split(" ", 1)[0], e), file=sys.stderr)
+            raise debmake.error.CommandError(command, 1)
+    return
+
+
+def rm_rf(path, cwd=None):
+    # shutil is slow to import and not needed by --help/--version
+    import shutil
+
+    def function():
+        target = os.path.join(cwd or ".", path)
+        if os.path.isdir(target) and not os.path.islink(target):
+            shutil.rmtree(target)
+        elif os.path.lexists(target):
+            os.remove(target)
+
+    fs("rm -rf '{}'".format(path), function, cwd)
+    return
+
+
+def mkdir_p(path, cwd=None):
+    def function():
+        os.makedirs(os.path.join(cwd or ".", path), exist_ok=True)
+
+    fs("mkdir -p '{}'".format(path), function, cwd)
+    return
+
+
+def mv_f(src, dst, cwd=None):
+    import shutil
+
+    # into dst if it is an existing directory (as mv)
+    def function():
+        shutil.move(os.path.join(cwd or ".", src), os.path.join(cwd or ".", dst))
+
+    fs("mv -f '{}' '{}'".format(src, dst), function, cwd)
+    return
+
+
+def ln_sf(target, link, cwd=None):
+    # target is written as is (relative to the directory of link)
+    def function():
+        path = os.path.join(cwd or ".", link)
+        if os.path.isdir(path):
+            path = os.path.join(path, os.path.basename(target))
+        if os.path.lexists(path):
+            os.remove(path)
+        os.symlink(target, path)
+
+    fs("ln -sf '{}' '{}'".format(target, link), function, cwd)
+    return
+
+
+def cp_f(src, dst, cwd=None):
+    import shutil
+
+    def function():
+        path = os.path.join(cwd or ".", dst)
+        try:
+            shutil.copy(os.path.join(cwd or ".", src), path)
+        except PermissionError:
+            # -f: remove the destination which can not be opened
+            os.remove(path)
+            shutil.copy(os.path.join(cwd or ".", src), path)
+
+    fs("cp -f '{}' '{}'".format(src, dst), function, cwd)
+    return
+
+
+def cp_dR(src, dst, cwd=None, verbose=False):
+    import shutil
+    import stat
+
+    # copy the contents of the directory src into dst (as "cp -dR src/. dst")
+    # keeping symlinks and special files.  As cp without -p, directories
+    # are created with the mode of src (less umask) but no times are kept.
+    def copy(src_path, dst_path):
+        for entry in os.scandir(src_path):
+            src_file = os.path.join(src_path, entry.name)
+            dst_file = os.path.join(dst_path, entry.name)
+            if verbose:
+                print("'{}' -> '{}'".format(src_file, dst_file))
+            st = entry.stat(follow_symlinks=False)
+            if stat.S_ISDIR(st.st_mode):
+                if not os.path.isdir(dst_file):
+                    os.mkdir(dst_file, stat.S_IMODE(st.st_mode))
+                copy(src_file, dst_file)
+                continue
+            if os.path.lexists(dst_file) and not stat.S_ISREG(st.st_mode):
+                os.remove(dst_file)
+            if stat.S_ISLNK(st.st_mode):
+                os.symlink(os.readlink(src_file), dst_file)
+            elif stat.S_ISREG(st.st_mode):
+                shutil.copy(src_file, dst_file)
+            elif stat.S_ISFIFO(st.st_mode):
+                os.mkfifo(dst_file, stat.S_IMODE(st.st_mode))
+            else:
+                # sockets and device files (mknod of the latter needs root)
+                try:
+                    os.mknod(dst_file, st.st_mode, st.st_rdev)
+                except PermissionError as e:
+                    print("W: skip '{}': {}".format(src_file, e))
+
+    def function():
+        path = os.path.join(cwd or ".", dst)
+        os.makedirs(path, exist_ok=True)
+        copy(os.path.join(cwd or ".", src), path)
+
+    if verbose:
+        command = "cp -dRv '{}/.' '{}'".format(src, dst)
+    else:
+        command = "cp -dR '{}/.' '{}'".format(src, dst)
+    fs(command, function, cwd)
     return
 
 
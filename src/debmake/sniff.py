@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import collections
+import concurrent.futures
+import os
+
+###################################################################
+# Define constants
+###################################################################
+# only the first block of each file is read
+sniff_size = 512
+# interpreter of "#!" line -> ext_type (as debmake.scanext.ext_to_type)
+interpreter_to_type = {
+    "perl": "perl",
+    "python": "python3",
+    "python3": "python3",
+    "ruby": "ruby",
+    "node": "javascript",
+    "nodejs": "javascript",
+    "sh": "sh",
+    "bash": "sh",
+    "dash": "sh",
+    "ksh": "sh",
+    "zsh": "sh",
+}
+# (magic at offset 0, ext_type)
+magic_to_type = [
+    (b"\x7fELF", "binary"),  # ELF
+    (b"MZ", "binary"),  # PE (DOS header)
+    (b"\xfe\xed\xfa\xce", "binary"),  # Mach-O 32 bit
+    (b"\xfe\xed\xfa\xcf", "binary"),  # Mach-O 64 bit
+    (b"\xce\xfa\xed\xfe", "binary"),  # Mach-O 32 bit (little endian)
+    (b"\xcf\xfa\xed\xfe", "binary"),  # Mach-O 64 bit (little endian)
+    (b"\xca\xfe\xba\xbe", "binary"),  # Mach-O universal or Java class
+]
+
+
+###################################################################
+# Classify one file by its first block
+###################################################################
+def sniff_head(head):
+    # return ext_type or "" if unknown
+    if head[:2] == b"#!":
+        words = head[2:].split(b"\n", 1)[0].decode("utf-8", "replace").split()
+        if words and os.path.basename(words[0]) == "env":
+            # "#!/usr/bin/env [-S] python3"
+            words = [word for word in words[1:] if word[:1] != "-"]
+        if not words:
+            return ""
+        interpreter = os.path.basename(words[0])
+        if interpreter in interpreter_to_type.keys():
+            return interpreter_to_type[interpreter]
+        # python3.11 -> python3
+        if interpreter.startswith("python3"):
+            return "python3"
+        return ""
+    if head[:4] == b"PK\x03\x04":
+        # jar has META-INF/ as its first entries
+        if b"META-INF/" in head:
+            return "binary"
+        return "archive"
+    for magic, ext_type in magic_to_type:
+        if head.startswith(magic):
+            return ext_type
+    return ""
+
+
+def sniff_file(path):
+    try:
+        with open(path, mode="rb") as f:
+            head = f.read(sniff_size)
+    except OSError:
+        return ""
+    return sniff_head(head)
+
+
+###################################################################
+# Sniff files without extension
+###################################################################
+def sniff(top, relpaths, jobs=0):
+    # relpaths: relative paths of regular files under top
+    # jobs: number of threads (0: default of ThreadPoolExecutor)
+    # return collections.Counter of ext_type in the order first found
+    ext_type_counter = collections.Counter()
+    if not relpaths:
+        return ext_type_counter
+    paths = [os.path.join(top, relpath) for relpath in relpaths]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs or None) as executor:
+        for ext_type in executor.map(sniff_file, paths):
+            if ext_type:
+                ext_type_counter[ext_type] += 1
+    return ext_type_counter
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    import sys
+
+    for path in sys.argv[1:]:
+        print("{}: {}".format(path, sniff_file(path) or "unknown"))
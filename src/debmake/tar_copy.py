@@ -33,8 +33,7 @@ import debmake.sh
 # get upstream source to the current directory
 def tar_copy(para):
     if para["tarball"] != para["url"]:
-        command = "cp -f '" + para["url"] + "' '" + para["tarball"] + "'"
-        debmake.sh.sh(command)
+        debmake.sh.cp_f(para["url"], para["tarball"], para["base_dir"])
     return
 
 
@@ -44,4 +43,5 @@ if __name__ == "__main__":
     para = dict()
     para["url"] = sys.argv[1]
     para["tarball"] = os.path.basename(para["url"])
+    para["base_dir"] = os.getcwd()
     tar_copy(para)
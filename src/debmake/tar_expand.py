@@ -24,8 +24,8 @@ SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 import glob
 import os
-import sys
 
+import debmake.error
 import debmake.sh
 import debmake.yn
 
@@ -48,48 +48,44 @@ def tar_expand(para):
           the current content after pausing for [Y/n]
     """
 
+    base_dir = para["base_dir"]
     print('I: expand the upstream tarball "{}"'.format(para["tarball"]))
-    if not os.path.exists(para["tarball"]):
-        print(
-            "E: tarball missing in {}".format(
-                os.path.relpath(os.getcwd(), para["start_dir"])
-            ),
-            file=sys.stderr,
+    if not os.path.exists(os.path.join(base_dir, para["tarball"])):
+        raise debmake.error.SourceError(
+            "tarball missing in {}".format(os.path.relpath(base_dir, para["start_dir"]))
         )
-        exit(1)
-    if os.path.isdir(para["source_dir"]):
-        command = "rm -rf '" + para["source_dir"] + "'"
-        debmake.sh.sh(command)
-    if os.path.isdir(para["debmake_dir"]):
+    if os.path.isdir(os.path.join(base_dir, para["source_dir"])):
+        debmake.sh.rm_rf(para["source_dir"], base_dir)
+    if os.path.isdir(os.path.join(base_dir, para["debmake_dir"])):
         debmake.yn.yn(
             'remove old "{}" directory'.format(para["debmake_dir"]),
-            "rm -rf '" + para["debmake_dir"] + "'",
+            lambda: debmake.sh.rm_rf(para["debmake_dir"], base_dir),
             para["yes"],
+            cwd=base_dir,
         )
-    command = "mkdir -p '" + para["source_dir"] + "'"
-    debmake.sh.sh(command)
+    debmake.sh.mkdir_p(para["source_dir"], base_dir)
     if para["verbose"]:
         command = "tar --verbose "
     else:
         command = "tar "
     command += para["option_z"] + " -f '" + para["tarball"] + "' "
     command += "-C '" + para["source_dir"] + "' -x"
-    debmake.sh.sh(command)
+    debmake.sh.sh(command, base_dir)
     print("I: expanded {}.".format(para["tarball"]))
-    expand_list = glob.glob(para["source_dir"] + "/*")
-    expand_dir_list = glob.glob(para["source_dir"] + "/*/")
+    expand_list = glob.glob(glob.escape(base_dir) + "/" + para["source_dir"] + "/*")
+    expand_dir_list = glob.glob(
+        glob.escape(base_dir) + "/" + para["source_dir"] + "/*/"
+    )
     if len(expand_list) == 1 and len(expand_dir_list) == 1:
         # only one directory found (likely package-version/)
         # move expand_dir_list[0] to para["debmake_dir"]
-        command = "mv -f '" + expand_dir_list[0] + "' '" + para["debmake_dir"] + "'"
-        debmake.sh.sh(command)
-        command = "rm -rf '" + para["source_dir"] + "'"
-        debmake.sh.sh(command)
+        expand_dir = os.path.relpath(expand_dir_list[0], base_dir) + "/"
+        debmake.sh.mv_f(expand_dir, para["debmake_dir"], base_dir)
+        debmake.sh.rm_rf(para["source_dir"], base_dir)
     else:
         # root of archive have many files
         # move para["source_dir"] to para["debmake_dir"]
-        command = "mv -f '" + para["source_dir"] + "' '" + para["debmake_dir"] + "'"
-        debmake.sh.sh(command)
+        debmake.sh.mv_f(para["source_dir"], para["debmake_dir"], base_dir)
     return
 
 
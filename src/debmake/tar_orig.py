@@ -25,6 +25,7 @@ SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 import os.path
 import sys
 
+import debmake.error
 import debmake.sh
 
 
@@ -35,12 +36,8 @@ def tar_orig(para):
     #######################################################################
     # make package_version.orig.tar.xz (as symlink)
     #######################################################################
-    if not os.path.exists(para["tarball"]):
-        print(
-            'E: missing "{}".'.format(para["tarball"]),
-            file=sys.stderr,
-        )
-        exit(1)
+    if not os.path.exists(os.path.join(para["base_dir"], para["tarball"])):
+        raise debmake.error.SourceError('missing "{}".'.format(para["tarball"]))
     origtargz = para["package"] + "_" + para["version"] + ".orig." + para["tarz"]
     if para["tarball"] == origtargz:
         print(
@@ -49,8 +46,7 @@ def tar_orig(para):
             ),
         )
     else:
-        command = "ln -sf '" + para["tarball"] + "' '" + origtargz + "'"
-        debmake.sh.sh(command)
+        debmake.sh.ln_sf(para["tarball"], origtargz, para["base_dir"])
     return
 
 
@@ -60,4 +56,5 @@ if __name__ == "__main__":
     para["package"] = os.path.splitext(os.path.basename(para["tarball"]))[0].lower()
     para["version"] = "1.0"
     para["tarz"] = "tar.xz"
+    para["base_dir"] = os.getcwd()
     tar_orig(para)
@@ -26,6 +26,7 @@ import os.path
 import shutil
 import sys
 
+import debmake.error
 import debmake.sh
 
 
@@ -39,12 +40,11 @@ def tar_wget(para):
     elif shutil.which("curl"):
         command = "curl -O "
     else:
-        print("E: please install wget or curl.", file=sys.stderr)
-        exit(1)
+        raise debmake.error.UsageError("please install wget or curl.")
     if para["verbose"]:
         command += "--verbose "
     command += "'" + para["url"] + "'"
-    debmake.sh.sh(command)
+    debmake.sh.sh(command, para["base_dir"])
     return
 
 
@@ -52,4 +52,5 @@ if __name__ == "__main__":
     para = dict()
     para["url"] = sys.argv[1]
     para["tarball"] = os.path.basename(para["url"])
+    para["base_dir"] = os.getcwd()
     tar_wget(para)
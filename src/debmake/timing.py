@@ -0,0 +1,171 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import contextlib
+import os
+import threading
+import time
+
+
+#######################################################################
+# Recorded events (reset for each run, kept per thread for debmake.run())
+#######################################################################
+def children_time():
+    t = os.times()
+    return t.children_user + t.children_system
+
+
+local = threading.local()
+
+
+def reset():
+    local.events = []
+    local.origin = time.perf_counter()
+    local.origin_cpu = time.process_time()
+    local.origin_children = children_time()
+    return
+
+
+def state():
+    if not hasattr(local, "events"):
+        reset()
+    return local
+
+
+#######################################################################
+# stage: record wall, CPU and child-process time of the enclosed code
+#######################################################################
+@contextlib.contextmanager
+def stage(name, category="stage", **args):
+    """
+    Record the enclosed code as an event.  Nested events are allowed.
+
+    wall:     elapsed wall-clock time
+    cpu:      CPU time of this process (all threads)
+    children: CPU time of the terminated child processes
+    """
+    begun = begin()
+    try:
+        yield
+    finally:
+        end(begun, name, category, **args)
+    return
+
+
+def begin():
+    """start an event which is recorded by end() (for background jobs)"""
+    return (time.perf_counter(), time.process_time(), children_time())
+
+
+def end(begun, name, category="stage", **args):
+    """record the event started by begin()"""
+    run = state()
+    begin_wall, begin_cpu, begin_children = begun
+    run.events.append(
+        {
+            "name": name,
+            "category": category,
+            "start": begin_wall - run.origin,
+            "wall": time.perf_counter() - begin_wall,
+            "cpu": time.process_time() - begin_cpu,
+            "children": children_time() - begin_children,
+            "tid": threading.get_native_id(),
+            "args": args,
+        }
+    )
+    return
+
+
+def call(function, para):
+    """call a debmake stage function(para) as a recorded stage"""
+    with stage(function.__name__):
+        function(para)
+    return
+
+
+#######################################################################
+# write: write --profile JSON and --profile-trace Chrome trace-event
+#######################################################################
+def write(para):
+    # json is only needed for --profile and --profile-trace
+    import json
+
+    run = state()
+    if para.get("profile"):
+        profile = {
+            "program": para["program_name"],
+            "version": para["program_version"],
+            "package": para.get("package", ""),
+            "method": para.get("method", ""),
+            "total": {
+                "wall": time.perf_counter() - run.origin,
+                "cpu": time.process_time() - run.origin_cpu,
+                "children": children_time() - run.origin_children,
+            },
+            "events": sorted(run.events, key=lambda event: event["start"]),
+        }
+        with open(para["profile"], mode="w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+            f.write("\n")
+        print('I: wrote run profile to "{}"'.format(para["profile"]))
+    if para.get("profile_trace"):
+        # https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+        pid = os.getpid()
+        trace_events = []
+        for event in run.events:
+            trace_events.append(
+                {
+                    "name": event["name"],
+                    "cat": event["category"],
+                    "ph": "X",
+                    "ts": round(event["start"] * 1e6),
+                    "dur": round(event["wall"] * 1e6),
+                    "pid": pid,
+                    "tid": event["tid"],
+                    "args": dict(
+                        event["args"], cpu=event["cpu"], children=event["children"]
+                    ),
+                }
+            )
+        with open(para["profile_trace"], mode="w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace_events}, f)
+            f.write("\n")
+        print('I: wrote Chrome trace-event file to "{}"'.format(para["profile_trace"]))
+    return
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    with stage("outer"):
+        with stage("sleep", category="command", command="sleep 0.1"):
+            os.system("sleep 0.1")
+        sum(range(1000000))
+    for event in state().events:
+        print(
+            "X: {name:<8} wall={wall:.3f}s cpu={cpu:.3f}s children={children:.3f}s".format(
+                **event
+            )
+        )
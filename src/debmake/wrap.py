@@ -0,0 +1,244 @@
+#!/usr/bin/python3
+# vim:se tw=0 sts=4 ts=4 et ai:
+"""
+Copyright © 2026 Osamu Aoki
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the
+"Software"), to deal in the Software without restriction, including
+without limitation the rights to use, copy, modify, merge, publish,
+distribute, sublicense, and/or sell copies of the Software, and to
+permit persons to whom the Software is furnished to do so, subject to
+the following conditions:
+
+The above copyright notice and this permission notice shall be included
+in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+import fnmatch
+import os
+import re
+
+#######################################################################
+# In-process "wrap-and-sort -ast" for the debian/* files rendered by
+# debmake (debmake.cat.cat())
+#
+#   -a: wrap always (one item per line)
+#   -s: short indent (one space)
+#   -t: trailing comma
+#
+# The relationship fields of the control files are sorted (package
+# names first, then substitution variables such as ${misc:Depends}) and
+# the entries of the dh_* list files (install, docs, ...) are sorted
+# within each block between comment lines, which are kept in place.
+# debian/copyright of debmake.copyright is already written with one
+# pattern per line.  Files not rendered by debmake in this run (kept
+# user files, licensecheck output) are left to the external
+# wrap-and-sort by external().
+#######################################################################
+# files handled by wrap-and-sort (relative to debian/)
+supported_files = [
+    "clean",
+    "control",
+    "control*.in",
+    "copyright",
+    "copyright.in",
+    "dirs",
+    "*.dirs",
+    "docs",
+    "*.docs",
+    "examples",
+    "*.examples",
+    "info",
+    "*.info",
+    "install",
+    "*.install",
+    "links",
+    "*.links",
+    "maintscript",
+    "*.maintscript",
+    "manpages",
+    "*.manpages",
+    "tests/control",
+]
+control_files = ["control", "control*.in", "tests/control"]
+# comma separated lists sorted in control files
+list_fields = {
+    "breaks",
+    "build-conflicts",
+    "build-conflicts-arch",
+    "build-conflicts-indep",
+    "build-depends",
+    "build-depends-arch",
+    "build-depends-indep",
+    "built-using",
+    "conflicts",
+    "depends",
+    "enhances",
+    "pre-depends",
+    "provides",
+    "recommends",
+    "replaces",
+    "static-built-using",
+    "suggests",
+    "testsuite-triggers",
+}
+re_field = re.compile(r"^(?P<name>[A-Za-z][A-Za-z0-9-]*):(?P<value>.*)$")
+re_package = re.compile(r"^[a-z0-9]")
+
+
+def match(name, patterns):
+    # name: path relative to debian/ (only tests/control has a "/")
+    if "/" in name and name != "tests/control":
+        return False
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def supported(name):
+    return match(name, supported_files)
+
+
+###################################################################
+# control files
+###################################################################
+def sort_list(items):
+    # package names first, then ${...} and others
+    packages = sorted(item for item in items if re_package.match(item))
+    others = sorted(item for item in items if not re_package.match(item))
+    return packages + others
+
+
+def wrap_field(name, value):
+    items = []
+    for item in value.split(","):
+        item = " ".join(item.split())
+        if item and item not in items:
+            items.append(item)
+    if name.lower() == "uploaders":
+        lines = items
+    else:
+        lines = sort_list(items)
+    return [name + ":"] + [" " + item + "," for item in lines]
+
+
+def wrap_control(text):
+    lines = text.split("\n")
+    output = []
+    i = 0
+    while i < len(lines):
+        field = re_field.match(lines[i])
+        if not field:
+            output.append(lines[i])
+            i += 1
+            continue
+        name = field.group("name")
+        j = i + 1
+        while j < len(lines) and lines[j][:1] in (" ", "\t"):
+            j += 1
+        if name.lower() in list_fields or name.lower() == "uploaders":
+            value = "\n".join([field.group("value")] + lines[i + 1 : j])
+            output.extend(wrap_field(name, value))
+        elif name.lower() == "architecture":
+            # wildcards such as linux-any first
+            archs = sorted(
+                set(field.group("value").split()), key=lambda x: ("any" not in x, x)
+            )
+            output.append("{}: {}".format(name, " ".join(archs)))
+            output.extend(lines[i + 1 : j])
+        else:
+            output.extend(lines[i:j])
+        i = j
+    return "\n".join(output)
+
+
+###################################################################
+# dh_* list files
+###################################################################
+def wrap_list(text):
+    output = []
+    block = []
+    for line in text.split("\n"):
+        line = line.strip()
+        if line and line[0] != "#":
+            if line not in block:
+                block.append(line)
+            continue
+        output.extend(sorted(block))
+        block = []
+        output.append(line)
+    output.extend(sorted(block))
+    return "\n".join(output)
+
+
+###################################################################
+# wrap: text of debian/name as "wrap-and-sort -ast" writes it
+###################################################################
+def wrap(file, text):
+    # file: path relative to para["work_dir"]
+    if not file.startswith("debian/"):
+        return text
+    name = file[len("debian/") :]
+    if not supported(name):
+        return text
+    if match(name, control_files):
+        return wrap_control(text)
+    if name in ("copyright", "copyright.in"):
+        return text
+    return wrap_list(text)
+
+
+def rendered(file, para):
+    # record file (path relative to para["work_dir"]) as written by
+    # debmake through wrap() so that external() skips it
+    para.setdefault("wrapped", set()).add(os.path.join(para["work_dir"], file))
+    return
+
+
+###################################################################
+# external: debian/* files left for the external wrap-and-sort
+###################################################################
+def external(para):
+    # return paths relative to para["work_dir"]
+    wrapped = para.get("wrapped", set())
+    debian_dir = os.path.join(para["work_dir"], "debian")
+    files = []
+    for reldir in ("", "tests"):
+        try:
+            with os.scandir(os.path.join(debian_dir, reldir)) as it:
+                names = sorted(entry.name for entry in it if entry.is_file())
+        except OSError:
+            continue
+        for name in names:
+            name = os.path.join(reldir, name)
+            if supported(name) and os.path.join(debian_dir, name) not in wrapped:
+                files.append(os.path.join("debian", name))
+    return files
+
+
+#######################################################################
+# Test script
+#######################################################################
+if __name__ == "__main__":
+    print(
+        wrap_control(
+            """\
+Source: foo
+Build-Depends: debhelper-compat (= 13),
+\tpython3-all, dh-python,
+Architecture: any-amd64 linux-any
+#Vcs-Browser: https://salsa.debian.org/debian/foo
+
+Package: foo
+Depends: ${misc:Depends}, ${shlibs:Depends},
+Description: foo
+ long"""
+        )
+    )
+    print(wrap_list("# comment\nusr/lib\nusr/bin\n\n# more\nz\na"))
@@ -22,15 +22,14 @@ CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
 TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
-import sys
-
+import debmake.error
 import debmake.sh
 
 
 ###########################################################################
-# yn: ask mes and execute command
+# yn: ask mes and execute command (shell command string or callable)
 ###########################################################################
-def yn(mes, command, yes, exit_no=True):
+def yn(mes, command, yes, exit_no=True, cwd=None):
     if yes == 1:
         yn = "y"
     elif yes == 2:
@@ -42,13 +41,14 @@ def yn(mes, command, yes, exit_no=True):
         else:
             yn = yn[0].lower()
     if yn == "y":
-        if command:
-            debmake.sh.sh(command)
+        if callable(command):
+            command()
+        elif command:
+            debmake.sh.sh(command, cwd)
     elif exit_no:
-        print(
-            'E: terminating as ERROR since "n" chosen at Y/n question.', file=sys.stderr
+        raise debmake.error.AbortError(
+            'terminating as ERROR since "n" chosen at Y/n question.'
         )
-        exit(1)
     else:
         pass
     return